@@ -1,6 +1,6 @@
 import sys
 from PyQt5.QtWidgets import QFrame, QWidget, QVBoxLayout, QLabel, QPushButton, QApplication, QMainWindow, QMenu, QAction, QCheckBox, QHBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon, QCursor
 
 if __name__ == "__main__":
@@ -65,13 +65,29 @@ class CheckBoxCollapseButton(CollapseButton):
 
 
 class CollapsibleWidget(QWidget):
+    """Arguments:
+        content_factory: called with the collapsible the first time it's uncollapsed to add its content (see build_content), 
+        so the widgets of a big tree are only created when they are shown. 
+        It can return an iterator that adds a widget each step, run by renderer in slices (see GUI/progressive_renderer.py).
+        content_tree: returns what tree_to_dict would return for the content before it's created (with the default checkboxes), 
+        {} if it has no collapsibles with checkbox.
+        renderer: ProgressiveRenderer that runs the steps of content_factory, None to run them at once.
+        content_loader: called with a callback the first time it's uncollapsed, to load what the content shows without blocking 
+        (e.g.: a lazy content inspected in another thread), content_factory is called once the callback is called.
+    """
+    uncollapsed = pyqtSignal() # Emitted whenever the content is shown
+
     def __init__(self, 
         THEME, 
         current_theme, 
         title: str=None, 
         color=None, 
         collapse_button: QWidget=CollapseButton, 
-        parent: QWidget=None
+        parent: QWidget=None, 
+        content_factory: callable=None, 
+        content_tree: callable=None, 
+        renderer=None, 
+        content_loader: callable=None
     ):
         super().__init__(parent=parent)
         
@@ -82,6 +98,13 @@ class CollapsibleWidget(QWidget):
         self.title = title
 
         self.is_collapsed = True
+        self.content_factory = content_factory # None once the content is being created
+        self.content_steps = None # Steps of content_factory left, see build_content
+        self.content_tree = content_tree
+        self.renderer = renderer
+        self.content_loader = content_loader # None once the content is being loaded, see build_content
+        self.content_loading = False
+        self.content_unchecked = False # The checkboxes were disabled before the content was created, see disable_all_checkboxes
 
         if color is None:
             color = self.THEME[self.current_theme]["font_color"]
@@ -91,6 +114,7 @@ class CollapsibleWidget(QWidget):
 
         self.title_frame.setContextMenuPolicy(Qt.CustomContextMenu)
         self.title_frame.customContextMenuRequested.connect(self.context_menu)
+        self.context_menu_actions = [] # (text, callback) added to the context menu, see add_context_menu_action
     
         self.setLayout(QVBoxLayout())
         self.layout().setSpacing(0)
@@ -124,14 +148,29 @@ class CollapsibleWidget(QWidget):
 
         # menu.addAction(print_tree_action)
 
+        extra_actions = []
+        for text, callback in self.context_menu_actions:
+            extra_action = QAction(text)
+            extra_action.triggered.connect(lambda ignore, callback=callback: callback())
+            extra_actions.append(extra_action) # Keep a reference until the menu is closed
+
+        if len(extra_actions) > 0:
+            menu.addSeparator()
+            menu.addActions(extra_actions)
+
         menu.exec_(QCursor.pos())
 
+    def add_context_menu_action(self, text: str, callback: callable):
+        self.context_menu_actions.append((text, callback))
+
     def fold_all(self):
         for widget in get_widgets_from_layout(self.content_layout):
             if isinstance(widget, CollapsibleWidget):
                 widget.collapse()
 
     def unfold_all(self):
+        self.build_content()
+
         for widget in get_widgets_from_layout(self.content_layout):
             if isinstance(widget, CollapsibleWidget):
                 widget.uncollapse()
@@ -149,12 +188,69 @@ class CollapsibleWidget(QWidget):
 
     def addWidget(self, widget: QWidget):
         widget.setContentsMargins(10, 0, 0, 0) # To representate indentation
-        self.content_layout.addWidget(widget)
+
+        if self.content_steps is not None and self.content.isVisible(): # Created in slices, see add_content_in_slices
+            self.content_layout.setEnabled(False)
+            self.content_layout.addWidget(widget)
+            widget.show()
+        else:
+            self.content_layout.addWidget(widget)
    
+    @property
+    def is_content_built(self) -> bool:
+        return self.content_factory is None and self.content_steps is None
+
+    def build_content(self):
+        """Create the content with content_factory if it wasn't created yet, called when it's uncollapsed.
+        """
+        if self.content_factory is None or self.content_loading:
+            return
+
+        if self.content_loader is not None:
+            content_loader, self.content_loader = self.content_loader, None
+            self.content_loading = True
+            content_loader(self.content_loaded)
+            return
+
+        content_factory, self.content_factory = self.content_factory, None
+        content_steps = content_factory(self)
+
+        if content_steps is None or self.renderer is None:
+            for step in content_steps or ():
+                pass
+
+            self.content_built()
+            return
+
+        self.content_steps = content_steps
+        self.renderer.add_task(self.add_content_in_slices(content_steps), on_slice_end=self.update_content_layout, on_finished=self.content_built)
+
+    def content_loaded(self):
+        self.content_loading = False
+        self.build_content()
+
+    def add_content_in_slices(self, content_steps):
+        """Run content_steps with the content layout disabled until the end of the slice (see update_content_layout), 
+        each widget shown in a visible widget updates the layouts of all its parents, the whole tree.
+        """
+        for step in content_steps:
+            yield
+
+    def update_content_layout(self):
+        self.content_layout.setEnabled(True)
+        self.content_layout.activate()
+
+    def content_built(self):
+        self.content_steps = None
+
+        if self.content_unchecked:
+            self.disable_all_checkboxes()
+
     def toggle_collapsed(self):
-        self.content.setVisible(self.is_collapsed)
-        self.is_collapsed = not self.is_collapsed
-        self.title_frame.update_arrow(self.is_collapsed)
+        if self.is_collapsed:
+            self.uncollapse()
+        else:
+            self.collapse()
 
     def collapse(self):
         self.is_collapsed = True
@@ -165,12 +261,20 @@ class CollapsibleWidget(QWidget):
     def uncollapse(self):
         self.is_collapsed = False
 
+        self.build_content()
+        self.uncollapsed.emit()
+
         self.content.setVisible(True)
         self.title_frame.update_arrow(self.is_collapsed)
 
     def disable_all_checkboxes(self):
         """This function will disable all child collapsible objects checkboxes if CollapseButton == CheckBoxCollapseButton
         """
+        if not self.is_content_built:
+            self.content_unchecked = True # The widgets not created yet are disabled once they are
+
+            if self.content_factory is not None:
+                return
 
         for widget in get_widgets_from_layout(self.content_layout):
             if isinstance(widget, CollapsibleWidget):
@@ -193,7 +297,10 @@ class CollapsibleWidget(QWidget):
 
         content = {}
 
-        collapsible_widgets_with_checkbox_counter = 0
+        if not collapsible_widget.is_content_built: # Or only part of it, the collapsibles created replace their default
+            content = collapsible_widget.get_default_content_tree()
+
+        collapsible_widgets_with_checkbox_counter = len(content)
         widgets = get_widgets_from_layout(layout) # widgets on collapsible widgets layout
 
         for widget in widgets:
@@ -212,3 +319,12 @@ class CollapsibleWidget(QWidget):
 
         return {self.title: content} if include_title else content
 
+    def get_default_content_tree(self) -> dict:
+        """Returns tree_to_dict of the content before it's created, from content_tree.
+        """
+        content = {} if self.content_tree is None else self.content_tree()
+
+        if self.content_unchecked:
+            content = {title: False for title in content}
+
+        return content
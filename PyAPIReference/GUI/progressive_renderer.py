@@ -0,0 +1,129 @@
+"""Create the widgets or rows of the tree in slices run by the event loop, so the window stays responsive while a big tree is shown.
+Each slice runs the pending tasks until the frame budget is spent, then the events (painting, clicks, scrolling) are processed before the next one.
+Example:
+	renderer = ProgressiveRenderer(frame_budget=0.016)
+	renderer.progress.connect(lambda done, total: print(f"{done}/{total}"))
+	renderer.add_task((create_label(i) for i in range(1000)), total=1000)
+Notes:
+	A task is an iterator, each step (e.g.: creating a widget) should take much less than the frame budget, it's checked between steps.
+	The last task added runs first, so what was just expanded is shown before the rest is filled in.
+"""
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+FRAME_BUDGET = 0.016 # Seconds of each slice
+
+
+class RenderTask:
+	"""Steps run by a ProgressiveRenderer.
+	Arguments:
+		steps: iterator, each item is a step.
+		total: number of steps if known, for the progress.
+		on_slice_end: called after each slice where some steps were run (e.g.: to insert the rows created in the slice).
+		on_finished: called once all the steps were run.
+	"""
+	def __init__(self, steps, total: int=None, on_slice_end: callable=None, on_finished: callable=None):
+		self.steps = iter(steps)
+		self.total = total
+		self.on_slice_end = on_slice_end
+		self.on_finished = on_finished
+		self.done = 0
+		self.finished = False
+
+	def __repr__(self):
+		return f"RenderTask(done={self.done}, total={self.total}, finished={self.finished})"
+
+	def run(self, deadline: float) -> bool:
+		"""Run steps until deadline (time.perf_counter), returns True if all of them were run.
+		"""
+		done = self.done
+
+		try:
+			while time.perf_counter() < deadline:
+				next(self.steps)
+				self.done += 1
+		except StopIteration:
+			self.finished = True
+
+		if self.done > done and self.on_slice_end is not None:
+			self.on_slice_end()
+
+		if self.finished and self.on_finished is not None:
+			self.on_finished()
+
+		return self.finished
+
+
+class ProgressiveRenderer(QObject):
+	"""Runs RenderTasks in slices of frame_budget seconds from the event loop.
+	Signals:
+		progress: (steps done, total steps) of the pending tasks, total is 0 if it's unknown.
+		finished: all the tasks were run.
+	"""
+	progress = pyqtSignal(int, int)
+	finished = pyqtSignal()
+
+	def __init__(self, frame_budget: float=FRAME_BUDGET, parent: QObject=None):
+		super().__init__(parent)
+
+		self.frame_budget = frame_budget
+		self.tasks = deque()
+
+		self.timer = QTimer(self)
+		self.timer.setInterval(0) # Right after the pending events
+		self.timer.timeout.connect(self.run_slice)
+
+	def __repr__(self):
+		return f"ProgressiveRenderer(frame_budget={self.frame_budget}, tasks={len(self.tasks)})"
+
+	@property
+	def is_running(self) -> bool:
+		return len(self.tasks) > 0
+
+	def add_task(self, steps, total: int=None, on_slice_end: callable=None, on_finished: callable=None, run_now: bool=True) -> RenderTask:
+		"""Add a task to run before the pending ones, if run_now its first slice is run right away (e.g.: the first rows of what was expanded).
+		"""
+		task = RenderTask(steps, total, on_slice_end, on_finished)
+
+		if run_now and task.run(time.perf_counter() + self.frame_budget):
+			return task
+
+		self.tasks.appendleft(task)
+		self.timer.start()
+		self.emit_progress()
+
+		return task
+
+	def run_slice(self) -> None:
+		deadline = time.perf_counter() + self.frame_budget
+
+		while len(self.tasks) > 0 and time.perf_counter() < deadline:
+			task = self.tasks[0]
+
+			if task.run(deadline):
+				self.tasks.remove(task) # The task may have added another one before itself
+
+		self.emit_progress()
+
+		if len(self.tasks) == 0:
+			self.timer.stop()
+			self.finished.emit()
+
+	def emit_progress(self) -> None:
+		done = sum(task.done for task in self.tasks)
+
+		if all(task.total is not None for task in self.tasks):
+			total = sum(task.total for task in self.tasks)
+		else:
+			total = 0
+
+		self.progress.emit(done, total)
+
+	def clear(self) -> None:
+		"""Drop the pending tasks, e.g.: their widgets are being deleted.
+		"""
+		self.tasks.clear()
+		self.timer.stop()
+		self.finished.emit()
@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QDialog, QPushButton, QVBoxLayout, QHBoxLayout, QStyle, QComboBox, QTabWidget, QFormLayout, QColorDialog, QGridLayout
+from PyQt5.QtWidgets import QWidget, QLabel, QDialog, QPushButton, QVBoxLayout, QHBoxLayout, QStyle, QComboBox, QTabWidget, QFormLayout, QColorDialog, QGridLayout, QSpinBox, QDoubleSpinBox, QLineEdit
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor
 
@@ -6,6 +6,8 @@ from qtwidgets import AnimatedToggle
 from multipledispatch import dispatch
 import PREFS
 
+from inspection_cache import InspectionCache
+
 if __name__ == "__main__":
 	from scrollarea import ScrollArea
 else:
@@ -75,12 +77,14 @@ class SettingsDialog(QDialog):
 
 		self.create_widgets()
 
-		self.setFixedSize(300, 450)
+		self.setFixedSize(300, 500)
 
 	def create_widgets(self):
 		tabs = QTabWidget()
 
 		tabs.addTab(self.create_theme_tab(), "Theme")
+		tabs.addTab(self.create_inspect_module_tab(), "Inspection")
+		tabs.addTab(self.create_sandbox_tab(), "Sandbox")
 
 		apply_button = QPushButton(icon=self.style().standardIcon(QStyle.SP_DialogApplyButton), text="Apply")
 		apply_button.clicked.connect(lambda: self.done(1))
@@ -90,7 +94,181 @@ class SettingsDialog(QDialog):
 	
 	def create_inspect_module_tab(self):
 		inspect_module_tab = QWidget()
-		inspect_module_tab.setLayout(QVBoxLayout())
+		inspect_module_tab.setLayout(FormLayout(stretch=False))
+
+		inspect_engine_combobox = QComboBox()
+		inspect_engine_combobox.addItem("Execute module", "runtime")
+		inspect_engine_combobox.addItem("Parse source (don't execute)", "static")
+		inspect_engine_combobox.setCurrentIndex(inspect_engine_combobox.findData(self.prefs.file["inspect_engine"]))
+		inspect_engine_combobox.setToolTip("Parsing the source is faster and doesn't require the imports of the module to be installed.")
+		
+		inspect_engine_combobox.currentIndexChanged.connect(
+			lambda index: self.prefs.write_prefs("inspect_engine", inspect_engine_combobox.itemData(index))
+		)
+
+		self.lazy_inspection_toggle = lazy_inspection_toggle = AnimatedToggle()
+		lazy_inspection_toggle.setChecked(self.prefs.file["lazy_inspection"])
+		lazy_inspection_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("lazy_inspection", bool(state)))
+		self.update_lazy_inspection_toggle(self.prefs.file["sandbox"]["enabled"])
+
+		compact_tree_toggle = AnimatedToggle()
+		compact_tree_toggle.setChecked(self.prefs.file["compact_tree"])
+		compact_tree_toggle.setToolTip("Store the inspected members in a compact form, uses less memory with big modules.")
+		compact_tree_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("compact_tree", bool(state)))
+
+		tree_view_toggle = AnimatedToggle()
+		tree_view_toggle.setChecked(self.prefs.file["tree_view"])
+		tree_view_toggle.setToolTip("Show the tree in a view that only creates the rows of the expanded members, faster with big modules.")
+		tree_view_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("tree_view", bool(state)))
+
+		render_frame_budget_spinbox = QSpinBox()
+		render_frame_budget_spinbox.setRange(1, 1000)
+		render_frame_budget_spinbox.setSuffix(" ms")
+		render_frame_budget_spinbox.setValue(self.prefs.file["render_frame_budget"])
+		render_frame_budget_spinbox.setToolTip("Longest time the window is blocked while the tree is shown, big trees are filled in behind the first rows.")
+		render_frame_budget_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("render_frame_budget", value))
+
+		inspection_threads_spinbox = QSpinBox()
+		inspection_threads_spinbox.setRange(1, 16)
+		inspection_threads_spinbox.setValue(self.prefs.file["inspection_threads"])
+		inspection_threads_spinbox.setToolTip("Files inspected at the same time, the file shown goes first.")
+		inspection_threads_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("inspection_threads", value))
+
+		static_attributes_toggle = AnimatedToggle()
+		static_attributes_toggle.setChecked(self.prefs.file["static_attributes"])
+		static_attributes_toggle.setToolTip("Don't run properties, descriptors or the __str__ of values, they are reported without being invoked.")
+		static_attributes_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("static_attributes", bool(state)))
+
+		profile_inspection_toggle = AnimatedToggle()
+		profile_inspection_toggle.setChecked(self.prefs.file["profile_inspection"])
+		profile_inspection_toggle.setToolTip("Record the time spent in each member (File > Profile... > Slowest members), makes loading slower and skips the cache.")
+		profile_inspection_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("profile_inspection", bool(state)))
+
+		value_max_length_spinbox = QSpinBox()
+		value_max_length_spinbox.setRange(10, 1_000_000)
+		value_max_length_spinbox.setValue(self.prefs.file["value_rendering"]["max_length"])
+		value_max_length_spinbox.setToolTip("Longer values are shortened, use \"Show full value\" in the member context menu to see them entirely.")
+		value_max_length_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("value_rendering/max_length", value))
+
+		value_time_budget_spinbox = QDoubleSpinBox()
+		value_time_budget_spinbox.setRange(0.01, 60)
+		value_time_budget_spinbox.setSuffix(" s")
+		value_time_budget_spinbox.setValue(self.prefs.file["value_rendering"]["time_budget"])
+		value_time_budget_spinbox.setToolTip("Time to wait for the __str__ of each value before giving up.")
+		value_time_budget_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("value_rendering/time_budget", value))
+
+		inspection_time_limit_spinbox = QDoubleSpinBox()
+		inspection_time_limit_spinbox.setRange(0, 3600)
+		inspection_time_limit_spinbox.setSuffix(" s")
+		inspection_time_limit_spinbox.setSpecialValueText("No limit")
+		inspection_time_limit_spinbox.setValue(self.prefs.file["inspection_budget"]["time_limit"])
+		inspection_time_limit_spinbox.setToolTip("Stop inspecting after this time and show the members inspected so far (the time to load the file doesn't count).")
+		inspection_time_limit_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("inspection_budget/time_limit", value))
+
+		inspection_memory_limit_spinbox = QSpinBox()
+		inspection_memory_limit_spinbox.setRange(0, 1_000_000)
+		inspection_memory_limit_spinbox.setSuffix(" MiB")
+		inspection_memory_limit_spinbox.setSpecialValueText("No limit")
+		inspection_memory_limit_spinbox.setValue(self.prefs.file["inspection_budget"]["memory_limit"])
+		inspection_memory_limit_spinbox.setToolTip("Stop inspecting when the memory used grows more than this and show the members inspected so far.")
+		inspection_memory_limit_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("inspection_budget/memory_limit", value))
+
+		cache_toggle = AnimatedToggle()
+		cache_toggle.setChecked(self.prefs.file["cache"]["enabled"])
+		cache_toggle.setToolTip("Reuse the last result of a module if it didn't change.")
+		cache_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("cache/enabled", bool(state)))
+
+		clear_cache_button = QPushButton("Clear cache")
+		clear_cache_button.clicked.connect(lambda: InspectionCache().clear())
+
+		inspect_module_tab.layout().addRow("Engine: ", inspect_engine_combobox)
+		inspect_module_tab.layout().addRow("Lazy inspection: ", lazy_inspection_toggle)
+		inspect_module_tab.layout().addRow("Compact tree: ", compact_tree_toggle)
+		inspect_module_tab.layout().addRow("Tree view: ", tree_view_toggle)
+		inspect_module_tab.layout().addRow("Frame budget: ", render_frame_budget_spinbox)
+		inspect_module_tab.layout().addRow("Files loaded at once: ", inspection_threads_spinbox)
+		inspect_module_tab.layout().addRow("Don't invoke descriptors: ", static_attributes_toggle)
+		inspect_module_tab.layout().addRow("Profile inspection: ", profile_inspection_toggle)
+		inspect_module_tab.layout().addRow("Max value length: ", value_max_length_spinbox)
+		inspect_module_tab.layout().addRow("Value time budget: ", value_time_budget_spinbox)
+		inspect_module_tab.layout().addRow("Time limit: ", inspection_time_limit_spinbox)
+		inspect_module_tab.layout().addRow("Memory limit: ", inspection_memory_limit_spinbox)
+		inspect_module_tab.layout().addRow("Cache results: ", cache_toggle)
+		inspect_module_tab.layout().addRow(clear_cache_button)
+
+		return inspect_module_tab
+
+	def update_lazy_inspection_toggle(self, sandbox_enabled: bool):
+		"""Lazy inspection needs the module executed in this process, so it's disabled (and the tooltip says why) while modules are sandboxed.
+		"""
+		tooltip = "Only inspect the top-level members, nested members are inspected when they are uncollapsed.\nNot for packages, they are inspected in other processes."
+
+		if sandbox_enabled:
+			tooltip = "Not available while modules are sandboxed (see the Sandbox tab), they are inspected in other processes."
+
+		self.lazy_inspection_toggle.setEnabled(not sandbox_enabled)
+		self.lazy_inspection_toggle.setToolTip(tooltip)
+
+	def create_sandbox_tab(self):
+		sandbox_tab = QWidget()
+		sandbox_tab.setLayout(FormLayout(stretch=False))
+
+		sandbox_toggle = AnimatedToggle()
+		sandbox_toggle.setChecked(self.prefs.file["sandbox"]["enabled"])
+		sandbox_toggle.setToolTip("Execute the modules in a separate process, so a module that crashes, exits or never ends can't close PyAPIReference.\nLazy inspection is not available in a sandbox. Packages are always inspected in sandboxes.")
+		sandbox_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("sandbox/enabled", bool(state)))
+		sandbox_toggle.stateChanged.connect(lambda state: self.update_lazy_inspection_toggle(bool(state)))
+
+		sandbox_cpu_time_spinbox = QSpinBox()
+		sandbox_cpu_time_spinbox.setRange(0, 86400)
+		sandbox_cpu_time_spinbox.setSuffix(" s")
+		sandbox_cpu_time_spinbox.setSpecialValueText("No limit")
+		sandbox_cpu_time_spinbox.setValue(self.prefs.file["sandbox"]["cpu_time"])
+		sandbox_cpu_time_spinbox.setToolTip("CPU time each module can use in its sandbox (not available on Windows).")
+		sandbox_cpu_time_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("sandbox/cpu_time", value))
+
+		sandbox_memory_spinbox = QSpinBox()
+		sandbox_memory_spinbox.setRange(0, 1_000_000)
+		sandbox_memory_spinbox.setSuffix(" MiB")
+		sandbox_memory_spinbox.setSpecialValueText("No limit")
+		sandbox_memory_spinbox.setValue(self.prefs.file["sandbox"]["memory"])
+		sandbox_memory_spinbox.setToolTip("Memory each module can allocate in its sandbox (not available on Windows and macOS).")
+		sandbox_memory_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("sandbox/memory", value))
+
+		sandbox_timeout_spinbox = QSpinBox()
+		sandbox_timeout_spinbox.setRange(0, 86400)
+		sandbox_timeout_spinbox.setSuffix(" s")
+		sandbox_timeout_spinbox.setSpecialValueText("No limit")
+		sandbox_timeout_spinbox.setValue(self.prefs.file["sandbox"]["timeout"])
+		sandbox_timeout_spinbox.setToolTip("Time until the sandbox of a module is killed, including executing the module.")
+		sandbox_timeout_spinbox.valueChanged.connect(lambda value: self.prefs.write_prefs("sandbox/timeout", value))
+
+		warm_workers_toggle = AnimatedToggle()
+		warm_workers_toggle.setChecked(self.prefs.file["sandbox"]["warm_workers"])
+		warm_workers_toggle.setToolTip("Reuse worker processes instead of starting a sandbox for each module, the packages they import stay imported.\nChanges apply after restarting PyAPIReference.")
+		warm_workers_toggle.stateChanged.connect(lambda state: self.prefs.write_prefs("sandbox/warm_workers", bool(state)))
+
+		interpreter_line_edit = QLineEdit(self.prefs.file["sandbox"]["interpreter"])
+		interpreter_line_edit.setPlaceholderText("PyAPIReference's Python")
+		interpreter_line_edit.setToolTip("Python executable of the workers (e.g.: the one of a virtualenv), it needs Python 3.9+ and PREFS installed.\nChanges apply after restarting PyAPIReference.")
+		interpreter_line_edit.editingFinished.connect(lambda: self.prefs.write_prefs("sandbox/interpreter", interpreter_line_edit.text().strip()))
+
+		preload_line_edit = QLineEdit(", ".join(self.prefs.file["sandbox"]["preload"]))
+		preload_line_edit.setPlaceholderText("e.g.: numpy, pandas")
+		preload_line_edit.setToolTip("Modules the workers import when they start, separated by commas.\nChanges apply after restarting PyAPIReference.")
+		preload_line_edit.editingFinished.connect(
+			lambda: self.prefs.write_prefs("sandbox/preload", [module_name.strip() for module_name in preload_line_edit.text().split(",") if module_name.strip()])
+		)
+
+		sandbox_tab.layout().addRow("Sandbox modules: ", sandbox_toggle)
+		sandbox_tab.layout().addRow("CPU time: ", sandbox_cpu_time_spinbox)
+		sandbox_tab.layout().addRow("Memory: ", sandbox_memory_spinbox)
+		sandbox_tab.layout().addRow("Timeout: ", sandbox_timeout_spinbox)
+		sandbox_tab.layout().addRow("Warm workers: ", warm_workers_toggle)
+		sandbox_tab.layout().addRow("Interpreter: ", interpreter_line_edit)
+		sandbox_tab.layout().addRow("Preload: ", preload_line_edit)
+
+		return sandbox_tab
 
 	def create_theme_tab(self):
 		def dark_theme_toggle_changed(state: int):
@@ -0,0 +1,469 @@
+"""Tree tab as a QTreeView over an item model of the inspection result, instead of a CollapsibleWidget per member (see collapsible_widget.py).
+Only the rows of the expanded members exist and only the visible ones are painted, so big modules are shown as fast as small ones.
+Example:
+	style = DisplayStyle(colors, font_color="#ffffff", code_block_stylesheet="background-color: #484848; color: white;")
+	model = InspectionTreeModel(build_display_tree(module_content, style), style)
+	tree_view = InspectionTreeView(model)
+	tree_view.add_context_menu_action("Show full value", lambda node: print(node.member_path), lambda node: node.has_value)
+	print(tree_view.tree_to_dict()) # Same as CollapsibleWidget.tree_to_dict
+Notes:
+	The rows are the same as the collapsibles and labels of MainWidget.create_collapsible_object, both are created from the rows of display_model.py,
+	the collapsibles are the rows with children and the checkboxes are checkable rows.
+	With a ProgressiveRenderer (see progressive_renderer.py) the rows of a member with many children are created and inserted in slices.
+"""
+from PyQt5.QtWidgets import QApplication, QTreeView, QStyledItemDelegate, QStyle, QStyleOptionViewItem, QHeaderView, QMenu, QAction
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QSize
+from PyQt5.QtGui import QTextDocument, QAbstractTextDocumentLayout, QPalette, QCursor
+
+from display_model import DisplayNode, DisplayStyle, iter_prepared_children, is_lazy
+
+HTML_ROLE = Qt.UserRole # Rich text of a row
+
+
+class TreeNode:
+	"""A row of InspectionTreeModel, its children are created the first time they are needed (it's expanded or its checkboxes are read).
+	Attributes:
+		display: the prepared row (see display_model.py), its name, rich text, checkbox...
+		checked: if the checkbox is checked (included in the Markdown).
+		children_steps: iterator that creates the rest of the children, None once all of them are created.
+		fetched: the children are being added (or were added) to the model.
+		row_count: the children added to the model, the rows of the node.
+	"""
+	__slots__ = ("parent", "row", "display", "checked", "children", "children_steps", "fetched", "row_count")
+
+	def __init__(self, display: DisplayNode):
+		self.parent = None
+		self.row = 0
+		self.display = display
+		self.checked = display.checked
+		self.children = None
+		self.children_steps = None
+		self.fetched = False
+		self.row_count = 0
+
+	def __repr__(self):
+		return f"TreeNode({self.name!r}, children={'not created' if self.children is None else len(self.children)}, rows={self.row_count})"
+
+	@property
+	def name(self) -> str:
+		return self.display.name
+
+	@property
+	def html(self) -> str:
+		return self.display.html
+
+	@property
+	def checkable(self) -> bool:
+		return self.display.checkable
+
+	@property
+	def member_path(self) -> tuple:
+		return self.display.member_path
+
+	@property
+	def has_value(self) -> bool:
+		return self.display.has_value
+
+	@property
+	def is_expandable(self) -> bool:
+		return self.display.is_expandable
+
+	def add_child(self, child: "TreeNode") -> None:
+		child.parent = self
+		child.row = len(self.children)
+
+		if self.checkable and not self.checked and child.checkable:
+			child.checked = False
+
+		self.children.append(child)
+
+
+class InspectionTreeModel(QAbstractItemModel):
+	"""Item model over the rows prepared from a tree generated by inspect_object (see build_display_tree in display_model.py), one column.
+	Arguments:
+		display_tree: the row of the inspected object.
+		style: colors of the rows of the contents not inspected yet, prepared when they are expanded.
+		renderer: ProgressiveRenderer to create the rows of the expanded members in slices, None to create them at once.
+		content_loader: called with a lazy content (see display_model.is_lazy) and a callback, to load it without blocking (e.g.: in another thread),
+		the rows are created once the callback is called. None to load it when it's expanded.
+	"""
+	def __init__(self, display_tree: DisplayNode, style: DisplayStyle, renderer=None, content_loader: callable=None, parent=None):
+		super().__init__(parent)
+
+		self.style = style
+		self.renderer = renderer
+		self.content_loader = content_loader
+
+		self.root = TreeNode(DisplayNode(None, display_tree.kind, ""))
+		self.root.children = []
+		self.root.fetched = True
+
+		self.root.add_child(TreeNode(display_tree))
+		self.root.row_count = 1
+
+	def find_child(self, parent: QModelIndex, name: str) -> QModelIndex:
+		"""Returns the index of the child of parent called name (among the rows added), an invalid index if there's none.
+		"""
+		for child in (self.get_node(parent).children or ())[:self.rowCount(parent)]:
+			if child.name == name:
+				return self.get_index(child)
+
+		return QModelIndex()
+
+	def get_node(self, index: QModelIndex) -> TreeNode:
+		if not index.isValid():
+			return self.root
+
+		return index.internalPointer()
+
+	def get_index(self, node: TreeNode) -> QModelIndex:
+		if node is self.root:
+			return QModelIndex()
+
+		return self.createIndex(node.row, 0, node)
+
+	def index(self, row: int, column: int, parent: QModelIndex=QModelIndex()) -> QModelIndex:
+		node = self.get_node(parent)
+
+		if column != 0 or not 0 <= row < node.row_count:
+			return QModelIndex()
+
+		return self.createIndex(row, column, node.children[row])
+
+	def parent(self, index: QModelIndex) -> QModelIndex:
+		if not index.isValid():
+			return QModelIndex()
+
+		return self.get_index(index.internalPointer().parent)
+
+	def rowCount(self, parent: QModelIndex=QModelIndex()) -> int:
+		return self.get_node(parent).row_count
+
+	def columnCount(self, parent: QModelIndex=QModelIndex()) -> int:
+		return 1
+
+	def hasChildren(self, parent: QModelIndex=QModelIndex()) -> bool:
+		node = self.get_node(parent)
+
+		if node.fetched and node.children_steps is None:
+			return node.row_count > 0
+
+		return node.is_expandable
+
+	def canFetchMore(self, parent: QModelIndex) -> bool:
+		node = self.get_node(parent)
+		return node.is_expandable and not node.fetched
+
+	def fetchMore(self, parent: QModelIndex) -> None:
+		node = self.get_node(parent)
+		node.fetched = True
+
+		if self.content_loader is not None and is_lazy(node.display):
+			self.content_loader(node.display.value, lambda: self.create_children(node))
+			return
+
+		self.create_children(node)
+
+	def create_children(self, node: TreeNode) -> None:
+		"""Create the children of node and add them to the model, in slices if there's a renderer.
+		"""
+		if self.renderer is None:
+			self.get_children(node) # A lazy content is inspected here without content_loader
+			self.insert_created_rows(node)
+			return
+
+		self.start_creating_children(node)
+
+		if node.children_steps is None: # Created before, e.g.: by tree_to_dict
+			self.insert_created_rows(node)
+			return
+
+		self.renderer.add_task(
+			node.children_steps, 
+			None if node.display.children is None else len(node.display.children), 
+			on_slice_end=lambda: self.insert_created_rows(node), 
+			on_finished=lambda: self.finish_creating_children(node)
+		)
+
+	def insert_created_rows(self, node: TreeNode) -> None:
+		"""Add the children created since the last call to the model.
+		"""
+		if len(node.children) == node.row_count:
+			return
+
+		self.beginInsertRows(self.get_index(node), node.row_count, len(node.children) - 1)
+		node.row_count = len(node.children)
+		self.endInsertRows()
+
+	def finish_creating_children(self, node: TreeNode) -> None:
+		node.children_steps = None
+		self.insert_created_rows(node)
+
+		if node.row_count == 0: # Without children, the expand arrow is removed
+			index = self.get_index(node)
+			self.dataChanged.emit(index, index)
+
+	def flags(self, index: QModelIndex):
+		if not index.isValid():
+			return Qt.NoItemFlags
+
+		flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+		if index.internalPointer().checkable:
+			flags |= Qt.ItemIsUserCheckable
+
+		return flags
+
+	def data(self, index: QModelIndex, role: int=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+
+		node = index.internalPointer()
+
+		if role == Qt.DisplayRole:
+			return node.name
+		elif role == HTML_ROLE:
+			return node.html
+		elif role == Qt.CheckStateRole and node.checkable:
+			return Qt.Checked if node.checked else Qt.Unchecked
+		elif role == Qt.ToolTipRole and node.checkable:
+			return "Include in Markdown?"
+
+		return None
+
+	def setData(self, index: QModelIndex, value, role: int=Qt.EditRole) -> bool:
+		if role != Qt.CheckStateRole or not index.isValid() or not index.internalPointer().checkable:
+			return False
+
+		node = index.internalPointer()
+		node.checked = value == Qt.Checked
+		self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+
+		if not node.checked: # Same as CheckBoxCollapseButton, unchecking a row unchecks its children
+			self.uncheck_children(node)
+
+		return True
+
+	def uncheck_children(self, node: TreeNode) -> None:
+		if node.children is None:
+			return # Created unchecked, see TreeNode.add_child
+
+		for child in node.children:
+			if not child.checkable:
+				continue
+
+			child.checked = False
+			self.uncheck_children(child)
+
+		if node.row_count > 0:
+			self.dataChanged.emit(self.get_index(node.children[0]), self.get_index(node.children[node.row_count - 1]), [Qt.CheckStateRole])
+
+	def tree_to_dict(self, node: TreeNode=None, include_title: bool=True):
+		"""Same as CollapsibleWidget.tree_to_dict, the children not created yet are created (not added to the model) to read their checkboxes,
+		unless it requires inspecting them (a lazy content).
+		"""
+		if node is None:
+			node = self.root.children[0]
+
+		# [node, its children not visited yet, its content, checkable children], walked with a stack so it works with trees of any depth
+		stack = [self.start_tree_to_dict(node)]
+		content = None # Of the last node left
+
+		while len(stack) > 0:
+			frame = stack[-1]
+			node = frame[0]
+
+			for child in frame[1]:
+				if not child.checkable or not child.is_expandable:
+					continue
+
+				frame[3] += 1
+
+				if not child.checked:
+					frame[2][child.name] = False
+					continue
+
+				stack.append(self.start_tree_to_dict(child))
+				break
+			else:
+				stack.pop()
+				content = node.checked if frame[3] == 0 and node.checkable else frame[2]
+
+				if len(stack) > 0:
+					stack[-1][2][node.name] = content
+
+		return {node.name: content} if include_title else content
+
+	def start_tree_to_dict(self, node: TreeNode) -> list:
+		if node.children is not None or (node.is_expandable and not is_lazy(node.display)):
+			children = self.get_children(node)
+		else:
+			children = ()
+
+		return [node, iter(children), {}, 0]
+
+	def get_children(self, node: TreeNode) -> list:
+		"""Returns all the children of node, creating the ones not created yet (see start_creating_children).
+		"""
+		self.start_creating_children(node)
+
+		if node.children_steps is not None:
+			for step in node.children_steps:
+				pass
+
+			node.children_steps = None
+
+		return node.children
+
+	def start_creating_children(self, node: TreeNode) -> None:
+		"""Set the iterator that creates the children of node (one each step) the first time, see iter_children.
+		"""
+		if node.children is not None:
+			return
+
+		node.children = []
+		node.children_steps = self.iter_children(node)
+
+	def iter_children(self, node: TreeNode):
+		for display_child in iter_prepared_children(node.display, self.style): # A lazy content is inspected here
+			node.add_child(TreeNode(display_child))
+			yield
+
+
+class HtmlItemDelegate(QStyledItemDelegate):
+	"""Paints the rich text of the rows (HTML_ROLE), e.g.: the code blocks of the values.
+	"""
+	def create_document(self, option: QStyleOptionViewItem, index: QModelIndex) -> QTextDocument:
+		document = QTextDocument()
+		document.setDocumentMargin(2)
+		document.setDefaultFont(option.font)
+		document.setHtml(index.data(HTML_ROLE) or "")
+
+		return document
+
+	def paint(self, painter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+		option = QStyleOptionViewItem(option)
+		self.initStyleOption(option, index)
+
+		document = self.create_document(option, index)
+		option.text = "" # The text is the document
+
+		style = QApplication.style() if option.widget is None else option.widget.style()
+		style.drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget) # Background, checkbox and focus
+
+		text_rect = style.subElementRect(QStyle.SE_ItemViewItemText, option, option.widget)
+
+		context = QAbstractTextDocumentLayout.PaintContext()
+		text_color_role = QPalette.HighlightedText if option.state & QStyle.State_Selected else QPalette.Text
+		context.palette.setColor(QPalette.Text, option.palette.color(text_color_role))
+
+		painter.save()
+		painter.translate(text_rect.topLeft())
+		painter.setClipRect(text_rect.translated(-text_rect.topLeft()))
+		document.documentLayout().draw(painter, context)
+		painter.restore()
+
+	def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+		option = QStyleOptionViewItem(option)
+		self.initStyleOption(option, index)
+
+		document = self.create_document(option, index)
+		width = document.idealWidth()
+
+		if option.features & QStyleOptionViewItem.HasCheckIndicator:
+			style = QApplication.style() if option.widget is None else option.widget.style()
+			width += style.pixelMetric(QStyle.PM_IndicatorWidth, option, option.widget) + 2 * (style.pixelMetric(QStyle.PM_FocusFrameHMargin, option, option.widget) + 1)
+
+		return QSize(int(width), int(document.size().height()))
+
+
+class InspectionTreeView(QTreeView):
+	"""Shows an InspectionTreeModel with the object expanded, the rows have the context menu of CollapsibleWidget (Fold, Unfold...).
+	"""
+	def __init__(self, model: InspectionTreeModel, parent=None):
+		super().__init__(parent)
+
+		self.context_menu_actions = [] # (text, callback, condition) added to the context menu, see add_context_menu_action
+
+		self.setModel(model)
+		self.setItemDelegate(HtmlItemDelegate(self))
+		self.setHeaderHidden(True)
+		self.setUniformRowHeights(False) # Multiple line values (e.g.: docstrings) are taller
+		self.header().setStretchLastSection(False)
+		self.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+		self.header().setResizeContentsPrecision(0) # Only measure the visible rows
+
+		self.setContextMenuPolicy(Qt.CustomContextMenu)
+		self.customContextMenuRequested.connect(self.context_menu)
+
+		self.expand_now(model.index(0, 0))
+
+	def expand_now(self, index: QModelIndex):
+		"""Expand index and create its rows (or their first slice) now, QTreeView.expand waits until the view is laid out.
+		"""
+		if self.model().canFetchMore(index):
+			self.model().fetchMore(index)
+
+		self.expand(index)
+
+	def context_menu(self, pos):
+		index = self.indexAt(pos)
+		if not index.isValid():
+			return
+
+		node = self.model().get_node(index)
+		menu = QMenu(self)
+		actions = [] # Keep a reference until the menu is closed
+
+		if node.is_expandable:
+			for text, callback in (
+				("Fold", lambda: self.collapse(index)),
+				("Unfold", lambda: self.expand(index)),
+				("Fold all", lambda: self.fold_all(index)),
+				("Unfold all", lambda: self.unfold_all(index)),
+			):
+				action = QAction(text)
+				action.triggered.connect(lambda ignore, callback=callback: callback())
+				actions.append(action)
+
+			menu.addActions(actions)
+
+		extra_actions = []
+		for text, callback, condition in self.context_menu_actions:
+			if condition(node):
+				extra_action = QAction(text)
+				extra_action.triggered.connect(lambda ignore, callback=callback: callback(node))
+				extra_actions.append(extra_action)
+
+		if len(extra_actions) > 0:
+			if len(actions) > 0:
+				menu.addSeparator()
+
+			menu.addActions(extra_actions)
+
+		if len(actions) + len(extra_actions) > 0:
+			menu.exec_(QCursor.pos())
+
+	def add_context_menu_action(self, text: str, callback: callable, condition: callable):
+		"""Add an action to the context menu of the rows where condition(node) is True, callback(node) is called when it's triggered.
+		"""
+		self.context_menu_actions.append((text, callback, condition))
+
+	def fold_all(self, index: QModelIndex):
+		"""Same as CollapsibleWidget.fold_all, collapse the children of index.
+		"""
+		for row in range(self.model().rowCount(index)):
+			self.collapse(self.model().index(row, 0, index))
+
+	def unfold_all(self, index: QModelIndex):
+		"""Same as CollapsibleWidget.unfold_all, expand index and its children.
+		"""
+		self.expand(index)
+
+		for row in range(self.model().rowCount(index)):
+			child_index = self.model().index(row, 0, index)
+
+			if self.model().hasChildren(child_index):
+				self.expand(child_index)
+
+	def tree_to_dict(self) -> dict:
+		return self.model().tree_to_dict()
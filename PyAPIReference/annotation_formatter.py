@@ -0,0 +1,122 @@
+"""Format the annotations of parameters and return values as strings, the way they are written in the source.
+Handles classes, typing generics (Optional, Union, Callable, Literal, Annotated...), builtin generics (list[int]),
+PEP 604 unions (int | None), TypeVars and forward references (string annotations).
+Example:
+	formatter = AnnotationFormatter()
+	print(formatter.format(Optional[Dict[str, "Person"]]), formatter.format(list[int] | None))
+	>>> Optional[Dict[str, Person]] list[int] | None
+"""
+import ast
+import inspect
+import types
+import typing
+from types import GenericAlias
+from static_inspect import get_annotation
+
+NONE_TYPE = type(None)
+UNION_TYPE = getattr(types, "UnionType", None) # Type of int | None, Python 3.10+
+
+
+class AnnotationFormatter:
+	"""Formats annotations, each unique annotation is formatted once.
+	Attributes:
+		cache: {(type, annotation): result} of the hashable annotations (the type so 1 and True are different).
+		identity_cache: {id(annotation): (annotation, result)} of the unhashable ones (e.g.: Annotated with a dict),
+		the annotation is kept so its id is not reused by another object.
+	"""
+	def __init__(self):
+		self.cache = {}
+		self.identity_cache = {}
+
+	def format(self, annotation):
+		"""Returns annotation as a string, None if there's no annotation (or it's None).
+		Tuple and list annotations (e.g.: a: (int, str)) are formatted as a list of strings, the same as static_inspect does.
+		"""
+		try:
+			key = type(annotation), annotation
+			result = self.cache[key]
+		except TypeError: # Unhashable
+			if id(annotation) in self.identity_cache:
+				result = self.identity_cache[id(annotation)][1]
+			else:
+				result = self.format_uncached(annotation)
+				self.identity_cache[id(annotation)] = annotation, result
+		except KeyError:
+			result = self.format_uncached(annotation)
+			self.cache[key] = result
+
+		return list(result) if isinstance(result, list) else result # A copy, the cached list is shared
+
+	def format_uncached(self, annotation):
+		if annotation is inspect.Parameter.empty or annotation is None:
+			return None
+
+		if isinstance(annotation, (tuple, list)):
+			return [self.format(element) for element in annotation]
+
+		if isinstance(annotation, str):
+			return format_source(annotation)
+
+		return self.format_type(annotation)
+
+	def format_type(self, annotation) -> str:
+		"""Returns annotation (any object allowed inside an annotation) as a string.
+		"""
+		if annotation is None or annotation is NONE_TYPE:
+			return "None"
+		elif annotation is Ellipsis:
+			return "..."
+		elif isinstance(annotation, str):
+			return annotation
+		elif isinstance(annotation, typing.ForwardRef):
+			return annotation.__forward_arg__
+		elif isinstance(annotation, (list, tuple)): # Arguments of Callable, e.g.: Callable[[int, str], bool]
+			return f"[{', '.join(self.format_type(argument) for argument in annotation)}]"
+
+		origin = typing.get_origin(annotation)
+		arguments = typing.get_args(annotation)
+
+		if UNION_TYPE is not None and isinstance(annotation, UNION_TYPE):
+			return " | ".join(self.format_type(argument) for argument in arguments)
+
+		elif origin is typing.Union:
+			if len(arguments) == 2 and NONE_TYPE in arguments:
+				optional_argument = arguments[0] if arguments[1] is NONE_TYPE else arguments[1]
+				return f"Optional[{self.format_type(optional_argument)}]"
+
+			return f"Union[{', '.join(self.format_type(argument) for argument in arguments)}]"
+
+		elif origin is typing.Literal:
+			return f"Literal[{', '.join(repr(argument) for argument in arguments)}]"
+
+		elif origin is typing.Annotated:
+			metadata = ", ".join(repr(argument) for argument in annotation.__metadata__)
+			return f"Annotated[{self.format_type(annotation.__origin__)}, {metadata}]"
+
+		elif origin is not None or isinstance(annotation, GenericAlias):
+			return self.format_generic(annotation, origin, arguments)
+
+		elif isinstance(annotation, type) or isinstance(getattr(annotation, "__name__", None), str):
+			return annotation.__name__ # Classes, TypeVars, NewTypes, etc
+
+		return repr(annotation).replace("typing.", "")
+
+	def format_generic(self, annotation, origin, arguments: tuple) -> str:
+		# typing aliases keep their name (List[int]), builtin generics use the name of the class (list[int])
+		name = getattr(annotation, "_name", None) or getattr(origin, "__name__", None) or repr(origin).replace("typing.", "")
+
+		if len(arguments) == 0:
+			# tuple[()] has no arguments but it's subscripted
+			return f"{name}[()]" if getattr(annotation, "__args__", None) == () else name
+
+		return f"{name}[{', '.join(self.format_type(argument) for argument in arguments)}]"
+
+
+def format_source(annotation: str):
+	"""Formats a string annotation (e.g.: all of them with from __future__ import annotations) the same as static_inspect does,
+	e.g.: "'Person'" -> Person, "None" -> None, "(int, str)" -> ["int", "str"].
+	"""
+	try:
+		return get_annotation(ast.parse(annotation, mode="eval").body)
+	except SyntaxError:
+		return annotation
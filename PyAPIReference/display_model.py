@@ -0,0 +1,272 @@
+"""Rows of the Tree tab prepared from the tree generated by inspect_object: their rich text, color and checkbox are resolved
+by the InspectModule worker (see main.py), so the GUI thread only creates the widgets (see MainWidget.create_collapsible_object)
+or the rows of the view (see GUI/tree_view.py) from them.
+Example:
+	style = DisplayStyle(colors, font_color="#ffffff", code_block_stylesheet="background-color: #484848; color: white;")
+	display_tree = build_display_tree(module_content, style)
+	for node in display_tree.children:
+		print(node.kind, node.name, node.html)
+Notes:
+	The contents not inspected yet (a LazyDict) and the rows beyond MAX_PREPARED_ROWS are prepared when they are shown, see prepare_children.
+"""
+import html
+from enum import Enum
+from collections import deque
+from collections.abc import Mapping
+
+from inspect_object import LazyDict
+from extra import convert_to_code_block
+
+PROPERTIES_WITHOUT_CHECKBOX = ("docstring", "inherits")
+PROPERTIES_DISABLED_BY_DEFAULT = ("self",)
+
+MAX_PREPARED_ROWS = 20_000 # Rows prepared by build_display_tree, the deepest ones of big trees (e.g.: the parameters of thousands of functions) take more memory than the tree
+
+
+class RowKinds(Enum):
+	OBJECT = "object" # The inspected object, its rows are its properties (including the empty ones)
+	PROPERTY = "property" # A property whose value is a dictionary, a list or a multiple line string, the rows are its value
+	LABEL = "label" # property: value
+	TEXT = "text" # An item of a list or a multiple line string
+
+
+class DisplayStyle:
+	"""Colors of the rows, read from the settings and the theme in the GUI thread.
+	Arguments:
+		colors: {member type or property name: color}, the colors setting.
+		font_color: color of the rest of the rows.
+		code_block_stylesheet: style of the values, see convert_to_code_block in extra.py.
+	"""
+	def __init__(self, colors: dict, font_color: str, code_block_stylesheet: str):
+		self.colors = dict(colors)
+		self.font_color = font_color
+		self.code_block_stylesheet = code_block_stylesheet
+
+	def __repr__(self):
+		return f"DisplayStyle(colors={len(self.colors)}, font_color={self.font_color!r})"
+
+	def get_color(self, object_type: str) -> str:
+		return self.colors.get(object_type, self.font_color)
+
+	def to_code_block(self, value) -> str:
+		return convert_to_code_block(html.escape(value) if isinstance(value, str) else value, self.code_block_stylesheet)
+
+	def to_html(self, text: str, color: str) -> str:
+		return f"<span style='color: {color};'>{html.escape(text)}</span>"
+
+
+class DisplayNode:
+	"""A row of the tree.
+	Attributes:
+		name: property or member name, the key of the row in tree_to_dict.
+		html: rich text of the row (for a property, its title).
+		color: color of the title of a property.
+		value: the value the children are prepared from, None if the row has no children (a label).
+		checkable: if it has a checkbox (included in the Markdown if checked).
+		checked: if the checkbox is checked by default.
+		member_path: (module name, member name...) of the member the row belongs to.
+		has_value: the row is a member with a value (that may be shortened, see value_renderer.py).
+		children: the rows of the value, None until they are prepared.
+	"""
+	__slots__ = ("name", "kind", "html", "color", "value", "checkable", "checked", "member_path", "has_value", "children")
+
+	def __init__(self, name: str, kind: RowKinds, html: str, color: str=None, value=None, checkable: bool=False, checked: bool=True, member_path: tuple=(), has_value: bool=False):
+		self.name = name
+		self.kind = kind
+		self.html = html
+		self.color = color
+		self.value = value
+		self.checkable = checkable
+		self.checked = checked
+		self.member_path = member_path
+		self.has_value = has_value
+		self.children = None
+
+	def __repr__(self):
+		return f"DisplayNode({self.name!r}, {self.kind.value}, children={'not prepared' if self.children is None else len(self.children)})"
+
+	@property
+	def is_expandable(self) -> bool:
+		return self.value is not None
+
+
+def build_display_tree(tree: dict, style: DisplayStyle, max_rows: int=MAX_PREPARED_ROWS) -> DisplayNode:
+	"""Returns the row of the object of tree ({object_name: properties}) with its rows prepared level by level until there are max_rows,
+	except the contents not inspected yet.
+	"""
+	object_name = tuple(tree)[0]
+	object_properties = tree[object_name]
+
+	color = style.get_color(object_properties["type"])
+	display_tree = DisplayNode(object_name, RowKinds.OBJECT, style.to_html(object_name, color), color, object_properties, member_path=(object_name,))
+
+	nodes = deque([display_tree])
+	rows = 0
+
+	while len(nodes) > 0 and rows < max_rows:
+		node = nodes.popleft()
+
+		if is_lazy(node):
+			continue
+
+		children = prepare_children(node, style)
+		rows += len(children)
+
+		nodes.extend(child for child in children if child.is_expandable)
+
+	return display_tree
+
+def prepare_children(node: DisplayNode, style: DisplayStyle) -> list:
+	"""Returns the children of node, preparing them the first time (a lazy content is inspected here).
+	"""
+	if node.children is None:
+		for child in iter_prepared_children(node, style):
+			pass
+
+	return node.children
+
+def iter_prepared_children(node: DisplayNode, style: DisplayStyle):
+	"""Same as prepare_children but yields each child once it's prepared, so the caller can stop between them (see GUI/progressive_renderer.py).
+	node.children is only set once all of them were prepared.
+	"""
+	if node.children is not None:
+		yield from node.children
+		return
+
+	children = []
+	for child in create_children(node, style):
+		children.append(child)
+		yield child
+
+	node.children = children
+
+def create_children(node: DisplayNode, style: DisplayStyle):
+	"""Yields the new rows of the value of node.
+	"""
+	value = node.value
+
+	if node.kind == RowKinds.OBJECT:
+		for property_name, property_value in value.items():
+			if is_collapsible(property_value):
+				property_node = create_property_node(property_name, property_value, node.member_path, style)
+
+				if property_node is not None:
+					yield property_node
+
+				continue
+
+			yield create_label_node(property_name, property_value, style)
+
+	elif isinstance(value, (list, tuple)):
+		for nested_property_value in value:
+			if not not not nested_property_value: # Means empty
+				continue
+
+			nested_property_text = str(nested_property_value)
+			yield DisplayNode(nested_property_text, RowKinds.TEXT, html.escape(nested_property_text))
+
+	elif isinstance(value, Mapping):
+		for nested_property_name, nested_property_value in value.items():
+			if is_empty(nested_property_value):
+				continue
+
+			if is_collapsible(nested_property_value):
+				nested_property_node = create_property_node(nested_property_name, nested_property_value, node.member_path, style)
+
+				if nested_property_node is not None:
+					yield nested_property_node
+
+				continue
+
+			yield create_label_node(nested_property_name, nested_property_value, style)
+
+	elif isinstance(value, str):
+		yield DisplayNode(node.name, RowKinds.TEXT, style.to_code_block(value.strip()))
+
+def create_property_node(property_name: str, property_value, member_path: tuple, style: DisplayStyle) -> DisplayNode:
+	"""Returns the row of a property whose value is a dictionary, a list or a multiple line string, None if it's empty.
+	"""
+	if is_empty(property_value):
+		return None
+
+	if is_not_loaded(property_value): # Content of a class or parameters of a function
+		color = style.get_color(property_name)
+	elif isinstance(property_value, Mapping) and "type" in property_value:
+		color = style.get_color(property_value["type"])
+	else:
+		color = style.get_color(property_name)
+
+	member = is_member(property_value)
+	if member:
+		member_path = (*member_path, property_name)
+
+	return DisplayNode(
+		property_name,
+		RowKinds.PROPERTY,
+		style.to_html(property_name, color),
+		color,
+		property_value,
+		checkable=property_name not in PROPERTIES_WITHOUT_CHECKBOX,
+		checked=property_name not in PROPERTIES_DISABLED_BY_DEFAULT,
+		member_path=member_path,
+		has_value=member and "value" in property_value
+	)
+
+def create_label_node(property_name: str, property_value, style: DisplayStyle) -> DisplayNode:
+	color = style.get_color(property_name)
+	return DisplayNode(property_name, RowKinds.LABEL, f"<span style='color: {color};'>{html.escape(property_name)}: {style.to_code_block(property_value)}</span>", color)
+
+def get_default_tree(node: DisplayNode, style: DisplayStyle) -> dict:
+	"""Returns what tree_to_dict (see CollapsibleWidget and InspectionTreeModel) returns for the rows of node with the default checkboxes,
+	{} if it has no rows with checkbox. A lazy content isn't inspected just to know its checkboxes.
+	"""
+	if not node.is_expandable or is_lazy(node):
+		return {}
+
+	# [node, its children not visited yet, its default tree], walked with a stack so it works with trees of any depth
+	stack = [[node, iter(prepare_children(node, style)), {}]]
+	default_tree = None # Of the last node left
+
+	while len(stack) > 0:
+		node, children, tree = stack[-1]
+
+		for child in children:
+			if not child.checkable or not child.is_expandable:
+				continue
+
+			if not child.checked:
+				tree[child.name] = False
+			elif is_lazy(child):
+				tree[child.name] = True
+			else:
+				stack.append([child, iter(prepare_children(child, style)), {}])
+				break
+		else:
+			stack.pop()
+			default_tree = tree
+
+			if len(stack) > 0:
+				stack[-1][2][node.name] = tree or True
+
+	return default_tree
+
+def is_lazy(node: DisplayNode) -> bool:
+	"""Returns True if the children of node can't be prepared without inspecting its content.
+	"""
+	return node.children is None and is_not_loaded(node.value)
+
+def is_collapsible(property_value) -> bool:
+	multiple_line_string = isinstance(property_value, str) and "\n" in property_value
+	return isinstance(property_value, (list, tuple, Mapping)) or multiple_line_string
+
+def is_not_loaded(property_value) -> bool:
+	return isinstance(property_value, LazyDict) and not property_value.loaded
+
+def is_member(property_value) -> bool:
+	return not is_not_loaded(property_value) and isinstance(property_value, Mapping) and isinstance(property_value.get("type"), str) and "docstring" in property_value
+
+def is_empty(property_value) -> bool:
+	if is_not_loaded(property_value):
+		return False # Don't inspect it just to know if it's empty
+
+	return not not not property_value
@@ -0,0 +1,135 @@
+"""Write the tree as JSON, YAML or PREFS from the events of iter_inspect_object or iter_tree_events (see inspection_events.py).
+Each event is written as soon as it's received, so the tree is never entirely in memory.
+Example:
+	with open("example.json", "w") as file:
+		write_json(iter_inspect_object(module), file)
+
+	with open("example.yaml", "w") as file:
+		write_yaml(iter_tree_events(tree), file)
+"""
+import json
+import yaml
+from inspection_events import ENTER, PROPERTY, LEAVE
+
+def write_json(events, file, indent: int=4) -> None:
+	"""Same output as json.dump(tree, file, indent=indent), or json.dump(tree, file, separators=(",", ":")) if indent is None.
+	"""
+	encoder = json.JSONEncoder(indent=indent, separators=(",", ":") if indent is None else None)
+	key_separator = ":" if indent is None else ": "
+	has_items = [False] # For each open mapping, if something was already written in it (to write the commas)
+	file.write("{")
+
+	def get_line_start(depth: int) -> str:
+		return "" if indent is None else f"\n{' ' * indent * depth}"
+
+	for event, name, value in events:
+		if event is LEAVE:
+			if has_items.pop():
+				file.write(f"{get_line_start(len(has_items))}}}")
+			else:
+				file.write("}")
+
+			continue
+
+		line_start = get_line_start(len(has_items))
+		separator = f"{',' if has_items[-1] else ''}{line_start}{encoder.encode(name)}{key_separator}"
+		has_items[-1] = True
+
+		if event is ENTER:
+			file.write(f"{separator}{{")
+			has_items.append(False)
+		elif isinstance(value, (list, tuple, dict)):
+			file.write(separator + encoder.encode(value).replace("\n", line_start))
+		else:
+			file.write(separator + encoder.encode(value))
+
+	file.write(f"{get_line_start(0)}}}" if has_items[0] else "}")
+
+def write_yaml(events, file) -> None:
+	"""Same output as yaml.dump(tree, file, sort_keys=False).
+	"""
+	dumper = yaml.Dumper(file, default_flow_style=False)
+	dumper.open()
+	dumper.emit(yaml.DocumentStartEvent())
+	dumper.emit(yaml.MappingStartEvent(None, None, True, flow_style=False))
+
+	for event, name, value in events:
+		if event is LEAVE:
+			dumper.emit(yaml.MappingEndEvent())
+			continue
+
+		emit_yaml_value(dumper, name)
+
+		if event is ENTER:
+			dumper.emit(yaml.MappingStartEvent(None, None, True, flow_style=False))
+		else:
+			emit_yaml_value(dumper, value)
+
+	dumper.emit(yaml.MappingEndEvent())
+	dumper.emit(yaml.DocumentEndEvent())
+	dumper.close()
+	dumper.dispose()
+
+def emit_yaml_value(dumper: yaml.Dumper, value) -> None:
+	emit_yaml_node(dumper, dumper.represent_data(value))
+
+	# Forget the objects represented (kept to create aliases), the same as yaml.Dumper.represent does after each document
+	dumper.represented_objects = {}
+	dumper.object_keeper = []
+	dumper.alias_key = None
+
+def emit_yaml_node(dumper: yaml.Dumper, node: yaml.Node) -> None:
+	"""Emit the events of node, the same as yaml.Serializer.serialize_node without aliases.
+	"""
+	if isinstance(node, yaml.ScalarNode):
+		detected_tag = dumper.resolve(yaml.ScalarNode, node.value, (True, False))
+		default_tag = dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+		implicit = (node.tag == detected_tag), (node.tag == default_tag)
+
+		dumper.emit(yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+
+	elif isinstance(node, yaml.SequenceNode):
+		implicit = node.tag == dumper.resolve(yaml.SequenceNode, node.value, True)
+
+		dumper.emit(yaml.SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+		for item in node.value:
+			emit_yaml_node(dumper, item)
+		dumper.emit(yaml.SequenceEndEvent())
+
+	elif isinstance(node, yaml.MappingNode):
+		implicit = node.tag == dumper.resolve(yaml.MappingNode, node.value, True)
+
+		dumper.emit(yaml.MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+		for key, value in node.value:
+			emit_yaml_node(dumper, key)
+			emit_yaml_node(dumper, value)
+		dumper.emit(yaml.MappingEndEvent())
+
+def write_prefs(events, file, indent_char: str="\t") -> None:
+	"""Same output as PREFS.convert_to_prefs(tree).
+	"""
+	file.write("#PREFS\n")
+
+	depth = 0
+	pending = None # An entered mapping not written yet, if it's left empty it's written as name={}
+
+	def write_pending():
+		if pending is not None:
+			file.write(f"{indent_char * (depth - 1)}{pending}=>\n")
+
+	for event, name, value in events:
+		if event is ENTER:
+			write_pending()
+			pending = name
+			depth += 1
+
+		elif event is PROPERTY:
+			write_pending()
+			pending = None
+			file.write(f"{indent_char * depth}{name}={repr(value) if isinstance(value, str) else value}\n")
+
+		else:
+			depth -= 1
+			if pending is not None:
+				file.write(f"{indent_char * depth}{pending}={{}}\n")
+				pending = None
@@ -1,8 +1,9 @@
 import os
 import sys
-from importlib.util import spec_from_file_location, module_from_spec
 from PyQt5.QtWidgets import QAction, QDialog, QLabel, QVBoxLayout, QWidget, QTextEdit, QLayout
 
+from module_loader import get_module_from_path # Kept here because it was defined in this module
+
 TAB = "&nbsp;" * 4 
 
 def create_qaction(menu, text: str, shortcut: str="", callback: callable=lambda: print("No callback"), parent=None) -> QAction:
@@ -18,28 +19,6 @@ def create_qaction(menu, text: str, shortcut: str="", callback: callable=lambda:
 
 	return action # Return QAction
 
-def get_module_from_path(path: str):
-	"""Given a path of a Python module, returns it. If some exception when executing the module returns None, error
-	"""
-
-	filename = os.path.basename(path) # filename means only the filename without the path, e.g.: PyAPIReference/PyAPIReference/main.py -> main.py
-	filename_without_extension = os.path.splitext(filename)[0]
-
-	spec = spec_from_file_location(filename_without_extension, path)
-	module = module_from_spec(spec)
-	
-	try:
-		spec.loader.exec_module(module)
-	except Exception as error:
-		exception_info = {}
-		exception_info["message"] = error.args[0]
-		exception_info["file"] = path
-		exception_info["line"] = sys.exc_info()[2].tb_lineno
-		
-		return None, exception_info
-
-	return module, None
-
 def convert_to_code_block(string: str, stylesheet: str="background-color: #484848; color: white;") -> str:
 	if not isinstance(string, str):
 		return convert_to_code_block("None", stylesheet=stylesheet)
@@ -1,6 +1,169 @@
 import inspect
+import itertools
 import PREFS
-from types import ModuleType
+from enum import Enum
+from types import ModuleType, FunctionType, MethodType
+from contextlib import nullcontext
+from collections.abc import Mapping
+from member_filter import MemberFilter, load_member_filter
+from tree_nodes import TreeStore
+from value_renderer import ValueRenderer
+from inspection_profiler import InspectionProfiler
+from module_ownership import OwnershipResolver
+from member_descriptors import get_descriptor_type_name, get_descriptor_function, get_static_docstring
+from annotation_formatter import AnnotationFormatter
+from signature_cache import SignatureCache
+from inspection_budget import InspectionBudget
+from inspection_events import ENTER, PROPERTY, LEAVE, build_tree
+
+
+class InspectEngines(Enum):
+	RUNTIME = "runtime" # Execute the module and inspect its objects
+	STATIC = "static" # Parse the source of the module without executing it (see static_inspect.py)
+
+
+class MemberKinds(Enum):
+	CONTAINER = "container" # Classes and modules, they have content
+	ROUTINE = "routine" # Functions and methods, they have parameters
+	DESCRIPTOR = "descriptor" # Properties, classmethods, slots, etc, only with static_attributes (see member_descriptors.py)
+	VALUE = "value" # Anything else, they have a value
+
+
+class LazyDict(dict):
+	"""Dictionary whose items are computed by calling loader the first time they are accessed.
+	Used by inspect_object(lazy=True) as placeholder of the content of classes and the parameters of functions.
+	Example:
+		content = LazyDict(lambda: get_object_content(Person))
+		print(content.loaded)
+		>>> False
+		print(list(content)) # Here get_object_content is called
+		>>> ['human', '__init__', 'display_info']
+	"""
+	def __init__(self, loader: callable):
+		super().__init__()
+		self.loader = loader
+
+	@property
+	def loaded(self) -> bool:
+		return self.loader is None
+
+	def load(self):
+		if self.loader is not None:
+			try:
+				super().update(self.loader().items()) # items() so the views of a TreeStore are not looked up by key
+			finally:
+				# After the items, so it's not seen loaded (and empty) by the GUI thread while a worker loads it (see LazyLoadJob)
+				self.loader = None
+
+		return self
+
+	def __getitem__(self, key):
+		self.load()
+		return super().__getitem__(key)
+
+	def __iter__(self):
+		self.load()
+		return super().__iter__()
+
+	def __len__(self):
+		self.load()
+		return super().__len__()
+
+	def __contains__(self, key):
+		self.load()
+		return super().__contains__(key)
+
+	def __eq__(self, other):
+		self.load()
+		return super().__eq__(other)
+
+	def __ne__(self, other):
+		self.load()
+		return super().__ne__(other)
+
+	def __repr__(self):
+		if not self.loaded:
+			return "LazyDict(<not loaded>)"
+
+		return super().__repr__()
+
+	def keys(self):
+		self.load()
+		return super().keys()
+
+	def values(self):
+		self.load()
+		return super().values()
+
+	def items(self):
+		self.load()
+		return super().items()
+
+	def get(self, key, default=None):
+		self.load()
+		return super().get(key, default)
+
+	def copy(self):
+		return dict(self.items())
+
+	__hash__ = None
+
+
+def materialize_tree(tree):
+	"""Returns a copy of the tree where every LazyDict and view of a TreeStore (see tree_nodes.py) is converted into a dict, e.g.: to export it.
+	The tree is walked with a stack instead of recursion, so it works with trees of any depth.
+	"""
+	result, children = copy_tree_node(tree)
+	stack = [(result, children)] if children is not None else []
+
+	while len(stack) > 0:
+		node, children = stack[-1]
+
+		for key, value in children:
+			node_copy, node_children = copy_tree_node(value)
+
+			if isinstance(node, list):
+				node.append(node_copy)
+			else:
+				node[key] = node_copy
+
+			if node_children is not None: # Copy its children, this node is resumed after them
+				stack.append((node_copy, node_children))
+				break
+		else:
+			stack.pop()
+
+	return result
+
+def iter_lazy_contents(tree):
+	"""Yields the LazyDict not loaded of the tree, each one is walked once the consumer loaded it, so the ones inside it are yielded too.
+	Example:
+		for content in iter_lazy_contents(module_content):
+			content.load()
+	"""
+	stack = [tree]
+
+	while len(stack) > 0:
+		value = stack.pop()
+
+		if isinstance(value, LazyDict) and not value.loaded:
+			yield value
+
+		if isinstance(value, Mapping):
+			stack.extend(value.values())
+		elif isinstance(value, (list, tuple)):
+			stack.extend(value)
+
+def copy_tree_node(value):
+	"""Returns the empty copy of a mapping or list of the tree and an iterator of its (key, value), else value and None.
+	"""
+	if isinstance(value, Mapping):
+		return {}, iter(value.items())
+	elif isinstance(value, list):
+		return [], enumerate(value)
+
+	return value, None
+
 
 def prefs(func: callable):
     """This decorator will pass the result of the given func to PREFS.convert_to_prefs, 
@@ -31,8 +194,153 @@ def prefs(func: callable):
 
     return wrapper_function # Return function to call
 
-def inspect_object(object_: object):
+NOT_MEASURED = nullcontext()
+
+def not_measured_end():
+	pass
+
+class InspectionSession:
+	"""State shared by all the functions of a single inspect_object run.
+	Attributes:
+		member_filter: which members to include (see member_filter.py), loaded from the prefs files if None.
+		lazy: see inspect_object.
+		compact: see inspect_object.
+		value_renderer: renders the value property of the members that are not classes, modules or functions (see value_renderer.py).
+		store: TreeStore where the members are stored if compact, else None.
+		inspected: {id(object): (object, qualname)} of the classes, modules and functions already inspected (or being inspected).
+		profiler: records the time spent in each member (see inspection_profiler.py), None to not record anything.
+		static_attributes: see inspect_object.
+		max_depth: see inspect_object.
+		budget: the time and memory the session can take and its cancellation token (see inspection_budget.py), None for no limits.
+		ownership: resolves the module each member of a module belongs to, to exclude the imported ones (see module_ownership.py).
+		annotation_formatter: formats the annotations of parameters and return values (see annotation_formatter.py).
+		signatures: the parameters of each signature, extracted once per session (see signature_cache.py).
+	Notes:
+		An object reachable from more than one member (aliases, the same function under several names, 
+		a nested class pointing back to the enclosing one) is only inspected the first time, 
+		the next times it becomes a reference node: {"type": ..., "docstring": None, "reference": qualname of the first one}.
+		This also avoids infinite recursion with cyclic references.
+	"""
+	def __init__(self, member_filter: MemberFilter=None, lazy: bool=False, compact: bool=False, value_renderer: ValueRenderer=None, profiler: InspectionProfiler=None, static_attributes: bool=False, max_depth: int=None, budget: InspectionBudget=None):
+		if member_filter is None:
+			member_filter = load_member_filter()
+
+		if value_renderer is None:
+			value_renderer = ValueRenderer()
+
+		self.member_filter = member_filter
+		self.value_renderer = value_renderer
+		self.lazy = lazy
+		self.compact = compact
+		self.store = TreeStore() if compact else None
+		self.profiler = profiler
+		self.static_attributes = static_attributes
+		self.max_depth = max_depth
+		self.budget = budget
+		self.ownership = OwnershipResolver(static_attributes)
+		self.annotation_formatter = AnnotationFormatter()
+		self.signatures = SignatureCache(self.annotation_formatter, value_renderer, static_attributes)
+
+		self.inspected = {}
+
+	def measure(self, qualname: str, phase: str):
+		"""Context manager recording the time spent in phase of qualname if the session has a profiler.
+		"""
+		if self.profiler is None:
+			return NOT_MEASURED
+
+		return self.profiler.measure(qualname, phase)
+
+	def begin_measure(self, qualname: str, phase: str):
+		"""Same as measure but returns the function that stops measuring instead of a context manager (see InspectionProfiler.begin).
+		"""
+		if self.profiler is None:
+			return not_measured_end
+
+		return self.profiler.begin(qualname, phase)
+
+	def track_budget(self):
+		"""Context manager to count the time inside it in the budget of the session (see InspectionBudget.track).
+		"""
+		if self.budget is None:
+			return NOT_MEASURED
+
+		return self.budget.track()
+
+	def is_instance(self, object_: object, types) -> bool:
+		"""isinstance(object_, types), but if static_attributes only the type of object_ is checked (isinstance may call a __class__ property).
+		"""
+		if self.static_attributes:
+			return issubclass(type(object_), types)
+
+		return isinstance(object_, types)
+
+	def is_too_deep(self, depth: int) -> bool:
+		"""Returns True if the members of an object at depth (0 the root) are beyond max_depth.
+		"""
+		return self.max_depth is not None and depth >= self.max_depth
+
+	def get_reference(self, object_: object, qualname: str):
+		"""If object_ was already inspected returns the qualname where it was, else registers it under qualname and returns None.
+		"""
+		if not self.is_instance(object_, (type, ModuleType, FunctionType, MethodType)):
+			return None # Values like ints or strings are shared by Python but they are not the same member
+
+		object_id = id(object_)
+		if object_id in self.inspected:
+			return self.inspected[object_id][1]
+
+		# Keep a reference to the object so its id is not reused by another one
+		self.inspected[object_id] = object_, qualname
+
+
+class ContentFrame:
+	"""A class or module whose members are being inspected, the entries of the stack of iter_members_events.
+	Attributes:
+		name: the name of the object in its parent's content.
+		depth: 0 for the root object, 1 for its members, etc.
+		members: iterator of the (member_name, member) not inspected yet (see get_object_members), None until start.
+		measures: functions that stop the measures of the profiler started for the object (see InspectionSession.begin_measure).
+	"""
+	__slots__ = ("object_", "name", "qualname", "depth", "members", "measures")
+
+	def __init__(self, object_: object, name: str, qualname: str, depth: int):
+		self.object_ = object_
+		self.name = name
+		self.qualname = qualname
+		self.depth = depth
+		self.members = None
+		self.measures = []
+
+	def start(self, session: InspectionSession, phase: str=None) -> None:
+		if phase is not None and session.profiler is not None:
+			self.measures.append(session.begin_measure(self.qualname, phase))
+
+		self.members = get_object_members(self.object_, session, self.qualname)
+
+	def leave(self) -> None:
+		while len(self.measures) > 0:
+			self.measures.pop()()
+
+
+def inspect_object(object_: object, member_filter: MemberFilter=None, lazy: bool=False, compact: bool=False, value_renderer: ValueRenderer=None, profiler: InspectionProfiler=None, static_attributes: bool=False, max_depth: int=None, budget: InspectionBudget=None, session: InspectionSession=None):
 	"""Find all members of Python object.
+	If no member_filter, it's loaded from dunder_methods.prefs and member_filter.prefs (see member_filter.py).
+	If lazy only the members of object_ are inspected, the content of classes and the parameters of functions
+	are LazyDict that inspect them the first time they are accessed (use materialize_tree to inspect everything).
+	If compact the members and parameters are stored in a TreeStore and the tree is made of read-only views of it instead of dicts
+	(see tree_nodes.py), they are used the same way but take a fraction of the memory.
+	The values of the members (e.g.: constants) are rendered with value_renderer, ValueRenderer() if None.
+	If profiler is given the time spent in each member is recorded in it (see inspection_profiler.py).
+	If static_attributes the members are read with inspect.getattr_static and never invoked (see member_descriptors.py):
+	properties, cached properties, classmethods, staticmethods, slots and other descriptors are reported as nodes of those types
+	and the __str__ of the values that are not builtins is not called.
+	If max_depth is given the members of the classes and modules at that depth (object_ is at depth 0) are not inspected,
+	their content is empty and they have the property truncated="max_depth".
+	If budget is given it's checked before inspecting each member, once it's exceeded (time, memory or cancelled, see inspection_budget.py)
+	the rest of the members are skipped and the classes and modules being inspected, the root included, get the property truncated with the reason.
+	With lazy the budget also covers the content loaded later, once exceeded that content is empty.
+	If session is given member_filter, lazy, compact, value_renderer, profiler, static_attributes, max_depth and budget are ignored and the ones of the session are used.
 	Example:
 		def say_hi(name: str) -> str:
 			print(f"hi {name}")
@@ -48,59 +356,84 @@ def inspect_object(object_: object):
 	Errors:
 		Tatkes too much time, need to add some optimization.
 	"""
+	if session is None:
+		session = InspectionSession(member_filter, lazy, compact, value_renderer, profiler, static_attributes, max_depth, budget)
+
 	object_name = object_.__name__
-	result = {object_name: get_object_properties(object_)}	
 
-	return result
+	with session.track_budget():
+		return build_tree(iter_object_properties(object_, session, object_name, object_name), session.store)
+
+def get_object_members(object_: object, session: InspectionSession=None, qualname: str=None, exclude_types: tuple=(ModuleType)):
+	"""Returns the (member_name, member) of object_ that pass the member_filter of the session.
+	Excluded members are rejected only by their name when possible, before doing any work with them.
+	"""
+	if session is None:
+		session = InspectionSession()
+
+	if qualname is None:
+		qualname = object_.__name__
+
+	member_filter = session.member_filter
+	object_type_name = type(object_).__name__
+	object_is_module = inspect.ismodule(object_)
+	
+	# Instead of using inspect.getmembers to keep the members in the order they were defined
+	# We are going to use vars(object_)
+	# result = inspect.getmembers(object_)
+	object_vars = vars(object_)
+	module_all = member_filter.get_module_all(object_vars) if object_is_module else None
 
-def get_object_members(object_: object, exclude_types: tuple=(ModuleType)):
 	def filter_member(member_name: str, member: object):
-		if isinstance(member, exclude_types):
+		if session.is_instance(member, exclude_types):
+			return False
+
+		if module_all is not None:
+			# Members listed in __all__ are included even if imported
+			return member_name in module_all and member_filter.filter_name(member_name, object_type_name, f"{qualname}.{member_name}")
+
+		if not member_filter.filter_name(member_name, object_type_name, f"{qualname}.{member_name}"):
 			return False
  
  		# If the object it's a module
-		if inspect.ismodule(object_):
+		if object_is_module:
 			# Get the module of the member (where it was defined or it belongs to)
 			# And check if the object name is the same as the member one.
 			# This will exclude all members that do not belong to the given module.
-			member_module = inspect.getmodule(member)
-			if member_module is not None:
-				return member_module.__name__ == object_.__name__
+			with session.measure(f"{qualname}.{member_name}", "ownership"):
+				member_module_name = session.ownership.get_module_name(member)
 
-		dunder_methods = PREFS.read_prefs_file("dunder_methods.prefs")
-		if type(object_).__name__ in dunder_methods:
-			dunder_methods_to_include = dunder_methods[type(object_).__name__]
-		else:
-			dunder_methods_to_include = ()
-
-		if (member_name.startswith("__") and member_name.endswith("__") 
-			and member_name not in dunder_methods_to_include):
-			
-			return False
+			if member_module_name is not None:
+				return member_module_name == object_.__name__
 
 		return True
 
-	# Instead of using inspect.getmembers to keep the members in the order they were defined
-	# We are going to use vars(object_)
-	# result = inspect.getmembers(object_)
-	result = tuple(vars(object_).items())
+	result = tuple(object_vars.items())
 
 	# filter_member(*x) is equivalent to filter_member(x[0], x[1])
 	result = filter(lambda x: filter_member(*x), result)
 
 	return result
 
-def get_object_content(object_: object):
+def get_object_content(object_: object, session: InspectionSession=None, qualname: str=None, depth: int=0):
 	"""Given an object get attributes of all of it's members.
+	depth is the depth of object_ in the tree, to stop at the max_depth of the session.
 	"""
-	result = {}
+	if session is None:
+		session = InspectionSession()
 
-	for member_name, member in get_object_members(object_):		
-		result[member_name] = get_object_properties(member)
+	if qualname is None:
+		qualname = object_.__name__
 
-	return result
+	frame = ContentFrame(object_, qualname, qualname, depth)
+	frame.start(session)
+
+	# Built as the content of a member, so with a compact session the members are stored when the content is left
+	events = itertools.chain(((ENTER, qualname, None), (ENTER, "content", None)), iter_members_events(frame, session, leave_root=False), ((LEAVE, "content", None),))
 
-def get_object_properties(object_: object):
+	return build_tree(events, session.store)[qualname]["content"]
+
+def get_object_properties(object_: object, session: InspectionSession=None, qualname: str=None, depth: int=0):
 	"""Given an object return it's type and content.
 	Example:
 		class Test2(Test1):
@@ -123,44 +456,260 @@ def get_object_properties(object_: object):
 				parameters ...
 
 	callable (function, lambda, methods) -> parameters (see get_callable_parameters), return_annotation 
+	If object_ was already inspected in the session returns a reference node (see InspectionSession).
+	depth is the depth of object_ in the tree, to stop at the max_depth of the session.
+	Notes:
+		The properties are built from the events of iter_object_properties (see inspection_events.TreeBuilder).
+	"""
+	if session is None:
+		session = InspectionSession()
+
+	if qualname is None:
+		qualname = getattr(object_, "__name__", type(object_).__name__)
+
+	return build_tree(iter_object_properties(object_, session, qualname, qualname, depth), session.store)[qualname]
+
+def load_object_content(object_: object, session: InspectionSession, qualname: str, phase: str, depth: int=0):
+	with session.measure(qualname, phase), session.track_budget():
+		return get_object_content(object_, session, qualname, depth)
+
+def load_parameters(function: callable, session: InspectionSession, qualname: str):
+	with session.measure(qualname, "signature"):
+		parameters = session.signatures.get_parameters(function)
+
+	return session.store.add_parameters(parameters) if session.compact else parameters
+
+def iter_inspect_object(object_: object, member_filter: MemberFilter=None, value_renderer: ValueRenderer=None, profiler: InspectionProfiler=None, static_attributes: bool=False, max_depth: int=None, budget: InspectionBudget=None, session: InspectionSession=None):
+	"""Same as inspect_object but instead of returning the tree, yields the events to build it (see inspection_events.py)
+	as the members are inspected, so only the branch being inspected is kept in memory.
+	compact of the session is ignored, use TreeBuilder to build a compact tree from the events.
+	If the session is lazy the content of classes and the parameters of functions are PROPERTY events whose value is a LazyDict.
+	Example:
+		with open("example.json", "w") as file:
+			write_json(iter_inspect_object(module), file) # See exporters.py
+	"""
+	if session is None:
+		session = InspectionSession(member_filter, value_renderer=value_renderer, profiler=profiler, static_attributes=static_attributes, max_depth=max_depth, budget=budget)
+
+	object_name = object_.__name__
+
+	with session.track_budget(): # Including the time the consumer of the events takes, the same as the profiler
+		yield from iter_object_properties(object_, session, object_name, object_name)
+
+def iter_object_properties(object_: object, session: InspectionSession, name: str, qualname: str, depth: int=0):
+	"""Yields the events of the properties of object_ between ENTER name and LEAVE name.
+	The times recorded by the profiler of the session include the time the consumer of the events takes to process them.
+	Notes:
+		The classes and modules are inspected with a stack of ContentFrame instead of recursion (see iter_members_events),
+		so deeply nested classes don't reach the recursion limit.
+	"""
+	frame = yield from iter_start_object_properties(object_, session, name, qualname, depth)
+
+	if frame is not None:
+		yield from iter_members_events(frame, session)
+
+def iter_members_events(root_frame: ContentFrame, session: InspectionSession, leave_root: bool=True):
+	"""Yields the events of the members of the object of root_frame and of all the classes and modules found in them, depth first.
+	Each frame yields LEAVE content and LEAVE name once all its members are inspected, root_frame only if leave_root.
+	If the budget of the session is exceeded the frames left are closed with the property truncated (see inspect_object).
+	"""
+	budget = session.budget
+	stack = [root_frame]
+
+	try:
+		while len(stack) > 0:
+			frame = stack[-1]
+
+			for member_name, member in frame.members:
+				if budget is not None and budget.check() is not None:
+					break
+
+				member_frame = yield from iter_start_object_properties(member, session, member_name, f"{frame.qualname}.{member_name}", frame.depth + 1)
+
+				if member_frame is not None: # Continue with its members, this frame is resumed after them
+					stack.append(member_frame)
+					break
+			else:
+				stack.pop()
+				yield from iter_leave_frame(frame, leave_root or frame is not root_frame)
+				continue
+
+			if budget is not None and budget.exceeded is not None:
+				while len(stack) > 0:
+					frame = stack.pop()
+					yield from iter_leave_frame(frame, leave_root or frame is not root_frame, budget.exceeded)
+	finally:
+		for frame in reversed(stack): # An exception was raised or the consumer stopped, stop the measures of the frames left
+			frame.leave()
+
+def iter_leave_frame(frame: ContentFrame, events: bool=True, truncated: str=None):
+	"""Leaves frame and yields the events that close its content and its member (with truncated, the reason it's incomplete, if given).
+	"""
+	frame.leave()
+
+	if not events:
+		return
+
+	yield LEAVE, "content", None
+
+	if truncated is not None:
+		yield PROPERTY, "truncated", truncated
+
+	yield LEAVE, frame.name, None
+
+def iter_start_object_properties(object_: object, session: InspectionSession, name: str, qualname: str, depth: int):
+	"""Yields the events of iter_member_properties and returns its ContentFrame already started, if the members of object_ have to be inspected.
+	The total time of object_ is measured until its frame is left.
+	"""
+	end_total = session.begin_measure(qualname, "total")
+
+	try:
+		frame = yield from iter_member_properties(object_, session, name, qualname, depth)
+	except BaseException:
+		end_total()
+		raise
+
+	if frame is None:
+		end_total()
+		return None
+
+	frame.measures.append(end_total)
+	frame.start(session, "content")
+
+	return frame
+
+def iter_member_properties(object_: object, session: InspectionSession, name: str, qualname: str, depth: int):
+	"""Yields the events of the properties of object_ from ENTER name.
+	If its members have to be inspected stops after ENTER content and returns its ContentFrame, else yields up to LEAVE name and returns None
+	(it's not a class or a module, it's a reference, the session is lazy or it's at max_depth).
+	"""
+	kind = get_member_kind(object_, session)
+	object_type = get_member_type_name(object_, kind)
+
+	yield ENTER, name, None
+	yield PROPERTY, "type", object_type
+
+	if (reference := session.get_reference(object_, qualname)) is not None:
+		yield PROPERTY, "docstring", None
+		yield PROPERTY, "reference", reference
+		yield LEAVE, name, None
+		return None
+
+	yield PROPERTY, "docstring", get_docstring(object_, session)
+	function = get_member_function(object_, kind)
+
+	if kind is MemberKinds.CONTAINER:
+
+		if session.is_instance(object_, type):
+			yield PROPERTY, "inherits", get_class_inherits(object_)
+
+		if session.is_too_deep(depth):
+			yield ENTER, "content", None
+			yield LEAVE, "content", None
+			yield PROPERTY, "truncated", "max_depth"
+		elif session.lazy and depth > 0: # The members of the root are always inspected
+			yield PROPERTY, "content", LazyDict(lambda: load_object_content(object_, session, qualname, "lazy_content", depth))
+		else:
+			yield ENTER, "content", None
+			return ContentFrame(object_, name, qualname, depth)
+
+	elif function is not None:
+
+		if not is_accessor(object_type):
+			if session.lazy:
+				yield PROPERTY, "parameters", LazyDict(lambda: load_parameters(function, session, qualname))
+			else:
+				yield ENTER, "parameters", None
+
+				with session.measure(qualname, "signature"):
+					parameters = session.signatures.get_parameters(function)
+
+				for parameter_name, parameter in parameters.items():
+					yield ENTER, parameter_name, None
+
+					for property_name, property_value in parameter.items():
+						yield PROPERTY, property_name, property_value
+
+					yield LEAVE, parameter_name, None
+
+				yield LEAVE, "parameters", None
+
+		if "return" in function.__annotations__:
+			yield PROPERTY, "return_annotation", get_return_annotation(function, session.annotation_formatter)
+
+	elif object_type == "descriptor":
+		yield PROPERTY, "value", f"<{type(object_).__name__} object>" # Its class is all we know without calling it
+
+	elif kind is MemberKinds.VALUE:
+		with session.measure(qualname, "value"):
+			value = session.value_renderer.render(object_, call_str=not session.static_attributes)
+
+		yield PROPERTY, "value", value
+
+	yield LEAVE, name, None
+	return None
+
+def get_member_kind(object_: object, session: InspectionSession) -> MemberKinds:
+	if session.is_instance(object_, (type, ModuleType)):
+		return MemberKinds.CONTAINER
+	elif session.is_instance(object_, (FunctionType, MethodType)):
+		return MemberKinds.ROUTINE
+	elif session.static_attributes and get_descriptor_type_name(object_) is not None:
+		return MemberKinds.DESCRIPTOR
+
+	return MemberKinds.VALUE
+
+def get_member_type_name(object_: object, kind: MemberKinds) -> str:
+	if kind is MemberKinds.DESCRIPTOR:
+		return get_descriptor_type_name(object_)
+
+	return get_object_type_name(object_)
+
+def get_member_function(object_: object, kind: MemberKinds):
+	"""Returns the function whose parameters and return annotation are reported: the member itself if it's a function or method,
+	the function a descriptor wraps (e.g.: the getter of a property) or None.
+	"""
+	if kind is MemberKinds.ROUTINE:
+		return object_
+	elif kind is MemberKinds.DESCRIPTOR:
+		return get_descriptor_function(object_)
+
+	return None
+
+def is_accessor(type_name: str) -> bool:
+	"""Properties and cached properties are accessed as attributes, only the return annotation of their getter is reported.
 	"""
+	return type_name in ("property", "cached_property")
 
+def get_docstring(object_: object, session: InspectionSession):
+	if session.static_attributes:
+		return get_static_docstring(object_)
+
+	return object_.__doc__
+
+def get_object_type_name(object_: object) -> str:
 	object_type = type(object_).__name__
 
 	if object_type == "type":
 		object_type = "class"
 
-	result = {"type": object_type, "docstring": object_.__doc__}
-		
-	if inspect.isclass(object_) or inspect.ismodule(object_):
-		
-		if inspect.isclass(object_):
-			result["inherits"] = [i.__name__ for i in inspect.getmro(object_)[1:-1]]
-		
-		result["content"] = get_object_content(object_)
-	
-	elif inspect.isfunction(object_) or inspect.ismethod(object_):
-		
-		result["parameters"] = get_callable_parameters(object_)	
-			
-		if "return" in object_.__annotations__:
-			result["return_annotation"] = []
-	
-			if isinstance(object_.__annotations__["return"], (tuple, list)):
-				for annotation in object_.__annotations__["return"]:
-					result["return_annotation"].append(str(annotation.__name__) if not annotation == inspect._empty else None)
-			else:
-				result["return_annotation"] = str(object_.__annotations__["return"].__name__) if object_.__annotations__["return"] is not None else None 
+	return object_type
 
-	else:
-		result["value"] = str(object_)
-	
-	return result
+def get_class_inherits(class_: type) -> list:
+	return [i.__name__ for i in inspect.getmro(class_)[1:-1]]
+
+def get_return_annotation(function: callable, annotation_formatter: AnnotationFormatter=None):
+	if annotation_formatter is None:
+		annotation_formatter = AnnotationFormatter()
 
-def get_callable_parameters(callable_: callable):
+	return annotation_formatter.format(function.__annotations__["return"])
+
+def get_callable_parameters(callable_: callable, annotation_formatter: AnnotationFormatter=None):
 	"""Given a callable object (functions, lambda or methods) get all it's parameters, 
 	each parameter annotation (a: str, b: int), default value (a=1, b=2) and kind (positional, keyword, etc).
 	If no annotation or default value None.
+	The annotations are formatted with annotation_formatter, a new AnnotationFormatter if None (see annotation_formatter.py).
+	To extract each signature once use a SignatureCache instead (see signature_cache.py), InspectionSession has one.
 	Example:
 		def say_hi(name: str, last_name: str, age: int=20):
 			print(f"hi {name} {last_name}, you are {age} years old.")
@@ -180,30 +729,4 @@ def get_callable_parameters(callable_: callable):
 			default=20
 			kind=POSITIONAL_OR_KEYWORD
 	"""
-	result = {}
-
-	for parameter in inspect.signature(callable_).parameters.values():
-		
-		if parameter.default == inspect._empty:
-			default_parameter = None
-		else:
-			try:
-				default_parameter = parameter.default.__name__
-			except AttributeError:
-				default_parameter = str(parameter.default)
-
-		
-		result[parameter.name] = {
-		"annotation": [], 
-		"default": default_parameter, 
-		"kind": parameter.kind.description
-		}
-
-		if isinstance(parameter.annotation, (tuple, list)):
-			for annotation in parameter.annotation:
-				result[parameter.name]["annotation"].append(str(annotation.__name__) if not annotation == inspect._empty else None)
-			continue
-
-		result[parameter.name]["annotation"] = str(parameter.annotation.__name__) if not parameter.annotation == inspect._empty else None
-
-	return result
+	return SignatureCache(annotation_formatter).get_parameters(callable_)
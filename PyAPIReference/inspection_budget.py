@@ -0,0 +1,145 @@
+"""Limit the time and memory an inspection can take and stop it from another thread (e.g.: the Cancel button of the GUI).
+The budget is checked by inspect_object between members (see inspect_object.py), when it's exceeded the members left are not inspected
+and the classes and modules being inspected (the root included) get the property truncated with the reason:
+"cancelled", "time_limit" or "memory_limit", so the partial tree is flagged as incomplete.
+Example:
+	token = CancellationToken()
+	budget = InspectionBudget(time_limit=10, memory_limit=500 * 1024 ** 2, token=token) # token.cancel() stops it from another thread
+	tree = inspect_object(module, budget=budget)
+	print(budget.exceeded, tree["module"].get("truncated"))
+	>>> time_limit time_limit
+Notes:
+	The checks are cooperative: executing the module (see get_module_from_path) or a single member that never returns can't be stopped.
+"""
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+CANCELLED = "cancelled"
+TIME_LIMIT = "time_limit"
+MEMORY_LIMIT = "memory_limit"
+
+MEMORY_CHECK_INTERVAL = 0.05 # Seconds between memory checks, reading the memory usage is slower than checking the time
+
+
+class CancellationToken:
+	"""Flag to cancel an inspection, it can be set from any thread.
+	Arguments:
+		event: the event set to cancel, e.g.: a multiprocessing.Event to cancel it from another process (see module_sandbox.py).
+	"""
+	def __init__(self, event=None):
+		self.event = threading.Event() if event is None else event
+
+	@property
+	def cancelled(self) -> bool:
+		return self.event.is_set()
+
+	def cancel(self) -> None:
+		self.event.set()
+
+
+class InspectionBudget:
+	"""Time and memory an inspection can take, and the token to cancel it.
+	Arguments:
+		time_limit: seconds spent inspecting (only the time between start and stop, e.g.: not the time between lazy loads), None for no limit.
+		memory_limit: bytes the memory used by the process can grow since the first start, None for no limit.
+		token: CancellationToken to stop the inspection, None if it can't be cancelled.
+	Attributes:
+		exceeded: the reason the budget was exceeded (CANCELLED, TIME_LIMIT or MEMORY_LIMIT) or None,
+		once exceeded it stays exceeded so the rest of the inspection is skipped.
+	"""
+	def __init__(self, time_limit: float=None, memory_limit: int=None, token: CancellationToken=None):
+		self.time_limit = time_limit
+		self.memory_limit = memory_limit
+		self.token = token
+		self.exceeded = None
+
+		self.elapsed = 0.0 # Time spent in the previous start-stop intervals
+		self.started_at = None
+		self.running = 0 # Nested starts (e.g.: a lazy load inside inspect_object)
+		self.initial_memory = None
+		self.next_memory_check = 0.0
+
+	def start(self) -> None:
+		if self.running == 0:
+			self.started_at = time.perf_counter()
+
+			if self.memory_limit is not None and self.initial_memory is None:
+				self.initial_memory = get_memory_usage()
+
+		self.running += 1
+
+	def stop(self) -> None:
+		self.running -= 1
+
+		if self.running == 0:
+			self.elapsed += time.perf_counter() - self.started_at
+			self.started_at = None
+
+	@contextmanager
+	def track(self):
+		"""Context manager to start and stop the budget, the time outside of it doesn't count.
+		"""
+		self.start()
+
+		try:
+			yield self
+		finally:
+			self.stop()
+
+	def get_elapsed(self, now: float=None) -> float:
+		if self.started_at is None:
+			return self.elapsed
+
+		return self.elapsed + (time.perf_counter() if now is None else now) - self.started_at
+
+	def check(self):
+		"""Returns the reason the budget is exceeded, None if there's budget left. Called before inspecting each member.
+		"""
+		if self.exceeded is not None:
+			return self.exceeded
+
+		if self.token is not None and self.token.cancelled:
+			self.exceeded = CANCELLED
+		elif self.time_limit is not None or self.memory_limit is not None:
+			now = time.perf_counter()
+
+			if self.time_limit is not None and self.get_elapsed(now) > self.time_limit:
+				self.exceeded = TIME_LIMIT
+
+			elif self.memory_limit is not None and self.initial_memory is not None and now >= self.next_memory_check:
+				self.next_memory_check = now + MEMORY_CHECK_INTERVAL
+				memory = get_memory_usage()
+
+				if memory is not None and memory - self.initial_memory > self.memory_limit:
+					self.exceeded = MEMORY_LIMIT
+
+		return self.exceeded
+
+	def merge(self, exceeded: str) -> None:
+		"""Mark the budget as exceeded with the reason the budget of a part of the inspection was exceeded (None if it wasn't),
+		e.g.: a module of a package inspected in a sandbox, each one with its own budget.
+		"""
+		if self.exceeded is None and exceeded is not None:
+			self.exceeded = exceeded
+
+
+def get_memory_usage():
+	"""Returns the resident memory of the process in bytes, where /proc is not available (e.g.: macOS) its peak,
+	None if it's unknown (e.g.: Windows, where memory_limit is ignored).
+	"""
+	try:
+		with open("/proc/self/statm") as file:
+			return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, IndexError, AttributeError):
+		pass
+
+	try:
+		import resource
+	except ImportError:
+		return None
+
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, KiB on the rest
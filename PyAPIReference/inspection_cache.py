@@ -0,0 +1,254 @@
+"""On-disk cache of inspect_object results.
+Each result is stored as a JSON file named after a key made of the resolved path of the module (or package),
+the hash of its source (the sources of all the modules of a package), the interpreter version, the inspect engine and the member filter.
+With the result are stored the modification time and size of the files it depends on (e.g.: the modules it imported),
+if any of them changed the result is not used.
+When the cache exceeds max_size the least recently used results are removed.
+Notes:
+	The results are written without recursion (see write_json) and read without it if json.loads can't (see load_json),
+	the trees of deeply nested classes are deeper than the recursion limit of json.dump and json.loads.
+	The dependencies are the files of the modules imported while the module was executed (see module_loader.get_module_files),
+	a module that was already imported (e.g.: a third-party package kept by a warm worker) is only a dependency if it's in the
+	directory of the module, so changing it doesn't make the result stale.
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+
+from exporters import write_json
+from inspection_events import iter_tree_events
+
+
+def get_user_cache_directory() -> str:
+	"""Returns the directory where the applications store their caches: %LOCALAPPDATA% on Windows, ~/Library/Caches on macOS
+	and $XDG_CACHE_HOME (~/.cache by default) on the rest.
+	"""
+	if sys.platform == "win32":
+		return os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+
+	if sys.platform == "darwin":
+		return os.path.expanduser(os.path.join("~", "Library", "Caches"))
+
+	return os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+
+
+CACHE_DIRECTORY = os.path.join(get_user_cache_directory(), "PyAPIReference", "inspection")
+CACHE_MAX_SIZE = 100 * 1024 * 1024 # 100 MB
+
+# Change it whenever the format of the tree changes so old results are not used
+CACHE_FORMAT_VERSION = 2
+
+
+class InspectionCache:
+	def __init__(self, directory: str=CACHE_DIRECTORY, max_size: int=CACHE_MAX_SIZE):
+		self.directory = directory
+		self.max_size = max_size
+
+	def get_key(self, path: str, *settings, files: (list, tuple)=None) -> str:
+		"""Returns the key of the module in path inspected with the given settings (engine, member filter key, etc).
+		If files is given their sources are hashed instead of path, e.g.: the modules of a package (see package_inspect.discover_modules).
+		Raises OSError if any of them can't be read.
+		"""
+		source_hash = hashlib.sha256()
+
+		for file_path in (path,) if files is None else files:
+			with open(file_path, "rb") as file:
+				source_hash.update(repr((file_path, file.read())).encode("utf-8"))
+
+		key = repr((
+			CACHE_FORMAT_VERSION,
+			os.path.normcase(os.path.realpath(path)),
+			source_hash.hexdigest(),
+			sys.implementation.cache_tag,
+			sys.version,
+			settings
+		))
+
+		return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+	def get_path(self, key: str) -> str:
+		return os.path.join(self.directory, f"{key}.json")
+
+	def get(self, key: str):
+		"""Returns the cached result for key or None if it's not cached or any of its dependencies changed.
+		"""
+		path = self.get_path(key)
+
+		try:
+			with open(path, "r", encoding="utf-8") as file:
+				text = file.read()
+
+			try:
+				entry = json.loads(text)
+			except RecursionError: # Faster than load_json, unless the tree is too deep
+				entry = load_json(text)
+		except (OSError, ValueError):
+			return None
+
+		if not isinstance(entry, dict) or not is_up_to_date(entry.get("dependencies", {})):
+			return None
+
+		try:
+			os.utime(path) # Mark as recently used
+		except OSError:
+			pass
+
+		return entry.get("result")
+
+	def set(self, key: str, result: dict, dependencies: (list, tuple)=()) -> None:
+		"""Store result for key, dependencies are the paths of the files it depends on besides the module (see get).
+		"""
+		os.makedirs(self.directory, exist_ok=True)
+
+		path = self.get_path(key)
+		temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" # Files can be inspected at the same time, see inspection_scheduler.py
+
+		entry = {"dependencies": {dependency: get_file_stamp(dependency) for dependency in dependencies}, "result": result}
+
+		# Write to a temporary file and then replace so a half written file is never read
+		try:
+			with open(temporary_path, "w", encoding="utf-8") as file:
+				# The compact nodes (see tree_nodes.py) are mappings, written as dicts
+				write_json(iter_tree_events(entry), file, indent=None)
+		except BaseException:
+			remove_file(temporary_path)
+			raise
+
+		os.replace(temporary_path, path)
+
+		self.evict()
+
+	def evict(self) -> None:
+		"""Remove the least recently used results until the size of the cache is under max_size.
+		"""
+		entries = []
+		total_size = 0
+
+		for entry in os.scandir(self.directory):
+			if not entry.name.endswith(".json"):
+				continue
+
+			stat = entry.stat()
+			entries.append((stat.st_mtime, stat.st_size, entry.path))
+			total_size += stat.st_size
+
+		entries.sort() # Oldest first
+
+		for mtime, size, path in entries:
+			if total_size <= self.max_size:
+				break
+
+			try:
+				os.remove(path)
+			except OSError:
+				continue
+
+			total_size -= size
+
+	def clear(self) -> None:
+		if not os.path.isdir(self.directory):
+			return
+
+		for entry in os.scandir(self.directory):
+			if entry.name.endswith((".json", ".tmp")):
+				os.remove(entry.path)
+
+
+def get_file_stamp(path: str) -> list:
+	"""Returns [modification time (ns), size] of path, None if it doesn't exist.
+	"""
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+
+	return [stat.st_mtime_ns, stat.st_size]
+
+def is_up_to_date(dependencies: dict) -> bool:
+	"""Returns True if none of dependencies ({path: stamp}, see get_file_stamp) changed.
+	"""
+	return all(get_file_stamp(path) == stamp for path, stamp in dependencies.items())
+
+def remove_file(path: str) -> None:
+	try:
+		os.remove(path)
+	except OSError:
+		pass
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+def load_json(text: str):
+	"""Same as json.loads(text), the objects and arrays are parsed with a stack instead of recursion so it works with any depth.
+	Raises ValueError (json.JSONDecodeError) if text isn't valid JSON.
+	"""
+	decoder = json.JSONDecoder()
+	stack = [] # [object or array, key of the value being parsed] of the ones opened and not closed yet
+	index = WHITESPACE.match(text, 0).end()
+
+	while True:
+		# A value
+		character = text[index:index + 1]
+
+		if character in ("{", "["):
+			stack.append([{} if character == "{" else [], None])
+			index = WHITESPACE.match(text, index + 1).end()
+
+			if text[index:index + 1] == ("}" if character == "{" else "]"): # Empty
+				value = stack.pop()[0]
+				index += 1
+			elif character == "{":
+				index = read_json_key(decoder, text, index, stack[-1])
+				continue
+			else:
+				continue
+		else:
+			value, index = decoder.raw_decode(text, index)
+
+		# The objects and arrays the value closes
+		while True:
+			if len(stack) == 0:
+				if WHITESPACE.match(text, index).end() != len(text):
+					raise json.JSONDecodeError("Extra data", text, index)
+
+				return value
+
+			container, key = stack[-1]
+
+			if isinstance(container, dict):
+				container[key] = value
+			else:
+				container.append(value)
+
+			index = WHITESPACE.match(text, index).end()
+			character = text[index:index + 1]
+
+			if character == ",":
+				index = WHITESPACE.match(text, index + 1).end()
+
+				if isinstance(container, dict):
+					index = read_json_key(decoder, text, index, stack[-1])
+
+				break
+
+			if character != ("}" if isinstance(container, dict) else "]"):
+				raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+
+			value = stack.pop()[0]
+			index += 1
+
+def read_json_key(decoder: json.JSONDecoder, text: str, index: int, parent: list) -> int:
+	"""Read the key of the next value of an object (parent) at index, returns the index of the value.
+	"""
+	if text[index:index + 1] != '"':
+		raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+
+	parent[1], index = decoder.raw_decode(text, index)
+	index = WHITESPACE.match(text, index).end()
+
+	if text[index:index + 1] != ":":
+		raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+
+	return WHITESPACE.match(text, index + 1).end()
@@ -0,0 +1,140 @@
+"""Events yielded by iter_inspect_object (see inspect_object.py) while the members are inspected, and helpers to consume them.
+The events describe the tree as nested mappings: ENTER opens a mapping (a member, its content, its parameters or a parameter),
+PROPERTY is a property that is not a mapping (type, docstring, value, etc) and LEAVE closes the last opened mapping.
+Example:
+	for event, name, value in iter_inspect_object(say_hi):
+		print(event.name, name, value)
+	>>>
+	ENTER say_hi None
+	PROPERTY type function
+	PROPERTY docstring None
+	ENTER parameters None
+	ENTER name None
+	PROPERTY annotation str
+	...
+"""
+from enum import Enum
+from collections.abc import Mapping
+from tree_nodes import TreeStore
+
+
+class InspectionEvents(Enum):
+	ENTER = "enter"
+	PROPERTY = "property"
+	LEAVE = "leave"
+
+
+ENTER = InspectionEvents.ENTER
+PROPERTY = InspectionEvents.PROPERTY
+LEAVE = InspectionEvents.LEAVE
+
+
+class EventsTracker:
+	"""Keeps track of where in the tree the events are, to know which mappings are members, contents, parameters, etc.
+	Attributes:
+		path: names of the mappings entered and not left yet.
+		kinds: "member", "content", "parameters" or "parameter" for each name in path.
+		members: number of members entered so far.
+	"""
+	def __init__(self):
+		self.path = []
+		self.kinds = []
+		self.members = 0
+
+	@property
+	def depth(self) -> int:
+		return len(self.path)
+
+	def feed(self, events) -> None:
+		for event in events:
+			self.feed_event(*event)
+
+	def feed_event(self, event: InspectionEvents, name: str, value) -> None:
+		if event is ENTER:
+			parent_kind = self.kinds[-1] if self.kinds else "content" # The root is a member of the tree
+
+			if parent_kind == "content":
+				kind = "member"
+				self.members += 1
+			elif parent_kind == "parameters":
+				kind = "parameter"
+			else:
+				kind = name
+
+			self.path.append(name)
+			self.kinds.append(kind)
+
+		elif event is LEAVE:
+			self.path.pop()
+			self.kinds.pop()
+
+
+class TreeBuilder(EventsTracker):
+	"""Builds the tree inspect_object would return from the events of iter_inspect_object.
+	If a TreeStore is given the tree is compact (see tree_nodes.py), each content and parameters is stored when it's left,
+	so at most a branch of the tree is made of dicts at the same time.
+	Example:
+		builder = TreeBuilder()
+		builder.feed(iter_inspect_object(module))
+		print(builder.tree == inspect_object(module))
+		>>> True
+	"""
+	def __init__(self, store: TreeStore=None):
+		super().__init__()
+		self.store = store
+		self.tree = {}
+		self.mappings = [self.tree]
+
+	def feed_event(self, event: InspectionEvents, name: str, value) -> None:
+		if event is PROPERTY:
+			self.mappings[-1][name] = value
+			return
+
+		if event is ENTER:
+			mapping = {}
+			self.mappings[-1][name] = mapping
+			self.mappings.append(mapping)
+			super().feed_event(event, name, value)
+			return
+
+		kind = self.kinds[-1]
+		mapping = self.mappings.pop()
+		super().feed_event(event, name, value)
+
+		if self.store is None:
+			return
+
+		if kind == "content":
+			self.mappings[-1][name] = self.store.add_members(mapping)
+		elif kind == "parameters":
+			self.mappings[-1][name] = self.store.add_parameters(mapping)
+		elif kind == "member" and self.depth == 0:
+			self.tree = self.store.add_tree(self.tree)
+			self.mappings = [self.tree]
+
+
+def iter_tree_events(tree: Mapping):
+	"""Yields the events of an already built tree, e.g.: to export it with the functions of exporters.py.
+	The tree is walked with a stack instead of recursion, so it works with trees of any depth.
+	"""
+	stack = [(None, iter(tree.items()))] # (name, iterator of the items not visited yet) of the mappings entered
+
+	while len(stack) > 0:
+		for name, value in stack[-1][1]:
+			if isinstance(value, Mapping):
+				yield ENTER, name, None
+				stack.append((name, iter(value.items())))
+				break
+
+			yield PROPERTY, name, value
+		else:
+			name = stack.pop()[0]
+
+			if len(stack) > 0:
+				yield LEAVE, name, None
+
+def build_tree(events, store: TreeStore=None) -> dict:
+	builder = TreeBuilder(store)
+	builder.feed(events)
+
+	return builder.tree
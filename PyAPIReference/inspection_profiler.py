@@ -0,0 +1,138 @@
+"""Record the time (and memory) spent inspecting each member, to find which members make a load slow.
+Example:
+	profiler = InspectionProfiler()
+	profiler.start()
+	module, error = get_module_from_path("example.py", profiler=profiler)
+	tree = inspect_object(module, profiler=profiler)
+	profiler.stop()
+
+	for member in profiler.get_slowest(3):
+		print(member["qualname"], member["self_time"])
+	>>>
+	example 0.0061
+	example.Person 0.0004
+	example.foo 0.0002
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Phases measured for each member:
+#	exec_module: executing the module (see get_module_from_path)
+#	total: get_object_properties of the member, including its content
+#	content: inspecting the members of a class or module
+#	lazy_content: same as content when the member is inspected lazily, it's not part of total
+#	ownership: resolving the module of the member to know if it belongs to its module (see module_ownership.py)
+#	signature: get_callable_parameters
+#	value: rendering the value (see value_renderer.py)
+PHASES = ("exec_module", "total", "content", "lazy_content", "ownership", "signature", "value")
+
+
+class InspectionProfiler:
+	"""Records the time, the memory allocated and the number of calls of each phase (see PHASES) of each member.
+	Arguments:
+		trace_memory: also record the memory allocated using tracemalloc (makes the inspection slower).
+	Notes:
+		The memory is the net memory allocated during the phase (allocated - freed) and it's only recorded between start and stop.
+		The self time of a member is its total time without its content plus the time of ownership and exec_module,
+		which are not part of total as they happen before inspecting the member.
+	"""
+	def __init__(self, trace_memory: bool=True):
+		self.trace_memory = trace_memory
+		self.records = {} # qualname -> {phase: [seconds, bytes, calls]}
+		self.started_tracemalloc = False
+
+	@property
+	def tracing(self) -> bool:
+		return self.trace_memory and tracemalloc.is_tracing()
+
+	def start(self) -> None:
+		if self.trace_memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			self.started_tracemalloc = True
+
+	def stop(self) -> None:
+		if self.started_tracemalloc:
+			tracemalloc.stop()
+			self.started_tracemalloc = False
+
+	def begin(self, qualname: str, phase: str):
+		"""Starts measuring phase of qualname and returns the function that stops it,
+		for the measures that don't fit in a with block (e.g.: the members on the stack of get_object_properties).
+		"""
+		tracing = self.tracing
+		memory_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+		start = time.perf_counter()
+
+		def end():
+			elapsed = time.perf_counter() - start
+			memory = tracemalloc.get_traced_memory()[0] - memory_before if tracing and tracemalloc.is_tracing() else 0
+
+			record = self.records.setdefault(qualname, {}).setdefault(phase, [0.0, 0, 0])
+			record[0] += elapsed
+			record[1] += memory
+			record[2] += 1
+
+		return end
+
+	@contextmanager
+	def measure(self, qualname: str, phase: str):
+		end = self.begin(qualname, phase)
+
+		try:
+			yield
+		finally:
+			end()
+
+	def merge(self, records: dict) -> None:
+		"""Add the records of another profiler, e.g.: from a worker process.
+		"""
+		for qualname, phases in records.items():
+			for phase, (elapsed, memory, calls) in phases.items():
+				record = self.records.setdefault(qualname, {}).setdefault(phase, [0.0, 0, 0])
+				record[0] += elapsed
+				record[1] += memory
+				record[2] += calls
+
+	def get_member_report(self, qualname: str) -> dict:
+		phases = self.records.get(qualname, {})
+
+		def get_time(phase: str) -> float:
+			return phases.get(phase, (0.0,))[0]
+
+		result = {
+			"qualname": qualname,
+			"self_time": max(get_time("total") - get_time("content"), 0.0) + get_time("ownership") + get_time("exec_module"),
+			"total_time": get_time("total") + get_time("exec_module"),
+			"memory": phases["total"][1] if "total" in phases else sum(record[1] for record in phases.values()),
+		}
+
+		for phase in PHASES:
+			if phase in phases:
+				result[phase] = {"time": phases[phase][0], "memory": phases[phase][1], "calls": phases[phase][2]}
+
+		return result
+
+	def get_slowest(self, count: int=20, sort_by: str="self_time") -> list:
+		"""Returns the reports (see get_member_report) of the count members with the greatest sort_by (self_time, total_time or memory).
+		"""
+		reports = [self.get_member_report(qualname) for qualname in self.records]
+		reports.sort(key=lambda report: report[sort_by], reverse=True)
+
+		return reports[:count]
+
+	def to_dict(self, count: int=None) -> dict:
+		"""Returns {"total_time": sum of the self time of all the members, "members": the count slowest members (all if None)}.
+		"""
+		members = self.get_slowest(len(self.records))
+
+		return {
+			"total_time": sum(report["self_time"] for report in members),
+			"members": members if count is None else members[:count]
+		}
+
+	def dump_json(self, file, count: int=None) -> None:
+		"""Write the report of the members (the slowest first) as JSON to file (a file object).
+		"""
+		json.dump(self.to_dict(count), file, indent=4)
@@ -0,0 +1,400 @@
+"""Run several inspections (InspectModule workers, see main.py) at the same time on threads that are kept between loads.
+The jobs waiting for a thread are started by priority (the file shown first), then in the order they were submitted.
+Submitting a file that already has a job supersedes it: the old job is cancelled and its result discarded.
+Example:
+	scheduler = InspectionScheduler(max_threads=2)
+	scheduler.job_finished.connect(lambda job: print(job.path, job.state))
+	job = InspectionJob(path, InspectModule(path, budget=InspectionBudget(token=token)), token, executes_here=True)
+	job.progress.connect(lambda members: print(f"{members} members inspected"))
+	scheduler.submit(job, VISIBLE_PRIORITY)
+Notes:
+	The jobs that execute the module in the PyAPIReference process (not in a sandbox) run one at a time, importing isn't thread-safe
+	and the modules each one imports are found from a snapshot of sys.modules (see module_loader.unload_modules).
+	Cancelling a running job is cooperative (see inspection_budget.py), it stops after the member being inspected (or the sandbox is killed).
+"""
+import os
+import sys
+import time
+import itertools
+from enum import Enum
+
+from PyQt5.QtCore import QObject, QThread, QMetaObject, Qt, pyqtSignal
+
+from inspection_budget import CancellationToken
+from inspection_events import EventsTracker
+
+VISIBLE_PRIORITY = 1 # The file shown
+BACKGROUND_PRIORITY = 0
+
+MAX_THREADS = 2 # Files inspected at the same time
+THREAD_CLOSE_TIMEOUT = 2000 # Milliseconds all the threads have to finish their jobs when the scheduler is closed
+
+unfinished_threads = set() # Threads that didn't finish in time when their scheduler was closed, kept until they do
+
+
+class JobStates(Enum):
+	QUEUED = "queued"
+	RUNNING = "running"
+	FINISHED = "finished" # The result may be partial, see InspectionJob.exceeded
+	FAILED = "failed" # The module couldn't be loaded, see InspectionJob.exception
+	CANCELLED = "cancelled" # Cancelled before it started
+
+
+class InspectionJob(QObject):
+	"""A load request, run by InspectionScheduler.
+	Arguments:
+		path: file or package.
+		worker: InspectModule that inspects it, it's moved to a thread of the scheduler.
+		token: CancellationToken of the budget of worker.
+		executes_here: the module is executed in this process (not in a sandbox), see the notes of the module.
+	Signals:
+		progress: members inspected so far (only sent while executed modules are inspected).
+		state_changed: it started, finished, failed or was cancelled.
+	Attributes:
+		module_content, display_tree, display_style, module, engine, profiler, package_errors: the results of worker once it finished.
+		exceeded: why the inspection stopped early (e.g.: cancelled), see InspectionBudget.exceeded, None if it's complete.
+		warnings: problems that didn't stop the load (e.g.: the result couldn't be cached), see InspectModule.warnings.
+		budget: InspectionBudget of worker, it also limits the lazy contents of module_content.
+		pending_cache_key: key to cache module_content with once its lazy contents are loaded (see LazyLoadJob), None if there's nothing to cache.
+		imported_modules: names of the modules imported while it ran if executes_here, to unload them with module_loader.unload_modules.
+		discarded: it was superseded or removed, its result isn't shown.
+		reported: the warnings of its result (e.g.: incomplete inspection) were shown.
+		renderer: ProgressiveRenderer that creates the rows of its tree (see GUI/progressive_renderer.py), set by the GUI.
+	"""
+	progress = pyqtSignal(int)
+	state_changed = pyqtSignal()
+
+	def __init__(self, path: str, worker: QObject, token: CancellationToken, executes_here: bool=False):
+		super().__init__()
+
+		self.path = path
+		self.worker = worker
+		self.token = token
+		self.executes_here = executes_here
+		self.state = JobStates.QUEUED
+		self.priority = BACKGROUND_PRIORITY
+		self.order = 0 # Submission order, see InspectionScheduler.get_next_job
+		self.discarded = False
+		self.reported = False
+		self.events_tracker = EventsTracker()
+		self.loaded_modules = None # sys.modules when it started
+		self.imported_modules = None
+
+		self.module_content = None
+		self.display_tree = None
+		self.display_style = None
+		self.module = None
+		self.engine = worker.engine
+		self.profiler = None
+		self.package_errors = {}
+		self.exceeded = None
+		self.exception = None
+		self.warnings = []
+		self.budget = None
+		self.pending_cache_key = None
+		self.renderer = None
+
+	def __repr__(self):
+		return f"InspectionJob({self.path!r}, state={self.state.value}, priority={self.priority})"
+
+	@property
+	def key(self) -> str:
+		"""Jobs with the same key load the same file.
+		"""
+		return os.path.normcase(os.path.abspath(self.path))
+
+	@property
+	def is_done(self) -> bool:
+		return self.state in (JobStates.FINISHED, JobStates.FAILED, JobStates.CANCELLED)
+
+	@property
+	def members(self) -> int:
+		return self.events_tracker.members
+
+	def start(self, thread: QThread) -> None:
+		self.worker.moveToThread(thread)
+
+		# Queued, the worker lives in thread and this job in the GUI thread
+		self.worker.finished.connect(self.worker_finished)
+		self.worker.expection_found.connect(self.worker_failed)
+		self.worker.events_ready.connect(self.feed_events)
+
+		if self.executes_here:
+			self.loaded_modules = set(sys.modules)
+
+		self.set_state(JobStates.RUNNING)
+		QMetaObject.invokeMethod(self.worker, "run", Qt.QueuedConnection)
+
+	def set_state(self, state: JobStates) -> None:
+		self.state = state
+		self.state_changed.emit()
+
+	def set_imported_modules(self) -> None:
+		if self.loaded_modules is not None:
+			self.imported_modules = set(sys.modules) - self.loaded_modules
+			self.loaded_modules = None
+
+	def feed_events(self, events: list) -> None:
+		self.events_tracker.feed(events)
+		self.progress.emit(self.events_tracker.members)
+
+	def worker_finished(self) -> None:
+		worker = self.worker
+
+		self.module_content = worker.module_content
+		self.display_tree = worker.display_tree
+		self.display_style = worker.display_style
+		self.module = worker.module
+		self.profiler = worker.profiler
+		self.package_errors = worker.package_errors
+		self.warnings = worker.warnings
+		self.budget = worker.budget
+		self.pending_cache_key = worker.pending_cache_key
+		self.exceeded = worker.budget.exceeded if worker.is_incomplete() else None
+
+		self.set_imported_modules()
+		self.release_worker()
+		self.set_state(JobStates.FINISHED)
+
+	def worker_failed(self) -> None:
+		self.exception = self.worker.exception
+
+		self.set_imported_modules()
+		self.release_worker()
+		self.set_state(JobStates.FAILED)
+
+	def release_worker(self) -> None:
+		"""The results are kept by the job, the worker is deleted in its thread.
+		"""
+		self.worker.module_content = None
+		self.worker.display_tree = None
+		self.worker.module = None
+
+		# The reference is kept, dropping the last one would delete it in this thread
+		self.worker.deleteLater()
+
+	def release_result(self) -> None:
+		self.module_content = None
+		self.display_tree = None
+		self.module = None
+		self.profiler = None
+
+
+class LazyLoadJob(InspectionJob):
+	"""Loads lazy contents (see inspect_object.LazyDict) of the result of a finished job in a thread of the scheduler instead of the GUI thread,
+	loading them executes code of the module (e.g.: properties).
+	Arguments:
+		parent_job: the job whose module_content has the contents.
+		worker: LazyContentLoader (see main.py), it loads one content or all the contents of the tree (complete).
+		token: cancels a complete load after the content being loaded, the contents loaded so far are kept.
+	Attributes:
+		completed: all the lazy contents of the tree were loaded (and the tree was cached).
+	"""
+	def __init__(self, parent_job: InspectionJob, worker: QObject, token: CancellationToken):
+		super().__init__(parent_job.path, worker, token, executes_here=True)
+
+		self.parent_job = parent_job
+		self.complete = worker.complete
+		self.completed = False
+		self.content_key = "complete" if self.complete else id(worker.content)
+
+	def __repr__(self):
+		return f"LazyLoadJob({self.path!r}, complete={self.complete}, state={self.state.value})"
+
+	@property
+	def key(self) -> str:
+		"""Loading the same content (or completing the same tree) again supersedes the job.
+		"""
+		return f"{super().key}:{self.content_key}"
+
+	def worker_finished(self) -> None:
+		self.warnings = self.worker.warnings
+		self.completed = self.worker.completed
+
+		self.set_imported_modules()
+		self.release_worker()
+		self.set_state(JobStates.FINISHED)
+
+	def release_worker(self) -> None:
+		self.worker.content = None
+		self.worker.deleteLater()
+
+
+class FullValueJob(InspectionJob):
+	"""Gets the full value of a member of the file of a finished job (see FullValueLoader in main.py) in a thread of the scheduler,
+	its __str__ (and executing the module again if it isn't loaded) may take any time.
+	Arguments:
+		parent_job: the job of the file, its module is used if it's loaded.
+		worker: FullValueLoader, if it uses a sandbox the module isn't executed in this process.
+		token: kills the sandbox (see module_sandbox.py).
+	Attributes:
+		member_path: (module name, member name, nested member name...).
+		full_value: str of the member, None if error.
+		error: why the full value couldn't be got, None if full_value.
+		module: the module executed to get the full value, None if the one of parent_job was used (or it couldn't be loaded).
+	"""
+	def __init__(self, parent_job: InspectionJob, worker: QObject, token: CancellationToken):
+		super().__init__(parent_job.path, worker, token, executes_here=worker.sandbox_limits is None)
+
+		self.parent_job = parent_job
+		self.member_path = worker.member_path
+		self.full_value = None
+		self.error = None
+
+	def __repr__(self):
+		return f"FullValueJob({self.path!r}, member_path={self.member_path!r}, state={self.state.value})"
+
+	@property
+	def key(self) -> str:
+		return f"{super().key}:full_value:{'.'.join(self.member_path)}"
+
+	def worker_finished(self) -> None:
+		self.full_value = self.worker.full_value
+		self.error = self.worker.error
+		self.module = self.worker.loaded_module
+
+		self.set_imported_modules()
+		self.release_worker()
+		self.set_state(JobStates.FINISHED)
+
+	def release_worker(self) -> None:
+		self.worker.module = None
+		self.worker.loaded_module = None
+		self.worker.deleteLater()
+
+
+class InspectionScheduler(QObject):
+	"""Runs InspectionJobs on up to max_threads threads, started the first time they are needed and kept until close.
+	Signals:
+		job_finished: (job) it finished, failed or was cancelled, also sent for the discarded jobs (e.g.: to release their result).
+	"""
+	job_finished = pyqtSignal(object)
+
+	def __init__(self, max_threads: int=MAX_THREADS, parent: QObject=None):
+		super().__init__(parent)
+
+		self.max_threads = max_threads
+		self.threads = []
+		self.idle_threads = []
+		self.queue = [] # Jobs waiting for a thread
+		self.running = {} # {job: thread}
+		self.submitted = itertools.count()
+
+	def __repr__(self):
+		return f"InspectionScheduler(max_threads={self.max_threads}, queued={len(self.queue)}, running={len(self.running)})"
+
+	@property
+	def jobs(self) -> list:
+		"""The jobs queued or running.
+		"""
+		return [*self.running, *self.queue]
+
+	def submit(self, job: InspectionJob, priority: int=BACKGROUND_PRIORITY) -> InspectionJob:
+		"""Queue job, the jobs of the same file are discarded (see discard).
+		"""
+		for other_job in self.jobs:
+			if other_job.key == job.key:
+				self.discard(other_job)
+
+		job.priority = priority
+		job.order = next(self.submitted)
+		job.state_changed.connect(lambda: self.job_state_changed(job))
+
+		self.queue.append(job)
+		self.start_jobs()
+
+		return job
+
+	def set_priority(self, job: InspectionJob, priority: int) -> None:
+		"""Only changes the order of the queued jobs, a running job isn't paused.
+		"""
+		job.priority = priority
+
+	def cancel(self, job: InspectionJob) -> None:
+		"""A queued job is cancelled right away, a running one stops after the member being inspected (its result is partial).
+		"""
+		if job in self.queue:
+			self.queue.remove(job)
+			job.set_state(JobStates.CANCELLED)
+
+		elif job in self.running:
+			job.token.cancel()
+
+	def discard(self, job: InspectionJob) -> None:
+		"""Cancel job, its result isn't wanted (e.g.: the same file was submitted again).
+		"""
+		job.discarded = True
+		self.cancel(job)
+
+	def job_state_changed(self, job: InspectionJob) -> None:
+		if not job.is_done:
+			return
+
+		if job in self.running:
+			self.idle_threads.append(self.running.pop(job))
+
+		self.job_finished.emit(job)
+		self.start_jobs()
+
+	def start_jobs(self) -> None:
+		while len(self.queue) > 0:
+			job = self.get_next_job()
+			if job is None:
+				return
+
+			thread = self.get_idle_thread()
+			if thread is None:
+				return
+
+			self.queue.remove(job)
+			self.running[job] = thread
+			job.start(thread)
+
+	def get_next_job(self) -> InspectionJob:
+		"""Returns the queued job with the highest priority (the first submitted of them) that can run now, None if there's none.
+		"""
+		executing_here = any(job.executes_here for job in self.running)
+		jobs = [job for job in self.queue if not (job.executes_here and executing_here)]
+
+		return max(jobs, key=lambda job: (job.priority, -job.order), default=None)
+
+	def get_idle_thread(self) -> QThread:
+		"""Returns an idle thread, or a new one if there are less than max_threads, None if all of them are running a job.
+		"""
+		if len(self.idle_threads) > 0:
+			return self.idle_threads.pop()
+
+		if len(self.threads) >= self.max_threads:
+			return None
+
+		thread = QThread()
+		thread.start()
+		self.threads.append(thread)
+
+		return thread
+
+	def close(self) -> None:
+		"""Cancel all the jobs and stop the threads, e.g.: when PyAPIReference is closed.
+		Waits up to THREAD_CLOSE_TIMEOUT in total, the threads still running after it are kept in unfinished_threads until they finish.
+		"""
+		for job in self.jobs:
+			self.discard(job)
+			job.blockSignals(True) # Nothing is told when the running ones stop
+
+		self.queue = []
+		self.running = {}
+
+		for thread in self.threads:
+			thread.quit()
+
+		deadline = time.monotonic() + THREAD_CLOSE_TIMEOUT / 1000
+
+		for thread in self.threads:
+			remaining = max(int((deadline - time.monotonic()) * 1000), 0)
+
+			if not thread.wait(remaining): # Executing a module can't be stopped
+				unfinished_threads.add(thread)
+				thread.finished.connect(lambda thread=thread: unfinished_threads.discard(thread))
+
+		self.threads = []
+		self.idle_threads = []
@@ -0,0 +1,160 @@
+"""Long-lived process that runs the jobs of a WorkerPool (see worker_pool.py), started as:
+	python inspection_worker.py ADDRESS [MODULE...]
+It connects to ADDRESS (the authentication key is read from stdin), imports each MODULE (e.g.: numpy, pandas) once
+and then runs the jobs it receives, so the modules the inspected code imports are already imported.
+It can run a different interpreter than PyAPIReference (e.g.: a virtualenv), it only imports the standard library until it's connected
+so if the interpreter can't import PyAPIReference (it needs Python 3.9+ and PREFS) the reason is reported.
+Notes:
+	Messages, (kind, job_id, value) from the worker and (kind, job_id, ...) to the worker:
+		READY, None, {"python": version, "preload_errors": {module: message}}: the modules were imported, jobs can be run.
+		FAILED, None, message: the worker couldn't start.
+		JOB, job_id, function, args, limits, sys_path_entries, project_directories: run function(*args, token) (see module_sandbox.run_job).
+		CANCEL, job_id: set the token of the job.
+		RECYCLE, job_id, None: the job changed the state of the process, the worker exits after sending its result.
+		RESULT or ERROR, job_id, value: what the job returned or why it failed, after an ERROR the worker exits.
+	After each job the modules it imported from project_directories are removed from sys.modules (and freed once the worker is idle,
+	see module_loader.release_memory), so they are executed again (if they changed) the next time, the rest (e.g.: third-party packages) stay imported.
+	The limits of the jobs (RLIMIT_CPU and RLIMIT_AS, see module_sandbox.apply_limits) are restored after each one,
+	the rest of the process-wide state can't be: if a job leaves threads running, changes the working directory
+	or a signal handler the worker exits after it, so the next jobs run in a new one.
+"""
+import os
+import sys
+import queue
+import signal
+import threading
+from importlib import import_module
+from multiprocessing.connection import Client
+
+READY = "ready"
+FAILED = "failed"
+JOB = "job"
+CANCEL = "cancel"
+RECYCLE = "recycle"
+
+IDLE_RELEASE_DELAY = 1 # Seconds without jobs until the memory of the previous ones is released, see module_loader.release_memory
+
+
+def main():
+	address = sys.argv[1]
+	authkey = bytes.fromhex(sys.stdin.readline().strip())
+
+	try:
+		connection = Client(address, authkey=authkey)
+	except OSError: # PyAPIReference exited (or gave up) before the worker connected
+		exit_worker()
+
+	try:
+		import module_sandbox
+		from inspection_budget import CancellationToken
+		from module_loader import unload_modules, release_memory
+		from shared_tree import start_resource_tracker
+		from value_renderer import RENDER_THREAD_NAME
+		start_resource_tracker()
+	except BaseException as error:
+		connection.send((FAILED, None, f"Couldn't start a worker with {sys.executable}: {type(error).__name__}: {error}"))
+		return
+
+	connection.send((READY, None, {"python": sys.version, "preload_errors": preload_modules(sys.argv[2:])}))
+
+	jobs = queue.Queue()
+	threading.Thread(target=receive_messages, args=(connection, jobs, CancellationToken), daemon=True).start()
+
+	released = True
+
+	while True:
+		try:
+			job_id, function, args, limits, sys_path_entries, project_directories, token = jobs.get(timeout=None if released else IDLE_RELEASE_DELAY)
+		except queue.Empty: # Not between the jobs of a package, collecting the garbage of many modules is slow
+			release_memory()
+			released = True
+			continue
+
+		released = False
+
+		sys_modules = set(sys.modules)
+		sys.path[:0] = sys_path_entries
+		previous_limits = module_sandbox.apply_limits(limits, kill=False)
+		process_state = get_process_state(RENDER_THREAD_NAME) # After the limits, they set a signal handler
+
+		try:
+			status, value = module_sandbox.run_job(function, args, limits, token)
+		finally:
+			recycle = get_process_state(RENDER_THREAD_NAME) != process_state
+			module_sandbox.restore_limits(previous_limits)
+			del sys.path[:len(sys_path_entries)]
+			unload_modules(sys_modules, project_directories)
+
+		if recycle and status != module_sandbox.ERROR:
+			connection.send((RECYCLE, job_id, None))
+
+		sent = module_sandbox.send_message(connection, status, value, limits, job_id)
+
+		if recycle or status == module_sandbox.ERROR or not sent: # E.g.: it ran out of memory or called sys.exit, start again with a new worker
+			break
+
+	connection.close()
+	exit_worker()
+
+def receive_messages(connection, jobs: queue.Queue, token_type: type):
+	"""Run in a thread, so a job can be cancelled while it's running.
+	"""
+	tokens = {}
+
+	while True:
+		try:
+			message = connection.recv()
+		except (EOFError, OSError): # The pool was closed (or PyAPIReference exited)
+			exit_worker()
+
+		if message[0] == JOB: # Only one job is sent at a time
+			tokens.clear()
+			token = tokens[message[1]] = token_type()
+			jobs.put((*message[1:], token))
+
+		elif message[0] == CANCEL and message[1] in tokens:
+			tokens[message[1]].cancel()
+
+def get_process_state(shared_thread_name: str) -> tuple:
+	"""Returns the state of the process the jobs could change and isn't restored after them:
+	the threads running (but the ones named shared_thread_name, kept for the next jobs), the working directory and the signal handlers.
+	"""
+	try:
+		cwd = os.getcwd()
+	except OSError: # It was removed
+		cwd = None
+
+	handlers = []
+	for signal_number in signal.valid_signals():
+		try:
+			handlers.append(signal.getsignal(signal_number))
+		except (ValueError, OSError):
+			pass
+
+	threads = frozenset(thread.ident for thread in threading.enumerate() if thread.name != shared_thread_name)
+
+	return threads, cwd, tuple(handlers)
+
+def preload_modules(module_names: list) -> dict:
+	"""Import each module, returns {module_name: error message} of the ones that couldn't be imported.
+	"""
+	errors = {}
+
+	for module_name in module_names:
+		try:
+			import_module(module_name)
+		except BaseException as error:
+			errors[module_name] = f"{type(error).__name__}: {error}"
+
+	return errors
+
+def exit_worker():
+	try:
+		sys.stdout.flush()
+		sys.stderr.flush()
+	finally:
+		os._exit(0) # Don't wait for the threads the modules started or run their atexit handlers
+
+
+if __name__ == "__main__":
+	main()
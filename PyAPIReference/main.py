@@ -15,9 +15,9 @@ import inspect
 import sys
 import os
 import time
-import json
-import yaml
+import threading
 from enum import Enum, auto
+from collections.abc import Mapping
 
 import PREFS
 import markdown # Markdown to HTML converter
@@ -34,11 +34,14 @@ from PyQt5.QtWidgets import (
 	QMessageBox, QVBoxLayout, 
 	QMenu, QDesktopWidget, 
 	QTabWidget, QTextEdit, 
-	QShortcut
+	QShortcut, QDialog, 
+	QTableWidget, QTableWidgetItem, 
+	QHeaderView, QAbstractItemView, 
+	QProgressBar, QTabBar
 )
 
 from PyQt5.QtGui import QIcon, QPixmap, QFontDatabase, QFont, QKeySequence, QTextOption
-from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, QFile, QTextStream
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal, pyqtSlot, QFile, QTextStream
 from PyQt5.QtMultimedia import QMediaPlayer
 
 # Dependencies
@@ -47,10 +50,30 @@ from GUI.scrollarea import ScrollArea
 from GUI.settings_dialog import SettingsDialog
 from GUI.markdownhighlighter import MarkdownHighlighter
 from GUI.warning_dialog import WarningDialog
+from GUI.tree_view import InspectionTreeModel, InspectionTreeView
+from GUI.progressive_renderer import ProgressiveRenderer
 
 import resources # Qt resources resources.qrc
-from inspect_object import inspect_object
-from extra import create_qaction, convert_to_code_block, get_module_from_path, change_widget_stylesheet, add_text_to_text_edit, get_widgets_from_layout
+from inspect_object import inspect_object, iter_inspect_object, iter_lazy_contents, InspectEngines
+from inspection_events import TreeBuilder, iter_tree_events
+from exporters import write_json, write_yaml, write_prefs
+from static_inspect import static_inspect_path
+from member_filter import MemberFilter, load_member_filter
+from inspection_cache import InspectionCache, CACHE_MAX_SIZE
+from package_inspect import inspect_package, discover_modules
+from module_sandbox import SandboxLimits, inspect_path_sandboxed, render_full_value_job, create_sandbox
+from worker_pool import WorkerPool, WorkerError
+from tree_nodes import TreeStore, compact_tree
+from value_renderer import ValueRenderer, VALUE_MAX_LENGTH, VALUE_MAX_ITEMS, VALUE_TIME_BUDGET
+from inspection_profiler import InspectionProfiler
+from inspection_budget import InspectionBudget, CancellationToken, get_memory_usage
+from module_loader import unload_modules, release_memory, get_module_files
+from display_model import DisplayNode, DisplayStyle, build_display_tree, iter_prepared_children, get_default_tree, is_lazy, is_not_loaded
+from inspection_scheduler import InspectionScheduler, InspectionJob, LazyLoadJob, FullValueJob, JobStates, VISIBLE_PRIORITY, BACKGROUND_PRIORITY, MAX_THREADS
+from extra import create_qaction, get_module_from_path, change_widget_stylesheet, add_text_to_text_edit, get_widgets_from_layout
+
+
+MEMORY_LABEL_INTERVAL = 2000 # Milliseconds between updates of the memory used in the status bar
 
 
 class TreeExportTypes(Enum):
@@ -68,15 +91,88 @@ class MarkdownExportTypes(Enum):
 class InspectModule(QObject):
 	finished = pyqtSignal()
 	expection_found = pyqtSignal()
+	events_ready = pyqtSignal(list) # Batch of events (see inspection_events.py) while the module is inspected
 
-	def __init__(self, path):
+	EVENTS_BATCH_SIZE = 500
+
+	def __init__(self, path, engine: InspectEngines=InspectEngines.RUNTIME, cache: InspectionCache=None, lazy: bool=False, compact: bool=False, value_renderer: ValueRenderer=None, profiler: InspectionProfiler=None, static_attributes: bool=False, budget: InspectionBudget=None, sandbox_limits: SandboxLimits=None, worker_pool: WorkerPool=None, display_style: DisplayStyle=None):
 		super().__init__()
 		self.path = path
+		self.engine = engine
+		self.cache = cache
+		self.lazy = lazy
+		self.compact = compact
+		self.value_renderer = ValueRenderer() if value_renderer is None else value_renderer
 		self.running = False
-
+		self.package_errors = {}
+		self.module = None # The module loaded (if it was executed), e.g.: to show the full value of a member
+		self.profiler = profiler # Records the time spent in each member if given, see inspection_profiler.py
+		self.static_attributes = static_attributes # Don't invoke properties and descriptors, see inspect_object
+		self.budget = budget # Time and memory limits and the token of the Cancel button, see inspection_budget.py
+		self.sandbox_limits = sandbox_limits # Execute the module in a child process with these limits (None to execute it here), see module_sandbox.py
+		self.worker_pool = worker_pool # Warm workers to use instead of starting a sandbox, see worker_pool.py
+		self.display_style = display_style # Colors of the rows of the Tree tab, prepared here instead of in the GUI thread (see display_model.py)
+		self.display_tree = None
+		self.warnings = [] # Problems that didn't stop the load (e.g.: the result couldn't be cached), shown in the status bar
+		self.pending_cache_key = None # A lazy result is cached once all its contents are loaded, see LazyContentLoader
+
+	@pyqtSlot() # Invoked in the thread of the worker, see InspectionJob.start
 	def run(self):
 		self.running = True
-		module, error = get_module_from_path(self.path)
+
+		if self.profiler is not None:
+			self.profiler.start()
+
+		try:
+			self.inspect()
+		finally:
+			if self.profiler is not None:
+				self.profiler.stop()
+
+	def inspect(self):
+		member_filter = load_member_filter()
+		is_package = os.path.isdir(self.path)
+
+		cache_key = None
+		if self.cache is not None:
+			# The key of a package covers the sources of all its modules, so adding or changing any of them makes the result stale
+			files = [path for module_name, path in discover_modules(self.path)] if is_package else None
+
+			try:
+				cache_key = self.cache.get_key(self.path, self.engine.value, member_filter.key, self.value_renderer.key, self.static_attributes, files=files)
+			except OSError:
+				pass # Let get_module_from_path report it
+
+		# If the module didn't change since the last time it was inspected with the same settings use that result
+		# Unless profiling, as nothing would be measured
+		if cache_key is not None and self.profiler is None and (cached_result := self.cache.get(cache_key)) is not None:
+			if is_package: # With the errors of its modules, see inspect_package
+				cached_module_content, self.package_errors = cached_result["tree"], cached_result["errors"]
+			else:
+				cached_module_content = cached_result
+
+			self.module_content = compact_tree(cached_module_content) if self.compact else cached_module_content
+			self.finish()
+			return
+
+		if is_package:
+			self.inspect_package(member_filter, cache_key)
+			return
+
+		sandboxed = self.engine == InspectEngines.RUNTIME and self.sandbox_limits is not None
+		dependencies = [] # Files of the modules imported by the module, see inspection_cache.py
+
+		if self.engine == InspectEngines.STATIC:
+			self.module_content, error = static_inspect_path(self.path, member_filter, self.value_renderer)
+		elif sandboxed:
+			# Executed and inspected in a child process, so the module can't take the GUI down. It can't be inspected lazily
+			self.module_content, error = inspect_path_sandboxed(self.path, self.engine, member_filter, self.value_renderer, self.static_attributes, self.sandbox_limits, self.profiler, self.budget, self.worker_pool, dependencies)
+
+			if self.lazy:
+				self.warnings.append("Lazy inspection is not available for sandboxed modules, the whole module was inspected.")
+		else:
+			previous_modules = set(sys.modules)
+			module, error = get_module_from_path(self.path, profiler=self.profiler)
 
 		if error is not None: # Means exception
 			self.exception = error
@@ -84,11 +180,209 @@ class InspectModule(QObject):
 			self.running = False
 			return
 
-		self.module_content = inspect_object(module)
+		executed_here = self.engine == InspectEngines.RUNTIME and not sandboxed
+
+		if executed_here:
+			self.module = module
+
+		if executed_here and self.lazy:
+			self.module_content = inspect_object(module, member_filter, lazy=True, compact=self.compact, value_renderer=self.value_renderer, profiler=self.profiler, static_attributes=self.static_attributes, budget=self.budget)
+
+		elif executed_here:
+			self.module_content = self.build_module_content(iter_inspect_object(module, member_filter, self.value_renderer, self.profiler, self.static_attributes, budget=self.budget))
+
+		if executed_here:
+			dependencies = get_module_files(previous_modules, (os.path.dirname(os.path.abspath(self.path)),))
+
+		# A result cut by the budget is not cached, a lazy one is not complete until its contents are loaded (cached then)
+		if cache_key is not None and self.lazy and executed_here and not self.is_incomplete():
+			self.pending_cache_key = cache_key
+
+		elif cache_key is not None and not self.is_incomplete():
+			try:
+				self.cache.set(cache_key, self.module_content, dependencies)
+			except Exception as error: # Not being able to cache the result (e.g.: it can't be written) shouldn't stop the load
+				self.warnings.append(f"Couldn't cache the result: {error}")
+
+		if self.compact and not executed_here:
+			self.module_content = compact_tree(self.module_content)
+
+		self.finish()
+
+	def inspect_package(self, member_filter: MemberFilter, cache_key: str):
+		"""Inspect all the modules of the package in parallel, the modules that fail are reported in package_errors.
+		The modules are inspected in sandboxes, so the package can't be inspected lazily.
+		"""
+		dependencies = []
+		self.module_content, self.package_errors = inspect_package(self.path, self.engine, member_filter, value_renderer=self.value_renderer, profiler=self.profiler, static_attributes=self.static_attributes, budget=self.budget, limits=self.sandbox_limits, pool=self.worker_pool, dependencies=dependencies)
+
+		# The errors raised by the modules are cached with the tree, not if a module failed for another reason (e.g.: a time limit), it may not fail again
+		temporary_errors = any(error["line"] is None for error in self.package_errors.values())
+
+		if cache_key is not None and not temporary_errors and not self.is_incomplete():
+			try:
+				self.cache.set(cache_key, {"tree": self.module_content, "errors": self.package_errors}, dependencies)
+			except Exception as error:
+				self.warnings.append(f"Couldn't cache the result: {error}")
+
+		if self.compact:
+			self.module_content = compact_tree(self.module_content)
+
+		self.finish()
+
+	def finish(self):
+		"""Prepare the rows of the Tree tab from module_content (see display_model.py) and emit finished.
+		"""
+		if self.display_style is not None:
+			self.display_tree = build_display_tree(self.module_content, self.display_style)
 
 		self.finished.emit()
 		self.running = False
 
+	def is_incomplete(self) -> bool:
+		"""Returns True if the inspection was cancelled or exceeded its budget, so module_content is partial.
+		"""
+		return self.budget is not None and self.budget.exceeded is not None
+
+	def build_module_content(self, events) -> dict:
+		"""Build the tree from the events while they are sent to the GUI in batches.
+		"""
+		builder = TreeBuilder(TreeStore() if self.compact else None)
+		batch = []
+
+		for event in events:
+			builder.feed_event(*event)
+			batch.append(event)
+
+			if len(batch) >= self.EVENTS_BATCH_SIZE:
+				self.events_ready.emit(batch)
+				batch = []
+
+		if len(batch) > 0:
+			self.events_ready.emit(batch)
+
+		return builder.tree
+
+
+class LazyContentLoader(QObject):
+	"""Worker of a LazyLoadJob (see inspection_scheduler.py), loads a lazy content of a result in a thread of the scheduler.
+	If complete, content is the whole tree and its lazy contents are loaded one by one until token is cancelled,
+	once all of them are loaded the tree is cached with cache_key, the same as the result of an eager inspection.
+	"""
+	finished = pyqtSignal()
+	expection_found = pyqtSignal()
+	events_ready = pyqtSignal(list)
+
+	engine = InspectEngines.RUNTIME # Only the modules executed here are inspected lazily
+
+	def __init__(self, path: str, content, token: CancellationToken=None, complete: bool=False, cache: InspectionCache=None, cache_key: str=None, imported_modules: set=frozenset(), budget: InspectionBudget=None):
+		super().__init__()
+		self.path = path
+		self.content = content
+		self.token = token
+		self.complete = complete
+		self.cache = cache
+		self.cache_key = cache_key
+		self.imported_modules = imported_modules # Imported when the module was executed, its dependencies (see inspection_cache.py)
+		self.budget = budget
+		self.completed = False
+		self.warnings = []
+
+	@pyqtSlot() # Invoked in the thread of the worker, see InspectionJob.start
+	def run(self):
+		loaded_modules = set(sys.modules)
+
+		try:
+			if self.complete:
+				self.completed = self.load_all()
+			else:
+				self.content.load()
+		except Exception as error: # The contents loaded so far are kept
+			self.warnings.append(f"Couldn't inspect a content: {error}")
+
+		if self.completed and self.cache is not None and (self.budget is None or self.budget.exceeded is None):
+			imported_modules = self.imported_modules | (set(sys.modules) - loaded_modules)
+			dependencies = get_module_files(set(sys.modules) - imported_modules, (os.path.dirname(os.path.abspath(self.path)),))
+
+			try:
+				self.cache.set(self.cache_key, self.content, dependencies)
+			except Exception as error:
+				self.warnings.append(f"Couldn't cache the result: {error}")
+
+		self.finished.emit()
+
+	def load_all(self) -> bool:
+		"""Returns True if all the lazy contents were loaded, False if it was cancelled before.
+		"""
+		for content in iter_lazy_contents(self.content):
+			if self.token is not None and self.token.cancelled:
+				return False
+
+			content.load()
+
+		return True
+
+
+class FullValueLoader(QObject):
+	"""Worker of a FullValueJob (see inspection_scheduler.py), gets str(member) without the limits of ValueRenderer in a thread of the scheduler.
+	If module is None the module at path is executed first (e.g.: the tree was loaded from the cache), it's kept in loaded_module,
+	unless sandbox_limits is given, then it's executed in a sandbox (or a worker of worker_pool) that token cancels (see module_sandbox.py).
+	"""
+	finished = pyqtSignal()
+	expection_found = pyqtSignal()
+	events_ready = pyqtSignal(list)
+
+	engine = InspectEngines.RUNTIME
+
+	def __init__(self, path: str, member_path: tuple, module=None, sandbox_limits: SandboxLimits=None, worker_pool: WorkerPool=None, token: CancellationToken=None):
+		super().__init__()
+		self.path = path
+		self.member_path = member_path
+		self.module = module
+		self.sandbox_limits = sandbox_limits
+		self.worker_pool = worker_pool
+		self.token = token
+		self.loaded_module = None
+		self.full_value = None
+		self.error = None
+
+	@pyqtSlot() # Invoked in the thread of the worker, see InspectionJob.start
+	def run(self):
+		if self.module is None and self.sandbox_limits is not None:
+			self.render_sandboxed()
+		else:
+			self.render()
+
+		self.finished.emit()
+
+	def render(self):
+		member = self.module
+
+		if member is None:
+			member, error = get_module_from_path(self.path)
+
+			if error is not None:
+				self.error = f"Couldn't load the module\n\nException: {error['message']}\nFile: {error['file']}\nLine: {error['line']}"
+				return
+
+			self.loaded_module = member
+
+		for member_name in self.member_path[1:]:
+			try:
+				member = getattr(member, member_name)
+			except Exception as error: # Not only AttributeError, it may be a property
+				self.error = f"Couldn't find {member_name} in {'.'.join(self.member_path)}\n\n{type(error).__name__}: {error}"
+				return
+
+		self.full_value = ValueRenderer().render_full(member)
+
+	def render_sandboxed(self):
+		sandbox = create_sandbox(render_full_value_job, (self.path, self.member_path), self.sandbox_limits, self.worker_pool, project_directories=(os.path.dirname(os.path.abspath(self.path)),))
+		self.full_value, error = sandbox.run(self.token)
+
+		if error is not None:
+			self.error = f"Couldn't get the full value\n\n{error}"
+
 
 class MainWindow(QMainWindow):
 	def __init__(self, parent=None):
@@ -113,6 +407,34 @@ class MainWindow(QMainWindow):
 
 		self.setCentralWidget(self.main_widget)
 
+		self.create_memory_label()
+
+	def create_memory_label(self):
+		"""Show the memory used by PyAPIReference (not by its sandboxes) in the status bar, if it can be measured.
+		"""
+		if hasattr(self, "memory_timer"): # Reset
+			self.memory_timer.stop()
+			self.statusBar().removeWidget(self.memory_label)
+
+		if get_memory_usage() is None:
+			return
+
+		self.memory_label = QLabel()
+		self.memory_label.setToolTip("Memory used by PyAPIReference, the modules executed in sandboxes are not included.\nThe memory of a file is released when another one is loaded.")
+		self.statusBar().addPermanentWidget(self.memory_label)
+
+		self.memory_timer = QTimer(self)
+		self.memory_timer.timeout.connect(self.update_memory_label)
+		self.memory_timer.start(MEMORY_LABEL_INTERVAL)
+
+		self.update_memory_label()
+
+	def update_memory_label(self):
+		memory = get_memory_usage()
+
+		if memory is not None:
+			self.memory_label.setText(f"Memory: {memory / 1024 ** 2:.0f} MiB")
+
 	def create_menu_bar(self):
 		"""Create menu bar."""
 		bar = self.menuBar() # Get the menu bar of the mainwindow
@@ -124,9 +446,23 @@ class MainWindow(QMainWindow):
 			menu=file_menu, 
 			text="Load file", 
 			shortcut="Ctrl+O", 
-			callback=lambda: self.main_widget.load_file() if self.main_widget.widgets["load_file_button"][-1].isEnabled() else QMessageBox.critical(self, "Cannot load file", "There is a file already loading, wait for it to load another."), 
+			callback=lambda: self.main_widget.load_file(), 
 			parent=self)			
 
+		load_file_statically_action = create_qaction(
+			menu=file_menu, 
+			text="Load file without executing", 
+			shortcut="Ctrl+Shift+O", 
+			callback=lambda: self.main_widget.load_file(InspectEngines.STATIC), 
+			parent=self)
+
+		load_package_action = create_qaction(
+			menu=file_menu, 
+			text="Load package", 
+			shortcut="Ctrl+Shift+P", 
+			callback=lambda: self.main_widget.load_package(), 
+			parent=self)
+
 		## Export tree menu ##
 		export_tree_menu = file_menu.addMenu("Export tree...")
 		
@@ -183,6 +519,22 @@ class MainWindow(QMainWindow):
 			parent=self)
 
 
+		## Profile menu ##
+		profile_menu = file_menu.addMenu("Profile...")
+
+		slowest_members_action = create_qaction(
+			menu=profile_menu, 
+			text="Slowest members", 
+			callback=lambda x: self.main_widget.show_slowest_members(), 
+			parent=self)
+
+		export_profile_action = create_qaction(
+			menu=profile_menu, 
+			text="Export profile as JSON", 
+			callback=lambda x: self.export_profile(), 
+			parent=self)
+
+
 		# Create a close action that will call self.close_app
 		close_action = create_qaction(
 			menu=file_menu, 
@@ -228,16 +580,33 @@ class MainWindow(QMainWindow):
 		if path == '':
 			return
 
+		# The members that were not inspected yet (if lazy inspection) are inspected while they are written
+		events = iter_tree_events(self.main_widget.module_content)
+
 		with open(path, "w") as file:
 			if export_type == TreeExportTypes.PREFS:
-				file.write(PREFS.convert_to_prefs(self.main_widget.module_content))
+				write_prefs(events, file)
 			
 			elif export_type == TreeExportTypes.JSON:
-				json.dump(self.main_widget.module_content, file, indent=4)
+				write_json(events, file)
 			
 			elif export_type == TreeExportTypes.YAML:
-				yaml.dump(self.main_widget.module_content, file)
+				write_yaml(events, file)
 	
+	def export_profile(self) -> None:
+		"""Export the time spent in each member of the last load (see inspection_profiler.py) as a JSON file"""
+		if not self.main_widget.check_profiler("Export profile as JSON"):
+			return
+
+		default_filename = f"{tuple(self.main_widget.module_content)[0]}_profile.json"
+		path, file_filter = QFileDialog.getSaveFileName(self, "Export profile as JSON", default_filename, "JSON Files (*.json)")
+		
+		if path == '':
+			return
+
+		with open(path, "w") as file:
+			self.main_widget.profiler.dump_json(file)
+
 	def export_markdown(self, export_type: MarkdownExportTypes):
 		if len(self.main_widget.widgets["markdown_text_edit"]) < 1:
 			QMessageBox.critical(self, "Cannot export markdown", "You haven't create any markdown to export.")
@@ -269,6 +638,9 @@ class MainWindow(QMainWindow):
 			self.reset_app()
 
 	def reset_app(self):
+		self.main_widget.close_jobs()
+		self.main_widget.close_worker_pool()
+
 		self.close() # Close
 		self.__init__() # Init again
 
@@ -309,6 +681,8 @@ class MainWindow(QMainWindow):
 
 	def close_app(self):
 		self.save_geometry()
+		self.main_widget.close_jobs()
+		self.main_widget.close_worker_pool()
 
 		# Close window and exit program to close all dialogs open.
 		self.close()
@@ -322,26 +696,50 @@ class MainWindow(QMainWindow):
 
 
 class MainWidget(QWidget):
+	worker_pool_warning = pyqtSignal(str) # Sent from any thread, see get_worker_pool
+
 	def __init__(self, parent=None):
 		super().__init__()
 
 		self.FONTS = ("UbuntuMono-B.ttf", "UbuntuMono-BI.ttf", "UbuntuMono-R.ttf", "UbuntuMono-RI.ttf")
 
 		self.widgets = {
+			"files_tab_bar": [], 
 			"module_tabs": [], 
 			"module_content_scrollarea": [], 
 			"load_file_button": [], 
 			"retry_button": [], 
+			"render_progress_bar": [], 
+			"cancel_button": [], 
 			"markdown_tab": [], 
 			"markdown_text_edit": []
 		}
 
 		self.THEME = PREFS.read_prefs_file("GUI/theme.prefs")
 		self.module_content = None
+		self.display_tree = None # Rows of the Tree tab prepared by the worker, see display_model.py
+		self.display_style = None # Colors of display_tree, to prepare the contents inspected later (lazy inspection)
+		self.module = None # See InspectModule.module
+		self.module_engine = None # Engine used to inspect module_content
+		self.profiler = None # See InspectModule.profiler
+		self.worker_pool = None # See get_worker_pool
+		self.jobs = [] # InspectionJob of each file tab, see add_job
+		self.visible_job = None # Job of the file shown, see show_job
+		self.lazy_jobs = {} # LazyLoadJob -> called once its content is loaded (None if it completes a tree), see load_lazy_content
+		self.module_tree = None # InspectionTreeView or root CollapsibleWidget of the Tree tab, see filter_tree
+		self.renderer = None # ProgressiveRenderer of the job shown, creates the rows of its tree (see create_renderer)
 
 		self.load_fonts()
 		self.init_prefs()
+
+		# Inspects the files loaded on threads kept between loads, the file shown first (see inspection_scheduler.py)
+		self.scheduler = InspectionScheduler(self.prefs.file["inspection_threads"], self)
+		self.scheduler.job_finished.connect(self.inspection_job_finished)
+
+		self.worker_pool_warning.connect(lambda message: self.show_warnings([message]))
+
 		self.init_window()
+		self.warm_up_worker_pool()
 
 	@property	
 	def current_theme(self):
@@ -360,6 +758,36 @@ class MainWidget(QWidget):
 		default_prefs = {
 			"current_module": "", # The path when you open a file to restore it 
 			"theme": "dark", 
+			"inspect_engine": InspectEngines.RUNTIME.value, # Engine used when loading a file, see InspectEngines
+			"lazy_inspection": False, # Inspect nested members when they are uncollapsed
+			"compact_tree": False, # Store the inspected members as compact nodes instead of dicts (less memory, slower to traverse), see tree_nodes.py
+			"profile_inspection": False, # Record the time spent in each member, see inspection_profiler.py
+			"static_attributes": False, # Don't invoke properties and descriptors when inspecting, see member_descriptors.py
+			"tree_view": True, # Show the tree in a view that only creates the expanded rows instead of a widget per member, see GUI/tree_view.py
+			"render_frame_budget": 16, # Milliseconds the window can be blocked creating the rows of the tree, see GUI/progressive_renderer.py
+			"inspection_threads": MAX_THREADS, # Files inspected at the same time, see inspection_scheduler.py
+			"sandbox": { # Execute the modules in a child process, so they can't take PyAPIReference down, see module_sandbox.py
+				"enabled": True, 
+				"cpu_time": 0, # Seconds, 0 means no limit
+				"memory": 0, # MiB, 0 means no limit
+				"timeout": 0, # Seconds, 0 means no limit
+				"warm_workers": True, # Reuse worker processes instead of starting one for each module, see worker_pool.py
+				"interpreter": "", # Python executable of the warm workers (e.g.: of a virtualenv), empty for the one running PyAPIReference
+				"preload": [], # Modules the warm workers import when they start, e.g.: ["numpy", "pandas"]
+			},
+			"inspection_budget": { # Stop inspecting and show the members inspected so far, see inspection_budget.py
+				"time_limit": 0, # Seconds, 0 means no limit
+				"memory_limit": 0, # MiB, 0 means no limit
+			},
+			"value_rendering": { # Limits to render the values of the members, see value_renderer.py
+				"max_length": VALUE_MAX_LENGTH, # Characters
+				"max_items": VALUE_MAX_ITEMS, 
+				"time_budget": VALUE_TIME_BUDGET, # Seconds
+			},
+			"cache": {
+				"enabled": True, 
+				"max_size": CACHE_MAX_SIZE, # Bytes
+			},
 			"state": {
 				"pos": (-100, -100), 
 				"size": (0, 0), 
@@ -393,13 +821,24 @@ class MainWidget(QWidget):
 
 		self.widgets["load_file_button"].append(load_file_button)
 
+		# A tab for each file loaded, the file shown is inspected first
+		files_tab_bar = QTabBar()
+		files_tab_bar.setTabsClosable(True)
+		files_tab_bar.setExpanding(False)
+		files_tab_bar.setVisible(False)
+		files_tab_bar.currentChanged.connect(self.files_tab_changed)
+		files_tab_bar.tabCloseRequested.connect(self.close_job)
+
+		self.widgets["files_tab_bar"].append(files_tab_bar)
+
 		self.layout().addWidget(logo, 0, 0, 1, 0, Qt.AlignTop)
 		self.layout().addWidget(load_file_button, 1, 0, Qt.AlignTop)
+		self.layout().addWidget(files_tab_bar, 2, 0)
 		self.layout().setRowStretch(1, 1)
 
 		self.load_last_module()
 
-	def load_file(self):
+	def load_file(self, engine: InspectEngines=None):
 		path, file_filter = QFileDialog.getOpenFileName(
 			parent=self, 
 			caption="Select a file", 
@@ -417,80 +856,632 @@ class MainWidget(QWidget):
 
 		self.prefs.write_prefs("current_module", path)
 
-		self.create_inspect_module_thread(path)
+		self.create_inspect_module_thread(path, engine)
+
+	def load_package(self, engine: InspectEngines=None):
+		current_module = self.prefs.file["current_module"]
+
+		path = QFileDialog.getExistingDirectory(
+			parent=self, 
+			caption="Select a package", 
+			directory=os.getcwd() if current_module == "" else os.path.dirname(current_module))
+
+		# If path equals empty string means no selected directory
+		if path == '':
+			return
+
+		self.prefs.write_prefs("current_module", path)
+
+		self.create_inspect_module_thread(path, engine)
 
 	def load_last_module(self):
 		if not self.prefs.file["current_module"] == "":
-			if not os.path.isfile(self.prefs.file["current_module"]):
+			if not os.path.exists(self.prefs.file["current_module"]):
 				return # Ignore it because is not a valid path
 
 			self.create_inspect_module_thread(self.prefs.file["current_module"])		
 
-	def create_inspect_module_thread(self, module):
-		# Disable Load File button
-		self.widgets["load_file_button"][-1].setEnabled(False)
+	def create_inspect_module_thread(self, module, engine: InspectEngines=None):
+		"""Queue the inspection of module (a file or a package) and show it, loading a file again replaces its tab (see add_job).
+		"""
+		if engine is None:
+			engine = InspectEngines(self.prefs.file["inspect_engine"])
 
-		loading_label = QLabel("Loading...")
-		loading_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-		loading_label.setStyleSheet(f"font-size: 20px; font-family: {self.THEME['module_collapsible_font_family']};")
+		self.release_module()
 
-		if len(self.widgets["module_content_scrollarea"]) > 0:
-			self.widgets["module_content_scrollarea"][-1].setParent(None)
-			self.widgets["module_content_scrollarea"].pop()
+		if self.prefs.file["cache"]["enabled"]:
+			cache = InspectionCache(max_size=self.prefs.file["cache"]["max_size"])
+		else:
+			cache = None
 
-		self.widgets["module_content_scrollarea"].append(loading_label)
+		value_renderer = ValueRenderer(**self.prefs.file["value_rendering"])
 
-		self.layout().addWidget(loading_label, 2, 0)
-		self.layout().setRowStretch(2, 100)
-		
+		profiler = InspectionProfiler() if self.prefs.file["profile_inspection"] else None
+
+		cancellation_token = CancellationToken()
+
+		time_limit = self.prefs.file["inspection_budget"]["time_limit"]
+		memory_limit = self.prefs.file["inspection_budget"]["memory_limit"]
+		budget = InspectionBudget(time_limit or None, memory_limit * 1024 ** 2 or None, cancellation_token)
+
+		# Packages are always inspected in sandboxes
+		sandbox_limits = self.get_sandbox_limits() if self.prefs.file["sandbox"]["enabled"] or os.path.isdir(module) else None
+
+		worker = InspectModule(module, engine, cache, self.prefs.file["lazy_inspection"], self.prefs.file["compact_tree"], value_renderer, profiler, self.prefs.file["static_attributes"], budget, sandbox_limits, self.get_worker_pool(), self.get_display_style())
+
+		job = InspectionJob(module, worker, cancellation_token, executes_here=engine == InspectEngines.RUNTIME and sandbox_limits is None)
+		job.renderer = self.create_renderer()
+		job.progress.connect(lambda members, job=job: self.update_job(job))
+		job.state_changed.connect(lambda job=job: self.update_job(job))
+
+		self.add_job(job)
+		self.scheduler.submit(job, VISIBLE_PRIORITY)
+		self.show_job(job)
+
+	def create_renderer(self) -> ProgressiveRenderer:
+		"""Returns the renderer of a job, creates the rows of its tree in slices so big trees don't freeze the window (see GUI/progressive_renderer.py).
+		Only the renderer of the job shown updates the progress bar.
+		"""
+		renderer = ProgressiveRenderer(self.prefs.file["render_frame_budget"] / 1000, self)
+		renderer.progress.connect(lambda done, total, renderer=renderer: self.update_render_progress_bar(done, total) if renderer is self.renderer else None)
+		renderer.finished.connect(lambda renderer=renderer: self.remove_render_progress_bar() if renderer is self.renderer else None)
+
+		return renderer
+
+	def add_job(self, job: InspectionJob):
+		"""Add a tab for job, if its file already has one job replaces the last load (see InspectionScheduler.submit).
+		"""
+		files_tab_bar = self.widgets["files_tab_bar"][-1]
+
+		for index, other_job in enumerate(self.jobs):
+			if other_job.key != job.key:
+				continue
+
+			self.jobs[index] = job
+
+			if other_job.is_done: # Else the scheduler discards it and it's released once it stops, see inspection_job_finished
+				self.release_job(other_job)
+
+			self.update_job(job)
+			return
+
+		self.jobs.append(job)
+
+		files_tab_bar.blockSignals(True) # Shown by create_inspect_module_thread
+		files_tab_bar.addTab("")
+		files_tab_bar.blockSignals(False)
+		files_tab_bar.setVisible(True)
+
+		self.update_job(job)
+
+	def update_job(self, job: InspectionJob):
+		"""Show the state and progress of job in its tab (and the loading label if it's shown).
+		"""
+		if job not in self.jobs: # Superseded or closed
+			return
+
+		index = self.jobs.index(job)
+		file_name = os.path.basename(os.path.normpath(job.path))
+
+		files_tab_bar = self.widgets["files_tab_bar"][-1]
+		files_tab_bar.setTabText(index, file_name if job.state == JobStates.FINISHED else f"{file_name} ({job.state.value})")
+		files_tab_bar.setTabToolTip(index, job.path)
+
+		if job is not self.visible_job or job.is_done:
+			return
+
+		loading_label = self.widgets["module_content_scrollarea"][-1] if len(self.widgets["module_content_scrollarea"]) > 0 else None
+		if isinstance(loading_label, QLabel):
+			loading_label.setText(self.get_loading_text(job))
+
+	def get_loading_text(self, job: InspectionJob) -> str:
+		if job.state == JobStates.QUEUED:
+			return "Waiting for the files loading..."
+
+		if job.members > 0:
+			return f"Loading... {job.members} members inspected"
+
+		return "Loading..."
+
+	def files_tab_changed(self, index: int):
+		if 0 <= index < len(self.jobs) and self.jobs[index] is not self.visible_job:
+			self.show_job(self.jobs[index])
+
+	def show_job(self, job: InspectionJob):
+		"""Show job in place of the file shown: its tree, its progress while it's loading (it's inspected before the other files) or why it failed.
+		"""
+		for other_job in self.jobs:
+			self.scheduler.set_priority(other_job, VISIBLE_PRIORITY if other_job is job else BACKGROUND_PRIORITY)
+
+		self.visible_job = job
+
+		self.release_module()
+		self.remove_cancel_button()
+		self.remove_retry_button()
+		self.layout().setRowStretch(6, 0)
+
+		files_tab_bar = self.widgets["files_tab_bar"][-1]
+		files_tab_bar.blockSignals(True)
+		files_tab_bar.setCurrentIndex(self.jobs.index(job))
+		files_tab_bar.blockSignals(False)
+
+		self.prefs.write_prefs("current_module", job.path) # Loaded again the next time PyAPIReference is opened
+
+		if job.state == JobStates.FINISHED:
+			self.show_job_result(job)
+
+		elif job.state == JobStates.FAILED:
+			exception_message = f"Couldn't load file, Exception found\n\nException: {job.exception['message']}\nFile: {job.exception['file']}\nLine: {job.exception['line']}"
+			self.show_retry(job, exception_message)
+
+		elif job.state == JobStates.CANCELLED:
+			self.show_retry(job, "The load was cancelled before it started.")
+
+		else:
+			self.show_job_loading(job)
+
+	def show_job_loading(self, job: InspectionJob):
+		self.create_status_label(self.get_loading_text(job))
+
+		cancel_button = QPushButton("Cancel")
+		cancel_button.clicked.connect(lambda ignore, job=job: self.cancel_inspection(job))
+
+		if job.token.cancelled:
+			cancel_button.setEnabled(False)
+			cancel_button.setText("Cancelling...")
+
+		self.widgets["cancel_button"].append(cancel_button)
+		self.layout().addWidget(cancel_button, 4, 0)
+
+	def show_job_result(self, job: InspectionJob):
+		self.module_content = job.module_content
+		self.display_tree = job.display_tree
+		self.display_style = job.display_style
+		self.module = job.module
+		self.module_engine = job.engine
+		self.profiler = job.profiler
+		self.renderer = job.renderer
+
+		self.create_module_tabs()
+
+		if job.reported:
+			return
+
+		# Only the first time it's shown
+		job.reported = True
+
+		if job.exceeded is not None:
+			self.show_incomplete_inspection(job.exceeded)
+
+		if len(job.package_errors) > 0:
+			self.show_package_errors(job.package_errors)
+
+		if len(job.warnings) > 0:
+			self.show_warnings(job.warnings)
+
+	def show_retry(self, job: InspectionJob, message: str):
+		status_label = self.create_status_label(message)
+		change_widget_stylesheet(status_label, "font-size", "15px")
+
+		retry_button = QPushButton("Retry")
+		retry_button.clicked.connect(lambda ignore, job=job: self.create_inspect_module_thread(job.path, job.engine))
+
+		self.widgets["retry_button"].append(retry_button)
+
+		self.layout().addWidget(retry_button, 4, 0)
+		self.layout().setRowStretch(6, 100)
+
+	def create_status_label(self, text: str) -> QLabel:
+		"""Returns a label shown in place of the tree, e.g.: while the file is loading.
+		"""
+		status_label = QLabel(text)
+		status_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+		status_label.setStyleSheet(f"font-size: 20px; font-family: {self.THEME['module_collapsible_font_family']};")
+
+		self.widgets["module_content_scrollarea"].append(status_label)
+
+		self.layout().addWidget(status_label, 3, 0)
+		self.layout().setRowStretch(3, 100)
+
+		return status_label
+
+	def inspection_job_finished(self, job: InspectionJob):
+		if isinstance(job, LazyLoadJob):
+			self.lazy_load_finished(job)
+			return
+
+		if isinstance(job, FullValueJob):
+			self.full_value_finished(job)
+			return
+
+		if job.discarded: # Superseded or its tab was closed
+			self.release_job(job)
+			return
+
+		if job is self.visible_job:
+			self.show_job(job)
+
+		self.complete_lazy_result(job)
+
+	def load_lazy_content(self, content, on_loaded: callable):
+		"""Load a lazy content of the file shown (see inspect_object.LazyDict) in a thread of the scheduler, as it executes code of the module,
+		and call on_loaded once it's loaded, unless another file is shown before.
+		"""
+		job = self.visible_job
+		if job is None or not is_not_loaded(content):
+			on_loaded()
+			return
+
+		self.window().statusBar().showMessage("Inspecting the content...")
+		self.submit_lazy_load(job, LazyContentLoader(job.path, content), on_loaded, VISIBLE_PRIORITY)
+
+		for lazy_job in tuple(self.lazy_jobs):
+			if lazy_job.parent_job is job and lazy_job.complete and lazy_job.state == JobStates.RUNNING:
+				self.scheduler.cancel(lazy_job) # Resumed after this content, see lazy_load_finished
+
+	def complete_lazy_result(self, job: InspectionJob):
+		"""Load the lazy contents of the result of job in the background, so it's cached once all of them are loaded (see LazyContentLoader).
+		"""
+		if job.pending_cache_key is None or job.module_content is None or job not in self.jobs:
+			return
+
+		if any(lazy_job.parent_job is job and lazy_job.complete for lazy_job in self.lazy_jobs):
+			return
+
+		token = CancellationToken()
+		cache = InspectionCache(max_size=self.prefs.file["cache"]["max_size"])
+		worker = LazyContentLoader(job.path, job.module_content, token, True, cache, job.pending_cache_key, frozenset(job.imported_modules or ()), job.budget)
+
+		self.submit_lazy_load(job, worker, None, BACKGROUND_PRIORITY, token)
+
+	def submit_lazy_load(self, job: InspectionJob, worker: LazyContentLoader, on_loaded: callable, priority: int, token: CancellationToken=None):
+		lazy_job = LazyLoadJob(job, worker, CancellationToken() if token is None else token)
+		self.lazy_jobs[lazy_job] = on_loaded
+
+		self.scheduler.submit(lazy_job, priority)
+
+	def lazy_load_finished(self, job: LazyLoadJob):
+		on_loaded = self.lazy_jobs.pop(job, None)
+		parent_job = job.parent_job
+
+		# The modules imported while loading belong to the file, unloaded with its modules (see release_job)
+		if job.imported_modules is not None and parent_job.imported_modules is not None:
+			parent_job.imported_modules |= job.imported_modules
+		elif job.imported_modules is not None:
+			unload_modules(set(sys.modules) - job.imported_modules)
+
+		job.imported_modules = None
+
+		if job.completed:
+			parent_job.pending_cache_key = None
+
+		if not any(not lazy_job.complete for lazy_job in self.lazy_jobs):
+			self.window().statusBar().clearMessage()
+
+		if parent_job is self.visible_job and len(job.warnings) > 0:
+			self.show_warnings(job.warnings)
+
+		if job.discarded: # The file was released or isn't shown anymore
+			return
+
+		if on_loaded is not None:
+			on_loaded()
+
+		self.complete_lazy_result(parent_job)
+
+	def close_job(self, index: int):
+		"""Close the tab of a file, its inspection is cancelled and its tree released.
+		"""
+		job = self.jobs.pop(index)
+
+		files_tab_bar = self.widgets["files_tab_bar"][-1]
+		files_tab_bar.blockSignals(True)
+		files_tab_bar.removeTab(index)
+		files_tab_bar.blockSignals(False)
+		files_tab_bar.setVisible(len(self.jobs) > 0)
+
+		if job is self.visible_job and len(self.jobs) > 0:
+			self.show_job(self.jobs[files_tab_bar.currentIndex()])
+
+		elif job is self.visible_job:
+			self.visible_job = None
+			self.release_module()
+			self.remove_cancel_button()
+			self.remove_retry_button()
+
+			self.layout().setRowStretch(1, 1)
+			self.layout().setRowStretch(3, 0)
+			self.layout().setRowStretch(6, 0)
+
+			self.prefs.write_prefs("current_module", "")
+
+		if job.is_done:
+			self.release_job(job)
+		else: # Released once it stops, see inspection_job_finished
+			self.scheduler.discard(job)
+
+	def release_job(self, job: InspectionJob):
+		"""Release the tree and the module of job and the modules it imported (see unload_modules),
+		so loading many files in the same session doesn't keep the closed ones in memory.
+		"""
+		for lazy_job in tuple(self.lazy_jobs):
+			if lazy_job.parent_job is job:
+				self.scheduler.discard(lazy_job)
+
+		job.release_result()
+
+		if job.renderer is not None:
+			job.renderer.clear()
+			job.renderer.deleteLater()
+			job.renderer = None
+
+		if job.imported_modules is not None:
+			unload_modules(set(sys.modules) - job.imported_modules)
+			job.imported_modules = None
+
+		release_memory()
+
+	def close_jobs(self):
+		"""Cancel the inspections and release all the files, e.g.: before closing PyAPIReference.
+		"""
+		self.release_module()
+
+		for job in self.jobs:
+			if job.is_done: # The queued ones are released once they are cancelled, see inspection_job_finished
+				self.release_job(job)
+
+		self.scheduler.close()
+
+		self.jobs = []
+		self.lazy_jobs = {}
+		self.visible_job = None
+
+	def release_module(self):
+		"""Release the widgets of the file shown and the references to its tree and module (they are kept by its job, see release_job).
+		"""
+		if self.renderer is not None:
+			self.renderer.clear() # Its tasks create widgets of the tree
+			self.renderer = None
+
+		for lazy_job in tuple(self.lazy_jobs):
+			if not lazy_job.complete: # Its rows would be added to the widgets deleted here
+				self.scheduler.discard(lazy_job)
+
+		for key in ("module_content_scrollarea", "module_tabs", "markdown_tab", "markdown_text_edit"):
+			for widget in self.widgets[key]:
+				widget.setParent(None)
+
+			self.widgets[key] = []
+
+		self.module_content = None
+		self.display_tree = None
+		self.module = None
+		self.module_tree = None
+
+	def get_worker_pool(self) -> WorkerPool:
+		"""Returns the pool of warm workers (created the first time), None if they are disabled in the settings.
+		"""
+		if not self.prefs.file["sandbox"]["warm_workers"]:
+			return None
+
+		if self.worker_pool is None:
+			self.worker_pool = WorkerPool(self.prefs.file["sandbox"]["interpreter"] or None, self.prefs.file["sandbox"]["preload"], on_warning=self.worker_pool_warning.emit)
+
+		return self.worker_pool
+
+	def warm_up_worker_pool(self):
+		"""Start a worker in the background, so the modules to preload are imported before loading a file (only if sandboxing is enabled).
+		"""
+		if not self.prefs.file["sandbox"]["enabled"]:
+			return
+
+		worker_pool = self.get_worker_pool()
+		if worker_pool is None:
+			return
+
+		def warm_up():
+			try:
+				worker_pool.warm_up()
+			except WorkerError as error: # Reported again when loading a file
+				self.worker_pool_warning.emit(str(error))
+
+		threading.Thread(target=warm_up, daemon=True).start()
+
+	def close_worker_pool(self):
+		if self.worker_pool is not None:
+			self.worker_pool.close()
+			self.worker_pool = None
+
+	def get_sandbox_limits(self) -> SandboxLimits:
+		sandbox_prefs = self.prefs.file["sandbox"]
+
+		return SandboxLimits(sandbox_prefs["cpu_time"] or None, sandbox_prefs["memory"] * 1024 ** 2 or None, sandbox_prefs["timeout"] or None)
+
+	def cancel_inspection(self, job: InspectionJob):
+		"""Stop the inspection after the member being inspected, the members inspected so far are shown (if it's queued it's cancelled right away).
+		Executing the module can't be cancelled, unless it's in a sandbox (it's killed if it doesn't stop in time, see module_sandbox.py).
+		"""
+		self.scheduler.cancel(job)
+
+		if len(self.widgets["cancel_button"]) > 0 and not job.is_done:
+			self.widgets["cancel_button"][-1].setEnabled(False)
+			self.widgets["cancel_button"][-1].setText("Cancelling...")
+
+	def update_render_progress_bar(self, done: int, total: int):
+		if len(self.widgets["render_progress_bar"]) == 0:
+			render_progress_bar = QProgressBar()
+			render_progress_bar.setMaximumHeight(20)
+
+			self.widgets["render_progress_bar"].append(render_progress_bar)
+			self.layout().addWidget(render_progress_bar, 5, 0)
+
+		render_progress_bar = self.widgets["render_progress_bar"][-1]
+
+		if total > 0:
+			render_progress_bar.setFormat("Showing the tree... %v/%m rows")
+			render_progress_bar.setRange(0, total)
+			render_progress_bar.setValue(min(done, total))
+		else: # Unknown (e.g.: a lazy content being inspected), shown as busy
+			render_progress_bar.setRange(0, 0)
+
+	def remove_render_progress_bar(self):
+		if len(self.widgets["render_progress_bar"]) > 0:
+			self.widgets["render_progress_bar"][-1].setParent(None)
+			self.widgets["render_progress_bar"].pop()
+
+	def remove_cancel_button(self):
+		if len(self.widgets["cancel_button"]) > 0:
+			self.widgets["cancel_button"][-1].setParent(None)
+			self.widgets["cancel_button"].pop()
+
+	def remove_retry_button(self):
 		if len(self.widgets["retry_button"]) > 0:
 			self.widgets["retry_button"][-1].setParent(None)
 			self.widgets["retry_button"].pop()
 
-		self.thread = QThread()
-		self.worker = InspectModule(module)
-		self.worker.moveToThread(self.thread)
+	def show_incomplete_inspection(self, reason: str):
+		reasons = {
+			"cancelled": "it was cancelled", 
+			"time_limit": f"it exceeded the time limit ({self.prefs.file['inspection_budget']['time_limit']} seconds)", 
+			"memory_limit": f"it exceeded the memory limit ({self.prefs.file['inspection_budget']['memory_limit']} MiB)", 
+		}
 
-		# Start: inspect object / Finish: create widget 
-		self.thread.started.connect(self.worker.run)	
+		QMessageBox.warning(self, "Incomplete inspection", f"The inspection stopped because {reasons.get(reason, reason)}.\nOnly the members inspected until then are shown, the classes and modules not fully inspected are marked as truncated.\nThe limits can be changed in the settings.")
 
-		# Delete thread and inspect objects
-		self.worker.finished.connect(self.inspect_object_worker_finished)
-		self.worker.expection_found.connect(self.inspect_object_worker_exception)
+	def show_package_errors(self, package_errors: dict, max_errors: int=20):
+		errors_message = ""
 
-		self.thread.start()
+		for module_name, error in tuple(package_errors.items())[:max_errors]:
+			errors_message += f"\n{module_name}: {error['message']}" + (f" (line {error['line']})" if error["line"] is not None else "")
 
-	def inspect_object_worker_exception(self):
-		self.thread.quit()
-		self.worker.deleteLater()		
-		self.thread.deleteLater()
+		if len(package_errors) > max_errors:
+			errors_message += f"\n...and {len(package_errors) - max_errors} more."
 
-		self.widgets["load_file_button"][-1].setEnabled(True)
+		QMessageBox.warning(self, "Some modules couldn't be loaded", f"{len(package_errors)} modules couldn't be loaded:\n{errors_message}")
 
-		exception_message = f"Couldn't load file, Exception found\n\nException: {self.worker.exception['message']}\nFile: {self.worker.exception['file']}\nLine: {self.worker.exception['line']}"
-		change_widget_stylesheet(self.widgets["module_content_scrollarea"][-1], "font-size", "15px")
-		self.widgets["module_content_scrollarea"][-1].setText(exception_message)
+	def show_warnings(self, warnings: list, timeout: int=10000):
+		"""Show problems that didn't stop the load (e.g.: the result couldn't be cached) in the status bar for timeout milliseconds.
+		"""
+		self.window().statusBar().showMessage(" ".join(warnings), timeout)
 
-		retry_button = QPushButton("Retry")
-		retry_button.clicked.connect(lambda: self.create_inspect_module_thread(self.prefs.file["current_module"]))
+	def show_full_value(self, member_path: tuple):
+		"""Show str(member) without the limits of ValueRenderer, member_path is (module name, member name, nested member name...).
+		The value is computed now (not when inspecting) in a thread of the scheduler (see FullValueJob),
+		if the module was loaded from the cache it's executed again and kept for the next full values.
+		If sandboxing is enabled it's executed in a sandbox instead, every time (see module_sandbox.py).
+		"""
+		title = f"{'.'.join(member_path)} full value"
+		job = self.visible_job
+		can_execute = job is not None and self.module_engine == InspectEngines.RUNTIME and os.path.isfile(job.path)
 
-		self.widgets["retry_button"].append(retry_button)
+		if self.module is None and not can_execute:
+			QMessageBox.information(self, title, "The full value is only available for modules loaded by executing them (not packages or modules loaded without executing).")
+			return
 
-		self.layout().addWidget(retry_button, 3, 0)
-		self.layout().setRowStretch(4, 100)
+		sandbox_limits = self.get_sandbox_limits() if self.module is None and self.prefs.file["sandbox"]["enabled"] else None
+		token = CancellationToken()
+		worker = FullValueLoader(job.path, member_path, self.module, sandbox_limits, self.get_worker_pool(), token)
 
-	def inspect_object_worker_finished(self):
-		self.thread.quit()
-		self.worker.deleteLater()
-		self.thread.deleteLater()
+		self.window().statusBar().showMessage("Getting the full value...")
+		self.scheduler.submit(FullValueJob(job, worker, token), VISIBLE_PRIORITY)
 
-		self.layout().setRowStretch(4, 0)
+	def full_value_finished(self, job: FullValueJob):
+		parent_job = job.parent_job
+		self.window().statusBar().clearMessage()
 
-		self.widgets["load_file_button"][-1].setEnabled(True)
-		self.module_content = self.worker.module_content
+		# The module executed is kept for the next full values, unloaded with the modules of the file (see release_job)
+		if job.module is not None and parent_job in self.jobs and parent_job.module is None:
+			parent_job.module = job.module
 
-		self.create_module_tabs()
+			if parent_job is self.visible_job:
+				self.module = job.module
+
+		if job.imported_modules is not None and parent_job in self.jobs:
+			parent_job.imported_modules = (parent_job.imported_modules or set()) | job.imported_modules
+		elif job.imported_modules is not None:
+			unload_modules(set(sys.modules) - job.imported_modules)
+
+		job.imported_modules = None
+		job.module = None
+
+		if job.discarded or parent_job not in self.jobs: # The file was closed
+			return
+
+		title = f"{'.'.join(job.member_path)} full value"
+
+		if job.error is not None:
+			QMessageBox.critical(self, title, job.error)
+		else:
+			self.show_full_value_dialog(title, job.full_value)
+
+	def show_full_value_dialog(self, title: str, full_value: str):
+		full_value_text_edit = QTextEdit()
+		full_value_text_edit.setReadOnly(True)
+		full_value_text_edit.setPlainText(full_value)
+
+		full_value_dialog = QDialog(self)
+		full_value_dialog.setWindowTitle(title)
+		full_value_dialog.setLayout(QVBoxLayout())
+		full_value_dialog.layout().addWidget(full_value_text_edit)
+		full_value_dialog.resize(600, 400)
+		full_value_dialog.exec_()
 		
+	def check_profiler(self, title: str) -> bool:
+		"""Returns True if the last load was profiled, else tells the user how to profile it.
+		"""
+		if self.profiler is None or len(self.profiler.records) == 0:
+			QMessageBox.information(self, title, "The last load wasn't profiled.\nEnable \"Profile inspection\" in the settings and load the module again (only executed modules are profiled).")
+			return False
+
+		return True
+
+	def show_slowest_members(self, count: int=50):
+		"""Show the count members that took more time to inspect (see inspection_profiler.py), 
+		their qualified names can be copied to add them to the exclude patterns of member_filter.prefs.
+		"""
+		title = "Slowest members"
+
+		if not self.check_profiler(title):
+			return
+
+		columns = ("Member", "Self (ms)", "Total (ms)", "exec_module (ms)", "Ownership (ms)", "Signature (ms)", "Value (ms)", "Net memory (KiB)")
+		reports = self.profiler.get_slowest(count)
+
+		slowest_members_table = QTableWidget(len(reports), len(columns))
+		slowest_members_table.setHorizontalHeaderLabels(columns)
+		slowest_members_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+		slowest_members_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+		slowest_members_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+		for row, report in enumerate(reports):
+			phase_times = [report[phase]["time"] if phase in report else 0 for phase in ("exec_module", "ownership", "signature", "value")]
+			cells = [report["qualname"]] + [f"{seconds * 1000:.2f}" for seconds in (report["self_time"], report["total_time"], *phase_times)]
+			cells.append(f"{report['memory'] / 1024:.1f}")
+
+			for column, cell in enumerate(cells):
+				item = QTableWidgetItem(cell)
+				if column > 0:
+					item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+				slowest_members_table.setItem(row, column, item)
+
+		def copy_selected_members():
+			rows = sorted({index.row() for index in slowest_members_table.selectedIndexes()})
+			QApplication.clipboard().setText("\n".join(reports[row]["qualname"] for row in rows))
+
+		copy_button = QPushButton("Copy selected names")
+		copy_button.setToolTip("Copy the qualified names of the selected members, e.g.: to exclude them in member_filter.prefs")
+		copy_button.clicked.connect(copy_selected_members)
+
+		slowest_members_dialog = QDialog(self)
+		slowest_members_dialog.setWindowTitle(title)
+		slowest_members_dialog.setLayout(QVBoxLayout())
+		slowest_members_dialog.layout().addWidget(QLabel(f"Total: {self.profiler.to_dict(0)['total_time'] * 1000:.0f} ms, memory is only measured while loading."))
+		slowest_members_dialog.layout().addWidget(slowest_members_table)
+		slowest_members_dialog.layout().addWidget(copy_button)
+		slowest_members_dialog.resize(900, 500)
+		slowest_members_dialog.exec_()
+
 	def create_module_tabs(self):
 		if len(self.widgets["module_tabs"]) > 0:	
 			self.widgets["module_tabs"][-1].setParent(None)
@@ -500,14 +1491,16 @@ class MainWidget(QWidget):
 			self.widgets["module_content_scrollarea"][-1].setParent(None)
 			self.widgets["module_content_scrollarea"] = []
 
+		self.renderer.frame_budget = self.prefs.file["render_frame_budget"] / 1000
+
 		module_tabs = QTabWidget()
 
 		module_tabs_shortcut = QShortcut(QKeySequence("Ctrl+Tab"), module_tabs)
 		module_tabs_shortcut.activated.connect(lambda: module_tabs.setCurrentIndex((module_tabs.currentIndex() + 1) % module_tabs.count()))
 
 
-		self.layout().addWidget(module_tabs, 2, 0, 1, 0)
-		self.layout().setRowStretch(2, 1)		
+		self.layout().addWidget(module_tabs, 3, 0, 1, 0)
+		self.layout().setRowStretch(3, 1)		
 		self.layout().setRowStretch(1, 0)
 
 		module_tabs.addTab(self.create_module_content_tab(), "Tree")		
@@ -611,9 +1604,15 @@ class MainWidget(QWidget):
 					markdown_text += f"{header} `{member_name} ({member_type}) = {member_props['value']}`\n"
 				else:
 					markdown_text += f"{header} `{member_name} ({member_type})`\n"
+
+				if "reference" in member_props: # Means it's the same object as another member (see InspectionSession)
+					member_docstring = f"Same as `{member_props['reference']}`."
 				
 				markdown_text += f"{member_docstring if member_docstring is not None else f'{member_name} has no description.'}".strip() + "\n\n"
 
+				if "truncated" in member_props: # Its members were not inspected (see inspect_object)
+					markdown_text += f"Members not inspected ({member_props['truncated']}).\n\n"
+
 				if "parameters" in member_props:
 					markdown_text += parameters_to_markdown(member_props["parameters"]) + "\n"
 
@@ -632,7 +1631,7 @@ class MainWidget(QWidget):
 		markdown_text = f"# {module_name}\n"
 
 		for property_name, property_val in module_content.items():
-			if isinstance(property_val, dict):
+			if isinstance(property_val, Mapping):
 				markdown_text += content_to_markdown(property_val)
 
 			elif property_name == "docstring":
@@ -650,10 +1649,7 @@ class MainWidget(QWidget):
 			>>> {"abc": {"a": 0, "b": 1, "c": 2, "d": 3}
 		"""
 		if filter_dict is None:
-			module_content_scrollarea = self.widgets["module_content_scrollarea"][-1]
-			module_collapsible = list(get_widgets_from_layout(module_content_scrollarea.main_widget.layout()))[0]
-
-			filter_dict = module_collapsible.tree_to_dict()
+			filter_dict = self.module_tree.tree_to_dict()
 
 		#if not not not filter_dict: # Means empty
 			#return dict_to_filter
@@ -662,22 +1658,30 @@ class MainWidget(QWidget):
 			dict_to_filter = self.module_content
 
 		result = {}
+		stack = [(filter_dict, dict_to_filter, result)] # Filtered with a stack instead of recursion, so it works with trees of any depth
 
-		for key, val in dict_to_filter.items():
-			if not key in filter_dict or filter_dict[key] == True:
-				result[key] = val
-				continue
+		while len(stack) > 0:
+			filter_dict, dict_to_filter, filtered = stack.pop()
 
-			if filter_dict[key] == False:
-				continue
+			for key, val in dict_to_filter.items():
+				if not key in filter_dict or filter_dict[key] == True:
+					filtered[key] = val
+					continue
 
-			elif isinstance(val, dict):
-				result[key] = self.filter_tree(filter_dict[key], val)		
-				continue
+				if filter_dict[key] == False:
+					continue
+
+				elif isinstance(val, Mapping):
+					filtered[key] = {}
+					stack.append((filter_dict[key], val, filtered[key]))
+					continue
 
 		return result
 
 	def create_module_content_tab(self):
+		if self.prefs.file["tree_view"]:
+			return self.create_module_tree_view()
+
 		module_content_widget = QWidget()
 		module_content_widget.setLayout(QVBoxLayout())
 		font = QFont()
@@ -691,19 +1695,53 @@ class MainWidget(QWidget):
 		}}
 		""")
 
-		module_collapsible = self.create_collapsible_object(self.module_content, collapse_button=CollapseButton)
+		module_collapsible = self.create_collapsible_object(self.display_tree, collapse_button=CollapseButton)
 		
 		module_collapsible.uncollapse()
 
+		# The members are shown right away, created in slices (see GUI/progressive_renderer.py)
+		for collapsible in get_widgets_from_layout(module_collapsible.content_layout, CollapsibleWidget):
+			if collapsible.title == "content":
+				collapsible.uncollapse()
+
 		module_content_widget.layout().addWidget(module_collapsible)
 		module_content_widget.layout().addStretch(1)
 
 		module_content_scrollarea = ScrollArea(module_content_widget)
 
+		self.module_tree = module_collapsible
 		self.widgets["module_content_scrollarea"].append(module_content_scrollarea)
 		return module_content_scrollarea
 
-	def create_collapsible_widget(self, title: str, color=None, collapse_button=CheckBoxCollapseButton, parent=None) -> QWidget:
+	def create_module_tree_view(self):
+		"""Tree tab as an InspectionTreeView, the rows are only created when their parent is expanded (see GUI/tree_view.py).
+		"""
+		model = InspectionTreeModel(self.display_tree, self.display_style, self.renderer, self.load_lazy_content)
+
+		module_tree_view = InspectionTreeView(model)
+
+		# The members are shown right away, created in slices (see GUI/progressive_renderer.py)
+		content_index = model.find_child(model.index(0, 0), "content")
+		if content_index.isValid():
+			module_tree_view.expand_now(content_index)
+		module_tree_view.add_context_menu_action("Show full value", lambda node: self.show_full_value(node.member_path), lambda node: node.has_value)
+
+		font = QFont()
+		module_tree_view.setStyleSheet(
+		f"""
+		*{{
+			font-family: {self.THEME['module_collapsible_font_family']};
+		}}
+		QToolTip {{
+			font-family: {font.defaultFamily()};
+		}}
+		""")
+
+		self.module_tree = module_tree_view
+		self.widgets["module_content_scrollarea"].append(module_tree_view)
+		return module_tree_view
+
+	def create_collapsible_widget(self, title: str, color=None, collapse_button=CheckBoxCollapseButton, parent=None, content_factory: callable=None, content_tree: callable=None, content_loader: callable=None) -> QWidget:
 		if parent is None:
 			parent = self
 
@@ -713,131 +1751,72 @@ class MainWidget(QWidget):
 			title, 
 			color, 
 			collapse_button, 
-			parent)
+			parent, 
+			content_factory, 
+			content_tree, 
+			self.renderer, 
+			content_loader)
 
 		return collapsible_widget
 
-	def create_collapsible_object(self, object_content: dict, collapse_button=CheckBoxCollapseButton):
-		"""Generates a collapsible widget for a given object_content generated by inspect_object
+	def create_collapsible_object(self, object_node: DisplayNode, collapse_button=CheckBoxCollapseButton):
+		"""Generates a collapsible widget for the row of an object prepared by build_display_tree (see display_model.py)
 		"""
 
-		def create_property_collapsible(
-			property_content: dict, 
-			properties_without_checkbox: (tuple)=("docstring", "inherits"), 
-			properties_disabled_by_default: (tuple)=("self"), 
-			):
-			
-			"""Given a dicionary with {property_name: property_value}, where property_value could be a dictionary or a list
-			return a collapsible widget.
+		def create_property_collapsible(property_node: DisplayNode):
+			"""Given the row of a property whose value is a dictionary, a list or a multiple line string return a collapsible widget.
 			"""
-			property_name = tuple(property_content)[0]
-			property_value = property_content[property_name]
-			
-			if not not not property_value: # Means empty
-				return
-
-			if "type" in property_value and isinstance(property_value, dict):
-				color = self.find_object_type_color(property_value["type"])
-			else:
-				color = self.find_object_type_color(property_name)
-
-			if property_name in properties_without_checkbox:
-				property_collapsible = self.create_collapsible_widget(property_name, color, collapse_button=CollapseButton)
+			# The widgets of the value are created the first time the collapsible is uncollapsed
+			content_factory = lambda collapsible: add_rows_to_collapsible(property_node, collapsible)
+			content_tree = lambda: get_default_tree(property_node, self.display_style)
+			# A lazy value is inspected in a thread of the scheduler, then its widgets are created
+			content_loader = (lambda loaded: self.load_lazy_content(property_node.value, loaded)) if is_lazy(property_node) else None
+
+			if property_node.checkable:
+				property_collapsible = self.create_collapsible_widget(property_node.name, property_node.color, content_factory=content_factory, content_tree=content_tree, content_loader=content_loader)
 			else:
-				property_collapsible = self.create_collapsible_widget(property_name, color)
+				property_collapsible = self.create_collapsible_widget(property_node.name, property_node.color, collapse_button=CollapseButton, content_factory=content_factory, content_tree=content_tree, content_loader=content_loader)
 
-			if property_name in properties_disabled_by_default:
+			if not property_node.checked:
 				property_collapsible.disable_checkbox()
 
-			if isinstance(property_value, (list, tuple)):
-				for nested_property_value in property_value:
-					if not not not nested_property_value: # Means emtpy
-						continue
-
-					nested_property_label = QLabel(str(nested_property_value))
-
-					property_collapsible.addWidget(nested_property_label)
-			
-			elif isinstance(property_value, dict):
-				for nested_property_name, nested_property_value in property_value.items():
-
-					if not not not nested_property_value: # Means empty
-						continue
-					
-					multiple_line_string = "\n" in nested_property_value if isinstance(nested_property_value, str) else ""
-
-					if isinstance(nested_property_value, (list, tuple, dict)) or multiple_line_string:
-						nested_property_content = {nested_property_name: nested_property_value}
-						
-						nested_property_collapsible = create_property_collapsible(nested_property_content)
-						if nested_property_collapsible is None:
-							continue
-
-						property_collapsible.addWidget(nested_property_collapsible)
-						continue
-					
-					nested_property_color = self.find_object_type_color(nested_property_name)
-					nested_property_label = QLabel(f"{nested_property_name}: {self.convert_to_code_block(nested_property_value)}")
-					nested_property_label.setStyleSheet(f"color: {nested_property_color};")
-
-					property_collapsible.addWidget(nested_property_label)
-		
-			elif isinstance(property_value, str):
-				property_value = property_value.strip()
+			if property_node.has_value: # The value may be shortened (see value_renderer.py)
+				property_collapsible.add_context_menu_action("Show full value", lambda: self.show_full_value(property_node.member_path))
 
-				property_label = QLabel(self.convert_to_code_block(property_value))
-				property_label.setStyleSheet(f"color {color}")
+			return property_collapsible
 
-				property_collapsible.addWidget(property_label)
+		def create_label(node: DisplayNode) -> QLabel:
+			label = QLabel(node.html)
+			label.setTextFormat(Qt.RichText) # The text of an item of a list is escaped
 
-			return property_collapsible
+			return label
 
-		def add_object_properties_to_collapsible(object_properties: dict, collapsible: CollapsibleWidget):
-			"""Given a dictionary with the properties of an object an a collapsible, add widgest to the collapsible representing the properties.
+		def add_rows_to_collapsible(node: DisplayNode, collapsible: CollapsibleWidget):
+			"""Generator that adds a widget to collapsible for each row of node each step, see CollapsibleWidget.build_content.
 			"""
-			for property_name, property_value in object_properties.items():
-				multiple_line_string = "\n" in property_value if isinstance(property_value, str) else ""
-
-				if isinstance(property_value, (list, tuple, dict)) or multiple_line_string:
-					property_content = {property_name: property_value}
-
-					property_collapsible = create_property_collapsible(property_content)
-					
-					if property_collapsible is None:
-						continue
-					
-					collapsible.addWidget(property_collapsible)
-					continue
-
-				property_color = self.find_object_type_color(property_name)
-				property_label = QLabel(f"{property_name}: {self.convert_to_code_block(property_value)}")
-				property_label.setStyleSheet(f"color: {property_color};")
+			for child in iter_prepared_children(node, self.display_style): # A lazy content was loaded before, see content_loader
+				if child.is_expandable:
+					collapsible.addWidget(create_property_collapsible(child))
+				else:
+					collapsible.addWidget(create_label(child))
 
-				collapsible.addWidget(property_label)
-		
-		object_name = tuple(object_content)[0]
-		object_properties = object_content[object_name]
+				yield
 
-		color = self.find_object_type_color(object_properties["type"])
+		collapsible_object = self.create_collapsible_widget(object_node.name, object_node.color, collapse_button=collapse_button)
 
-		collapsible_object = self.create_collapsible_widget(object_name, color, collapse_button=collapse_button)
-		add_object_properties_to_collapsible(object_content[object_name], collapsible_object)
+		for step in add_rows_to_collapsible(object_node, collapsible_object):
+			pass
 
 		return collapsible_object
 
-	def find_object_type_color(self, object_type: str) -> str:
-		for color_object_type in self.prefs.file["colors"]:
-
-			if object_type == color_object_type:
-				return self.prefs.file["colors"][color_object_type]
-				
-		return self.THEME[self.current_theme]["font_color"]
-
-	def convert_to_code_block(self, string):
-		background_color = self.THEME[self.current_theme]["code_block"]["background_color"]
-		font_color = self.THEME[self.current_theme]["code_block"]["font_color"]
+	def get_display_style(self) -> DisplayStyle:
+		code_block = self.THEME[self.current_theme]["code_block"]
 
-		return convert_to_code_block(string, stylesheet=f"background-color: {background_color}; color: {font_color};")
+		return DisplayStyle(
+			self.prefs.file["colors"], 
+			self.THEME[self.current_theme]["font_color"], 
+			f"background-color: {code_block['background_color']}; color: {code_block['font_color']};"
+		)
 
 
 def init_app():
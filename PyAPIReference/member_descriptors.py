@@ -0,0 +1,87 @@
+"""Classify and read members without running their code, used by inspect_object(static_attributes=True).
+Properties, cached properties and custom descriptors (e.g.: the columns of an ORM) may run arbitrary code
+(queries, I/O, lazy loads) when their attributes are read or their value is rendered, here the attributes are read with
+inspect.getattr_static and the members are classified by their type, so they are reported without being invoked.
+Example:
+	class Person:
+		__slots__ = ("name",)
+
+		@property
+		def age(self) -> int:
+			return query_age(self)
+
+	print(get_descriptor_type_name(vars(Person)["age"]), get_descriptor_type_name(vars(Person)["name"]))
+	>>> property slot
+"""
+import inspect
+from functools import cached_property
+from types import FunctionType, MethodType, ModuleType, MemberDescriptorType, GetSetDescriptorType
+
+# (descriptor type, type name of its nodes), the first one the member is an instance of is used
+DESCRIPTOR_TYPES = (
+	(property, "property"),
+	(cached_property, "cached_property"),
+	(classmethod, "classmethod"),
+	(staticmethod, "staticmethod"),
+	(MemberDescriptorType, "slot"),
+)
+
+# Types whose members are inspected themselves instead of being classified as descriptors (functions have __get__ too)
+NOT_DESCRIPTOR_TYPES = (type, ModuleType, FunctionType, MethodType)
+
+MISSING = object()
+
+
+def get_descriptor_type_name(member: object):
+	"""Returns the type name of the node of member if it's a descriptor: property, cached_property, classmethod, staticmethod,
+	slot (__slots__ members) or descriptor (any other object whose type defines __get__ in Python code). None if it's not a descriptor.
+	Only the type of member is used, e.g.: isinstance could call a __class__ property.
+	"""
+	member_type = type(member)
+
+	for descriptor_type, type_name in DESCRIPTOR_TYPES:
+		if issubclass(member_type, descriptor_type):
+			return type_name
+
+	if issubclass(member_type, NOT_DESCRIPTOR_TYPES) or member_type.__module__ == "builtins":
+		return None # Builtin descriptors (method_descriptor, wrapper_descriptor, etc) are reported as before
+
+	if inspect.getattr_static(member_type, "__get__", MISSING) is not MISSING:
+		return "descriptor"
+
+	return None
+
+def get_descriptor_function(descriptor: object):
+	"""Returns the function a property, cached_property, classmethod or staticmethod wraps (the getter for properties), None for other descriptors.
+	"""
+	if isinstance(descriptor, property):
+		function = descriptor.fget
+	elif isinstance(descriptor, cached_property):
+		function = descriptor.func
+	elif isinstance(descriptor, (classmethod, staticmethod)):
+		function = descriptor.__func__
+	else:
+		return None
+
+	return function if isinstance(function, FunctionType) else None
+
+def get_static_attribute(object_: object, name: str, default=None):
+	"""Returns the attribute name of object_ without running Python code, like inspect.getattr_static
+	but resolving the descriptors implemented in C (e.g.: __doc__ of properties or __module__ of functions), which don't run Python code.
+	"""
+	value = inspect.getattr_static(object_, name, default)
+
+	if type(value) in (MemberDescriptorType, GetSetDescriptorType):
+		try:
+			return value.__get__(object_, type(object_))
+		except AttributeError: # Empty slot
+			return default
+		except TypeError: # Descriptor of the instances found in a class (e.g.: a slot), the class attribute is the descriptor itself
+			return value
+
+	return value
+
+def get_static_docstring(object_: object):
+	docstring = get_static_attribute(object_, "__doc__")
+
+	return docstring if isinstance(docstring, str) else None
@@ -0,0 +1,145 @@
+"""Member filter policy used by inspect_object and static_inspect to decide which members to include.
+The policy is compiled once (patterns to regular expressions, allowlists to sets) and reused for every member.
+"""
+import os
+import re
+import fnmatch
+import PREFS
+
+DUNDER_METHODS_PATH = "dunder_methods.prefs"
+MEMBER_FILTER_PATH = "member_filter.prefs"
+
+# (dunder_methods_path, member_filter_path) -> ((dunder_methods_mtime, member_filter_mtime), MemberFilter)
+_compiled_member_filters = {}
+
+
+class MemberFilter:
+	"""Compiled member filter policy.
+	Arguments:
+		dunder_methods: {type name: dunder methods to include}, e.g.: {"type": ("__init__",)} includes __init__ in classes.
+		include: fnmatch patterns, if not empty only members matching one of them are included.
+		exclude: fnmatch patterns, members matching one of them are excluded.
+		skip_private: exclude members starting with an underscore (dunder methods are handled by dunder_methods).
+		all_only: for modules that define __all__ only include the members listed in it.
+	Notes:
+		Patterns without a dot are matched against the member name, patterns with a dot against the qualified name,
+		e.g.: "_*" excludes all members starting with underscore while "example.Person.*" excludes all the members of Person.
+	"""
+	def __init__(self, dunder_methods: dict=None, include: (tuple, list)=(), exclude: (tuple, list)=(), skip_private: bool=False, all_only: bool=False):
+		if dunder_methods is None:
+			dunder_methods = {}
+
+		# A single method in the prefs file is read as a string, e.g.: type=("__init__") -> "__init__"
+		self.dunder_methods = {
+			type_name: frozenset((methods,) if isinstance(methods, str) else methods)
+			for type_name, methods in dunder_methods.items()
+		}
+
+		self.include = tuple(include)
+		self.exclude = tuple(exclude)
+		self.skip_private = skip_private
+		self.all_only = all_only
+
+		self.include_name_regex, self.include_qualname_regex = compile_patterns(self.include)
+		self.exclude_name_regex, self.exclude_qualname_regex = compile_patterns(self.exclude)
+
+	@property
+	def key(self) -> tuple:
+		"""Hashable representation of the policy, two filters with the same key filter the same members.
+		"""
+		return (
+			tuple(sorted((type_name, tuple(sorted(methods))) for type_name, methods in self.dunder_methods.items())),
+			self.include,
+			self.exclude,
+			self.skip_private,
+			self.all_only
+		)
+
+	def __repr__(self):
+		return f"MemberFilter(include={self.include}, exclude={self.exclude}, skip_private={self.skip_private}, all_only={self.all_only})"
+
+	def get_module_all(self, module_vars: dict):
+		"""Returns the names a module exports if all_only and the module defines __all__, None otherwise.
+		"""
+		if not self.all_only or not isinstance(module_vars.get("__all__"), (tuple, list)):
+			return None
+
+		return frozenset(module_vars["__all__"])
+
+	def filter_name(self, member_name: str, owner_type_name: str, qualname: str=None) -> bool:
+		"""Only using the name of the member (no need of the member itself) returns True if it should be included.
+		owner_type_name is the name of the type of the object that has the member, e.g.: "module", "type" (class).
+		"""
+		if member_name.startswith("__") and member_name.endswith("__"):
+			if member_name not in self.dunder_methods.get(owner_type_name, ()):
+				return False
+
+		elif self.skip_private and member_name.startswith("_"):
+			return False
+
+		if qualname is None:
+			qualname = member_name
+
+		if self.exclude and (
+			(self.exclude_name_regex is not None and self.exclude_name_regex.match(member_name)) or
+			(self.exclude_qualname_regex is not None and self.exclude_qualname_regex.match(qualname))
+		):
+			return False
+
+		if self.include and not (
+			(self.include_name_regex is not None and self.include_name_regex.match(member_name)) or
+			(self.include_qualname_regex is not None and self.include_qualname_regex.match(qualname))
+		):
+			return False
+
+		return True
+
+
+def compile_patterns(patterns: (tuple, list)):
+	"""Given fnmatch patterns returns two regular expressions (or None if there are no patterns):
+	one matching the patterns without a dot (member names) and another the patterns with a dot (qualified names).
+	"""
+	name_patterns = [fnmatch.translate(pattern) for pattern in patterns if not "." in pattern]
+	qualname_patterns = [fnmatch.translate(pattern) for pattern in patterns if "." in pattern]
+
+	name_regex = re.compile("|".join(name_patterns)) if name_patterns else None
+	qualname_regex = re.compile("|".join(qualname_patterns)) if qualname_patterns else None
+
+	return name_regex, qualname_regex
+
+def load_member_filter(dunder_methods_path: str=DUNDER_METHODS_PATH, member_filter_path: str=MEMBER_FILTER_PATH) -> MemberFilter:
+	"""Returns the MemberFilter defined by dunder_methods_path and member_filter_path files.
+	The files are only read (and the filter compiled) again if they were modified.
+	"""
+	mtimes = (get_mtime(dunder_methods_path), get_mtime(member_filter_path))
+	paths = (dunder_methods_path, member_filter_path)
+
+	if paths in _compiled_member_filters and _compiled_member_filters[paths][0] == mtimes:
+		return _compiled_member_filters[paths][1]
+
+	dunder_methods = PREFS.read_prefs_file(dunder_methods_path) if mtimes[0] is not None else {}
+	member_filter_prefs = PREFS.read_prefs_file(member_filter_path) if mtimes[1] is not None else {}
+
+	member_filter = MemberFilter(
+		dunder_methods,
+		include=as_tuple(member_filter_prefs.get("include", ())),
+		exclude=as_tuple(member_filter_prefs.get("exclude", ())),
+		skip_private=member_filter_prefs.get("skip_private", False),
+		all_only=member_filter_prefs.get("all_only", False)
+	)
+
+	_compiled_member_filters[paths] = mtimes, member_filter
+
+	return member_filter
+
+def get_mtime(path: str):
+	try:
+		return os.stat(path).st_mtime_ns
+	except OSError:
+		return None
+
+def as_tuple(value) -> tuple:
+	if isinstance(value, str): # ("pattern") in a prefs file is read as a string
+		return (value,)
+
+	return tuple(value)
@@ -0,0 +1,210 @@
+"""Functions to load (execute) Python modules from their path, and to unload them afterwards.
+This module doesn't depend on PyQt5 so it can be used by worker processes.
+Example:
+	previous_modules = set(sys.modules)
+	module, error = get_module_from_path("example.py")
+	...
+	del module
+	unload_modules(previous_modules) # Everything example.py imported
+	release_memory()
+"""
+import os
+import gc
+import sys
+import ctypes
+import typing
+import sysconfig
+import linecache
+from types import ModuleType, FunctionType, BuiltinFunctionType
+from importlib import import_module
+from importlib.machinery import EXTENSION_SUFFIXES
+from importlib.util import spec_from_file_location, module_from_spec
+from inspection_profiler import InspectionProfiler
+
+# Modules in these directories are never unloaded by unload_modules (unless directories is given), they may be imported lazily by PyAPIReference itself
+KEPT_DIRECTORIES = tuple(
+	os.path.join(os.path.realpath(directory), "")
+	for directory in {sysconfig.get_paths()["stdlib"], sysconfig.get_paths()["platstdlib"], os.path.dirname(os.path.abspath(__file__))}
+)
+
+# Third-party packages, inside the standard library directory in some layouts (e.g.: lib/python3.11/site-packages)
+SITE_DIRECTORIES = tuple(
+	os.path.join(os.path.realpath(directory), "")
+	for directory in {sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]}
+)
+
+def get_module_from_path(path: str, module_name: str=None, profiler: InspectionProfiler=None):
+	"""Given a path of a Python module, returns it. If some exception when executing the module returns None, error
+	module_name is the name the module is executed with, by default the filename without extension.
+	If it's a dotted name (e.g.: package.module) the module is registered in sys.modules so relative imports work,
+	and if it was already imported (e.g.: by its package) that module is returned without executing it again.
+	Its parent package is imported first, as the import system does (e.g.: its __init__ may import the module).
+	If profiler is given the time spent executing the module is recorded as the exec_module phase of module_name.
+	"""
+
+	filename = os.path.basename(path) # filename means only the filename without the path, e.g.: PyAPIReference/PyAPIReference/main.py -> main.py
+	filename_without_extension = os.path.splitext(filename)[0]
+
+	if module_name is None:
+		module_name = filename_without_extension
+
+	is_submodule = "." in module_name
+
+	if is_submodule:
+		import_parent_package(module_name)
+
+	if is_submodule and module_name in sys.modules:
+		module = sys.modules[module_name]
+		if os.path.realpath(getattr(module, "__file__", None) or "") == os.path.realpath(path):
+			return module, None
+
+	if filename_without_extension == "__init__":
+		spec = spec_from_file_location(module_name, path, submodule_search_locations=[os.path.dirname(path)])
+	else:
+		spec = spec_from_file_location(module_name, path)
+
+	module = module_from_spec(spec)
+
+	if is_submodule:
+		sys.modules[module_name] = module
+	
+	try:
+		if profiler is not None:
+			with profiler.measure(module_name, "exec_module"):
+				spec.loader.exec_module(module)
+		else:
+			spec.loader.exec_module(module)
+	except Exception as error:
+		if is_submodule:
+			sys.modules.pop(module_name, None)
+
+		exception_info = {}
+		exception_info["message"] = error.args[0] if len(error.args) > 0 else type(error).__name__ # E.g.: MemoryError()
+		exception_info["file"] = path
+		exception_info["line"] = sys.exc_info()[2].tb_lineno
+		
+		return None, exception_info
+
+	return module, None
+
+def import_parent_package(module_name: str) -> None:
+	"""Import the package of module_name (e.g.: package for package.module) if it wasn't imported yet.
+	If the package can't be imported it's ignored, the error is reported when the package itself is loaded.
+	"""
+	parent_name = module_name.rpartition(".")[0]
+
+	if parent_name in sys.modules:
+		return
+
+	try:
+		import_module(parent_name)
+	except Exception:
+		pass
+
+def unload_modules(previous_modules: set, directories: tuple=None) -> list:
+	"""Remove from sys.modules the modules imported after previous_modules (e.g.: set(sys.modules) before loading a module),
+	so they are freed once nothing else references them. Returns the names of the modules removed.
+	If directories is given only the modules whose file is inside any of them are removed, else all of them except
+	the standard library, PyAPIReference's own modules and the packages with extension modules (e.g.: numpy),
+	which can't be unloaded and may fail if they are imported again (see get_kept_packages).
+	"""
+	if directories is not None:
+		directories = tuple(os.path.join(os.path.realpath(directory), "") for directory in directories)
+
+	new_modules = {module_name: module for module_name, module in tuple(sys.modules.items()) if module_name not in previous_modules}
+	kept_packages = get_kept_packages(new_modules) if directories is None else set()
+	removed = []
+
+	for module_name, module in new_modules.items():
+		if directories is not None:
+			path = getattr(module, "__file__", None)
+			if not isinstance(path, str) or not os.path.realpath(path).startswith(directories):
+				continue
+		elif module_name.partition(".")[0] in kept_packages:
+			continue
+
+		if sys.modules.get(module_name) is module:
+			del sys.modules[module_name]
+			removed.append(module_name)
+
+	return removed
+
+def get_module_files(previous_modules: set, directories: tuple=()) -> list:
+	"""Returns the source files of the modules imported after previous_modules and of the ones inside any of directories,
+	except the standard library and PyAPIReference's own modules. E.g.: the files the tree of a module depends on (see inspection_cache.py).
+	"""
+	directories = tuple(os.path.join(os.path.realpath(directory), "") for directory in directories)
+	files = set()
+
+	for module_name, module in tuple(sys.modules.items()):
+		path = getattr(module, "__file__", None)
+		if not isinstance(path, str):
+			continue
+
+		path = os.path.realpath(path)
+		if path.startswith(KEPT_DIRECTORIES) and not path.startswith(SITE_DIRECTORIES):
+			continue
+
+		if module_name not in previous_modules or path.startswith(directories):
+			files.add(path)
+
+	return sorted(files)
+
+def get_kept_packages(new_modules: dict) -> set:
+	"""Returns the top-level names of the packages in new_modules ({module_name: module}) that must stay imported:
+	the ones with modules that can't be unloaded and the ones they reference (e.g.: the dateutil classes pandas uses),
+	else the next load would import a second copy of them.
+	"""
+	modules_by_package = {}
+	for module_name, module in new_modules.items():
+		modules_by_package.setdefault(module_name.partition(".")[0], []).append(module)
+
+	kept = {package for package, modules in modules_by_package.items() if not all(can_unload_module(module) for module in modules)}
+	pending = list(kept)
+
+	while len(pending) > 0:
+		for module in modules_by_package[pending.pop()]:
+			for value in tuple(getattr(module, "__dict__", {}).values()):
+				if isinstance(value, ModuleType):
+					module_name = value.__name__
+				elif isinstance(value, (type, FunctionType, BuiltinFunctionType)):
+					module_name = value.__module__
+				else:
+					module_name = type(value).__module__
+
+				package = module_name.partition(".")[0] if type(module_name) is str else None
+
+				if package in modules_by_package and package not in kept:
+					kept.add(package)
+					pending.append(package)
+
+	return kept
+
+def can_unload_module(module) -> bool:
+	path = getattr(module, "__file__", None)
+
+	if not isinstance(path, str):
+		return hasattr(module, "__path__") # Namespace packages, the rest are builtin or frozen
+
+	if path.endswith(tuple(EXTENSION_SUFFIXES)):
+		return False
+
+	path = os.path.realpath(path)
+	return not path.startswith(KEPT_DIRECTORIES) or path.startswith(SITE_DIRECTORIES)
+
+def release_memory() -> None:
+	"""Collect the objects freed by unloading a module (e.g.: reference cycles between its classes and functions),
+	forget the source lines cached by inspect and the generics cached by typing (e.g.: List[ModuleClass] keeps the module alive)
+	and return the freed memory to the system where it's possible (glibc).
+	"""
+	linecache.clearcache()
+
+	for clear_cache in getattr(typing, "_cleanups", ()): # The caches of typing's subscriptions, what typing's own tests clear
+		clear_cache()
+
+	gc.collect()
+
+	try:
+		ctypes.CDLL(None).malloc_trim(0)
+	except (OSError, AttributeError, TypeError): # Not glibc (e.g.: macOS, musl or Windows)
+		pass
@@ -0,0 +1,92 @@
+"""Find the module a member belongs to (where it was defined), used to drop the members a module imports.
+Gives the same answer as inspect.getmodule(member) without its slow paths: for objects without __module__
+inspect.getmodule tries to get their source file (raising and catching TypeError for values like ints or strings)
+and scans every module in sys.modules, here those objects are known not to have a file and the files are indexed once.
+Example:
+	resolver = OwnershipResolver()
+	print(resolver.get_module_name(sleep), resolver.get_module_name(BLACK))
+	>>> time None
+"""
+import os
+import sys
+from types import ModuleType, CodeType, FrameType, TracebackType
+from member_descriptors import get_static_attribute
+
+
+class OwnershipResolver:
+	"""Resolves the module name of members.
+	If static_attributes __module__ is read with get_static_attribute (see member_descriptors.py), e.g.: a lazy proxy may load its target to answer it.
+	Attributes:
+		cache: {id(member): (member, module name or None)} of the members resolved by their file,
+		the member is kept so its id is not reused by another object (reading __module__ is cheaper than the cache, so it's not cached).
+		modules_by_file: {absolute path: module name} of the modules in sys.modules, built the first time it's needed.
+	"""
+	def __init__(self, static_attributes: bool=False):
+		self.static_attributes = static_attributes
+		self.cache = {}
+		self.modules_by_file = None
+		self.indexed_modules = 0 # len(sys.modules) when modules_by_file was built
+
+	def get_module_name(self, member: object):
+		"""Returns the name of the module member belongs to, or None if it's unknown (same cases as inspect.getmodule returning None).
+		"""
+		if issubclass(type(member), ModuleType):
+			return member.__name__
+
+		# Classes, functions and instances of classes have __module__, it's what inspect.getmodule checks first
+		# (getattr with a default instead of catching AttributeError, as raising it for every int or string is slow)
+		if self.static_attributes:
+			module_name = get_static_attribute(member, "__module__")
+		else:
+			module_name = getattr(member, "__module__", None)
+
+		if module_name is not None:
+			if type(module_name) is str and module_name in sys.modules:
+				return sys.modules[module_name].__name__
+
+			return None
+
+		# Without __module__ only code objects, frames and tracebacks have a source file (see inspect.getfile)
+		filename = get_filename(member)
+		if filename is None:
+			return None
+
+		member_id = id(member)
+		if member_id not in self.cache:
+			self.cache[member_id] = member, self.get_module_by_file(filename)
+
+		return self.cache[member_id][1]
+
+	def get_module_by_file(self, filename: str):
+		if self.modules_by_file is None or (filename not in self.modules_by_file and len(sys.modules) != self.indexed_modules):
+			self.index_modules()
+
+		return self.modules_by_file.get(filename)
+
+	def index_modules(self) -> None:
+		self.modules_by_file = {}
+		self.indexed_modules = len(sys.modules)
+
+		for module_name, module in sys.modules.copy().items():
+			module_file = getattr(module, "__file__", None)
+
+			if isinstance(module_file, str):
+				self.modules_by_file[normalize_path(module_file)] = module_name
+
+
+def get_filename(member: object):
+	"""Returns the absolute path of the file where member (a code object, frame or traceback) was defined, None for other objects.
+	"""
+	if isinstance(member, TracebackType):
+		member = member.tb_frame
+
+	if isinstance(member, FrameType):
+		member = member.f_code
+
+	if isinstance(member, CodeType):
+		return normalize_path(member.co_filename)
+
+	return None
+
+def normalize_path(path: str) -> str:
+	return os.path.normcase(os.path.abspath(path))
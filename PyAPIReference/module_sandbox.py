@@ -0,0 +1,536 @@
+"""Execute and inspect modules in a child process with resource limits, so a module that allocates too much memory,
+never ends, calls sys.exit or crashes the interpreter only fails its own load instead of taking PyAPIReference down with it.
+Each Sandbox is a new process that runs a single function and sends back its result (e.g.: the tree of the module, through shared memory),
+if the process doesn't return a result the reason is reported as a message.
+Example:
+	limits = SandboxLimits(cpu_time=30, memory=2 * 1024 ** 3, timeout=60)
+	tree, error = inspect_path_sandboxed("example.py", limits=limits)
+	print(error)
+	>>> {"message": "Exceeded the memory limit (2048 MiB)", "file": "example.py", "line": None}
+Notes:
+	cpu_time and memory use resource.setrlimit (RLIMIT_CPU and RLIMIT_AS), not available on Windows (only the timeout is applied there)
+	and RLIMIT_AS is not enforced on macOS.
+"""
+import os
+import sys
+import time
+import signal
+import multiprocessing
+import multiprocessing.connection
+
+try:
+	import resource
+except ImportError: # Windows
+	resource = None
+
+from module_loader import get_module_from_path, get_module_files
+from inspect_object import inspect_object, InspectEngines
+from static_inspect import static_inspect_path
+from member_filter import MemberFilter, load_member_filter
+from value_renderer import ValueRenderer
+from inspection_profiler import InspectionProfiler
+from inspection_budget import InspectionBudget, CancellationToken, CANCELLED
+from tree_nodes import compact_tree
+from shared_tree import SharedTree, SHARED_MEMORY_AVAILABLE, get_shared_memory_name, should_share_tree, write_shared_tree, read_shared_tree, remove_shared_tree
+
+POLL_INTERVAL = 0.1 # Seconds between the checks of the timeouts and the budget while waiting for the sandboxes
+CANCEL_GRACE = 2 # Seconds a cancelled sandbox has to return the members inspected so far before it's killed
+CPU_TIME_GRACE = 5 # Seconds of CPU time after cpu_time until the process is killed, if the module ignores CpuTimeExceeded
+
+# Nested members of a tree sent as dicts, pickle is recursive so deeper trees are sent compact (flat columns, see tree_nodes.py)
+PICKLE_MAX_DEPTH = 100
+
+# Modules imported by the forkserver process, so each sandbox starts with them already imported
+SANDBOX_PRELOAD = ["module_sandbox"]
+
+# The first item of the messages sent by the sandbox
+RESULT = "result"
+ERROR = "error"
+
+
+class SandboxLimits:
+	"""Resources each sandbox can use, None for no limit.
+	Arguments:
+		cpu_time: seconds of CPU time.
+		memory: bytes the address space of the process can grow.
+		timeout: seconds (wall time) until the process is killed, including executing the module.
+	"""
+	def __init__(self, cpu_time: float=None, memory: int=None, timeout: float=None):
+		self.cpu_time = cpu_time
+		self.memory = memory
+		self.timeout = timeout
+
+	def __repr__(self):
+		return f"SandboxLimits(cpu_time={self.cpu_time}, memory={self.memory}, timeout={self.timeout})"
+
+
+class CpuTimeExceeded(BaseException):
+	"""Raised in the sandbox when it exceeds cpu_time, it's a BaseException so the module can't catch it with except Exception.
+	"""
+
+
+class Sandbox:
+	"""Child process that runs function(*args, token), where token is a CancellationToken set by cancel.
+	Example:
+		sandbox = Sandbox(inspect_module_job, (...), SandboxLimits(timeout=10))
+		result, error = sandbox.run()
+	Attributes:
+		result: what function returned, None if it didn't return.
+		error: message of why the process didn't return a result (e.g.: "Exceeded the time limit (10 seconds)"), else None.
+	Notes:
+		function and args must be picklable, and function importable from the sandbox (a module level function).
+		To run many sandboxes at the same time start them and call poll until they are finished (see wait_sandboxes).
+	"""
+	def __init__(self, function: callable, args: tuple=(), limits: SandboxLimits=None, sys_path_entries: tuple=()):
+		self.function = function
+		self.args = args
+		self.limits = SandboxLimits() if limits is None else limits
+		self.sys_path_entries = tuple(sys_path_entries)
+
+		self.process = None
+		self.connection = None
+		self.cancel_event = None
+		self.started_at = None
+		self.cancelled_at = None
+		self.finished = False
+
+		self.result = None
+		self.error = None
+
+	def start(self) -> None:
+		context = get_process_context()
+
+		self.cancel_event = context.Event()
+		receiver, sender = context.Pipe(duplex=False)
+
+		self.process = context.Process(
+			target=sandbox_main,
+			args=(sender, self.function, self.args, self.limits, self.sys_path_entries, self.cancel_event),
+			daemon=True
+		)
+		self.process.start()
+		sender.close() # Only the sandbox writes, so reading gives EOFError if it dies
+
+		self.connection = receiver
+		self.started_at = time.monotonic()
+
+	def get_wait_objects(self) -> list:
+		"""Returns the objects that are ready (see multiprocessing.connection.wait) when the sandbox sends its result or exits.
+		"""
+		return [self.connection, self.process.sentinel]
+
+	def cancel(self) -> None:
+		"""Ask function to stop (it has CANCEL_GRACE seconds to return) by setting its token.
+		"""
+		if self.finished or self.cancelled_at is not None:
+			return
+
+		self.cancel_event.set()
+		self.cancelled_at = time.monotonic()
+
+	def poll(self) -> bool:
+		"""Collects the result if it was sent and kills the process if it exceeded the timeout or the cancel grace.
+		Returns True once the sandbox is finished.
+		"""
+		if self.finished:
+			return True
+
+		if self.connection.poll():
+			self.receive()
+			return True
+
+		if not self.process.is_alive():
+			if self.connection.poll(): # It sent the result right before exiting
+				self.receive()
+			else:
+				self.finish(None, self.get_exit_reason())
+
+			return True
+
+		now = time.monotonic()
+
+		if self.limits.timeout is not None and now - self.started_at > self.limits.timeout:
+			self.kill(f"Exceeded the time limit ({self.limits.timeout} seconds)")
+		elif self.cancelled_at is not None and now - self.cancelled_at > CANCEL_GRACE:
+			self.kill("Cancelled")
+
+		return self.finished
+
+	def receive(self) -> None:
+		try:
+			status, value = self.connection.recv()
+		except (EOFError, OSError): # The process exited without sending a result
+			self.finish(None, self.get_exit_reason())
+		else:
+			if status == RESULT:
+				self.finish(value, None)
+			else:
+				self.finish(None, value)
+
+	def run(self, token: CancellationToken=None) -> tuple:
+		"""Start the sandbox (if not started) and wait until it's finished. Returns result, error.
+		If token is cancelled the sandbox is cancelled.
+		"""
+		if self.process is None:
+			self.start()
+
+		while not self.poll():
+			multiprocessing.connection.wait(self.get_wait_objects(), timeout=POLL_INTERVAL)
+
+			if token is not None and token.cancelled:
+				self.cancel()
+
+		return self.result, self.error
+
+	def kill(self, reason: str) -> None:
+		if self.finished:
+			return
+
+		self.process.kill()
+		self.finish(None, reason)
+
+	def finish(self, result, error: str) -> None:
+		self.result = result
+		self.error = error
+		self.finished = True
+
+		self.process.join(CANCEL_GRACE) # It exits right after sending the result
+		if self.process.is_alive():
+			self.process.kill()
+			self.process.join()
+
+		self.connection.close()
+
+	def get_exit_reason(self) -> str:
+		self.process.join()
+		return describe_exit_code(self.process.exitcode, self.limits)
+
+
+def sandbox_main(connection, function: callable, args: tuple, limits: SandboxLimits, sys_path_entries: tuple, cancel_event) -> None:
+	"""Entry point of the sandbox process, sends (RESULT, what function returned) or (ERROR, message) through connection.
+	"""
+	sys.path[:0] = sys_path_entries
+
+	apply_limits(limits)
+	status, value = run_job(function, args, limits, CancellationToken(cancel_event))
+	send_message(connection, status, value, limits)
+	connection.close()
+
+	try:
+		sys.stdout.flush()
+		sys.stderr.flush()
+	finally:
+		os._exit(0) # Don't wait for the threads the module started or run its atexit handlers
+
+def run_job(function: callable, args: tuple, limits: SandboxLimits, token: CancellationToken) -> tuple:
+	"""Returns (RESULT, function(*args, token)) or (ERROR, message) if it raised (e.g.: it exceeded limits).
+	"""
+	try:
+		return RESULT, function(*args, token)
+	except SystemExit as error:
+		return ERROR, f"Called sys.exit({error.code!r})"
+	except CpuTimeExceeded:
+		return ERROR, f"Exceeded the CPU time limit ({limits.cpu_time} seconds)"
+	except MemoryError:
+		return ERROR, get_memory_error_message(limits)
+	except BaseException as error:
+		return ERROR, f"{type(error).__name__}: {error}"
+
+def send_message(connection, status: str, value, limits: SandboxLimits, job_id: int=None) -> bool:
+	"""Send (status, value), or (status, job_id, value) if job_id is given (the messages of the workers, see inspection_worker.py).
+	If it can't be sent (e.g.: value can't be pickled) the error is sent instead, returns False then.
+	"""
+	try:
+		connection.send((status, value) if job_id is None else (status, job_id, value))
+		return True
+	except MemoryError:
+		message = get_memory_error_message(limits)
+	except Exception as error: # E.g.: RecursionError, a tree too deep to pickle
+		message = f"Couldn't send the result, {type(error).__name__}: {error}"
+
+	connection.send((ERROR, message) if job_id is None else (ERROR, job_id, message))
+	return False
+
+def apply_limits(limits: SandboxLimits, kill: bool=True) -> list:
+	"""Limit the CPU time and the memory of the current process (see SandboxLimits), if resource is available.
+	If kill the process is killed CPU_TIME_GRACE seconds after exceeding cpu_time (the hard limit can't be raised again),
+	else only CpuTimeExceeded is raised (e.g.: in a worker that runs more jobs, see inspection_worker.py).
+	Returns the previous limits, to restore them with restore_limits.
+	"""
+	previous_limits = []
+
+	if resource is None:
+		return previous_limits
+
+	if limits.cpu_time is not None:
+		signal.signal(signal.SIGXCPU, raise_cpu_time_exceeded)
+
+		usage = resource.getrusage(resource.RUSAGE_SELF)
+		cpu_time = max(round(usage.ru_utime + usage.ru_stime + limits.cpu_time), 1) # Whole seconds, the time already used counts
+
+		# SIGXCPU (CpuTimeExceeded) at the soft limit and SIGKILL at the hard limit
+		previous_limits.append((resource.RLIMIT_CPU, resource.getrlimit(resource.RLIMIT_CPU)))
+		set_resource_limit(resource.RLIMIT_CPU, cpu_time, cpu_time + CPU_TIME_GRACE if kill else None)
+
+	if limits.memory is not None:
+		previous_limits.append((resource.RLIMIT_AS, resource.getrlimit(resource.RLIMIT_AS)))
+		set_resource_limit(resource.RLIMIT_AS, get_address_space() + limits.memory)
+
+	return previous_limits
+
+def restore_limits(previous_limits: list) -> None:
+	for resource_id, (soft, hard) in previous_limits:
+		set_resource_limit(resource_id, soft, hard)
+
+def set_resource_limit(resource_id: int, soft: int, hard: int=None) -> None:
+	"""Set the soft (and hard) limit of resource_id without exceeding its current hard limit, ignored if it can't be set.
+	"""
+	current_hard = resource.getrlimit(resource_id)[1]
+
+	if hard is None:
+		hard = current_hard
+
+	if current_hard != resource.RLIM_INFINITY:
+		soft = min(soft, current_hard)
+		hard = min(hard, current_hard)
+
+	try:
+		resource.setrlimit(resource_id, (soft, hard))
+	except (ValueError, OSError): # E.g.: RLIMIT_AS on macOS
+		pass
+
+def raise_cpu_time_exceeded(signal_number, frame):
+	raise CpuTimeExceeded()
+
+def get_address_space() -> int:
+	"""Returns the size of the address space (virtual memory) of the process in bytes, 0 if it's unknown.
+	"""
+	try:
+		with open("/proc/self/statm") as file:
+			return int(file.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, IndexError, AttributeError):
+		return 0
+
+def get_memory_error_message(limits: SandboxLimits) -> str:
+	if limits.memory is None:
+		return "Ran out of memory"
+
+	return f"Exceeded the memory limit ({limits.memory // 1024 ** 2} MiB)"
+
+def describe_exit_code(exitcode: int, limits: SandboxLimits) -> str:
+	"""Returns why a sandbox that didn't send a result exited, given its exit code (negative if it was killed by a signal).
+	"""
+	if exitcode is None or exitcode >= 0:
+		return f"The process exited with code {exitcode} without returning a result (e.g.: os._exit)"
+
+	signal_number = -exitcode
+
+	if hasattr(signal, "SIGXCPU") and signal_number == signal.SIGXCPU:
+		return f"Exceeded the CPU time limit ({limits.cpu_time} seconds)"
+
+	try:
+		signal_name = signal.Signals(signal_number).name
+	except ValueError:
+		signal_name = f"signal {signal_number}"
+
+	if signal_number == getattr(signal, "SIGKILL", None):
+		if limits.cpu_time is not None:
+			return f"The process was killed ({signal_name}), it exceeded the CPU time limit ({limits.cpu_time} seconds) or ran out of memory"
+
+		return f"The process was killed ({signal_name}), probably it ran out of memory"
+
+	return f"The process crashed ({signal_name})"
+
+def describe_module_error(error: dict, limits: SandboxLimits) -> dict:
+	"""Given the error of get_module_from_path in a sandbox, returns it with a clearer message if the module exceeded the memory limit.
+	"""
+	if error["message"] == MemoryError.__name__:
+		return {**error, "message": get_memory_error_message(limits)}
+
+	return error
+
+def get_process_context():
+	"""Returns the multiprocessing context used to start the sandboxes.
+	"""
+	# Forking a process with threads (like the GUI) is not safe, use forkserver when available
+	if "forkserver" in multiprocessing.get_all_start_methods():
+		context = multiprocessing.get_context("forkserver")
+		context.set_forkserver_preload(SANDBOX_PRELOAD) # Only used when the forkserver is started (the first time)
+		return context
+
+	return multiprocessing.get_context("spawn")
+
+def wait_sandboxes(sandboxes: list, timeout: float=POLL_INTERVAL) -> list:
+	"""Wait until any of sandboxes is finished or timeout, returns the ones finished.
+	"""
+	multiprocessing.connection.wait([wait_object for sandbox in sandboxes for wait_object in sandbox.get_wait_objects()], timeout=timeout)
+
+	return [sandbox for sandbox in sandboxes if sandbox.poll()]
+
+def create_sandbox(function: callable, args: tuple, limits: SandboxLimits, pool=None, sys_path_entries: tuple=(), project_directories: tuple=()):
+	"""Returns a Sandbox that runs function(*args, token), or a job of pool (a WorkerPool, see worker_pool.py) if given.
+	project_directories are the directories of the modules the job executes, only used by the workers of pool (see inspection_worker.py).
+	"""
+	if pool is not None:
+		return pool.create_job(function, args, limits, sys_path_entries, project_directories)
+
+	return Sandbox(function, args, limits, sys_path_entries)
+
+def get_deadline(budget: InspectionBudget):
+	"""Returns the time.time() when the time limit of budget (started) ends, the same in every process. None if there's no time limit.
+	"""
+	if budget is None or budget.time_limit is None:
+		return None
+
+	return time.time() + budget.time_limit - budget.get_elapsed()
+
+def inspect_module_job(module_name: str, path: str, engine: InspectEngines, member_filter: MemberFilter, value_renderer: ValueRenderer, profile: bool=False, trace_memory: bool=False, static_attributes: bool=False, time_limit: float=None, deadline: float=None, memory_limit: int=None, shared_memory_name: str=None, token: CancellationToken=None):
+	"""Run in the sandboxes, load and inspect a single module. Returns module_content, error, profile_records
+	(the records of an InspectionProfiler if profile, else None), dependencies (the files of the modules it imported, see inspection_cache.py)
+	and exceeded (why its budget stopped the inspection, see InspectionBudget.merge, None if it's complete).
+	The module is inspected with an InspectionBudget with time_limit (seconds inspecting, not executing the module),
+	deadline (time.time() the inspection must end), memory_limit and token, if any of them is given.
+	If shared_memory_name is given and module_content is big enough it's written into shared memory and a SharedTree is returned instead,
+	see read_module_content and shared_tree.py.
+	A module_content deeper than PICKLE_MAX_DEPTH is returned as a compact tree, pickling its dicts would exceed the recursion limit.
+	"""
+	profiler = InspectionProfiler(trace_memory) if profile else None
+	dependencies = []
+	budget = None
+
+	if profiler is not None:
+		profiler.start()
+
+	try:
+		if engine == InspectEngines.STATIC:
+			module_content, error = static_inspect_path(path, member_filter, value_renderer)
+		else:
+			previous_modules = set(sys.modules)
+			module, error = get_module_from_path(path, module_name, profiler)
+
+			if deadline is not None:
+				time_limit = min(max(deadline - time.time(), 0), time_limit if time_limit is not None else float("inf"))
+
+			if time_limit is not None or memory_limit is not None or token is not None:
+				budget = InspectionBudget(time_limit, memory_limit, token)
+
+			module_content = inspect_object(module, member_filter, value_renderer=value_renderer, profiler=profiler, static_attributes=static_attributes, budget=budget) if error is None else None
+			dependencies = get_module_files(previous_modules, (os.path.dirname(os.path.abspath(path)),))
+	finally:
+		if profiler is not None:
+			profiler.stop()
+
+	profile_records = profiler.records if profiler is not None else None
+	exceeded = budget.exceeded if budget is not None else None
+
+	if module_content is None:
+		return None, error, profile_records, dependencies, exceeded
+
+	if shared_memory_name is not None and should_share_tree(module_content):
+		return write_shared_tree(module_content, shared_memory_name), None, profile_records, dependencies, exceeded
+
+	if is_deeper_than(module_content, PICKLE_MAX_DEPTH):
+		module_content = compact_tree(module_content)
+
+	# The root of the tree is named after the filename, use the last part of the module name instead (__init__ -> package)
+	return tuple(module_content.values())[0], None, profile_records, dependencies, exceeded
+
+def is_deeper_than(tree: dict, max_depth: int) -> bool:
+	"""Returns True if tree has members nested more than max_depth levels, only walks until then.
+	"""
+	stack = [(tree, 0)]
+
+	while len(stack) > 0:
+		members, depth = stack.pop()
+
+		if depth > max_depth:
+			return True
+
+		for properties in members.values():
+			if isinstance(properties.get("content"), dict):
+				stack.append((properties["content"], depth + 1))
+
+	return False
+
+def is_module_job_result(result) -> bool:
+	"""Returns True if result has the shape of what inspect_module_job returns, checked before unpacking it.
+	"""
+	return isinstance(result, tuple) and len(result) == 5
+
+def read_module_content(module_content):
+	"""Returns the module_content returned by inspect_module_job, read from shared memory if it's a SharedTree.
+	"""
+	if isinstance(module_content, SharedTree):
+		return tuple(read_shared_tree(module_content).values())[0]
+
+	return module_content
+
+def inspect_path_sandboxed(path: str, engine: InspectEngines=InspectEngines.RUNTIME, member_filter: MemberFilter=None, value_renderer: ValueRenderer=None, static_attributes: bool=False, limits: SandboxLimits=None, profiler: InspectionProfiler=None, budget: InspectionBudget=None, pool=None, dependencies: list=None):
+	"""Given the path of a Python module, load and inspect it in a Sandbox, or in a worker of pool if given (a WorkerPool, see worker_pool.py).
+	Returns module_content, error like get_module_from_path and inspect_object, where error has the reason if the sandbox failed.
+	If profiler is given the sandbox profiles the module and the records are merged into it.
+	If dependencies is given the files of the modules the module imported are added to it (see inspection_cache.py).
+	The budget is applied in the sandbox, which returns the members inspected so far once it's exceeded (see inspection_budget.py),
+	if it's cancelled and the sandbox doesn't return in CANCEL_GRACE seconds (e.g.: it's executing the module) it's killed.
+	"""
+	if member_filter is None:
+		member_filter = load_member_filter()
+
+	if value_renderer is None:
+		value_renderer = ValueRenderer()
+
+	if limits is None:
+		limits = SandboxLimits()
+
+	module_name = os.path.splitext(os.path.basename(path))[0]
+	profile = profiler is not None
+
+	time_limit = budget.time_limit if budget is not None else None
+	memory_limit = budget.memory_limit if budget is not None else None
+
+	shared_memory_name = get_shared_memory_name() if SHARED_MEMORY_AVAILABLE else None
+
+	job_arguments = (module_name, path, engine, member_filter, value_renderer, profile, profile and profiler.trace_memory, static_attributes, time_limit, None, memory_limit, shared_memory_name)
+	sandbox = create_sandbox(inspect_module_job, job_arguments, limits, pool, project_directories=(os.path.dirname(os.path.abspath(path)),))
+	result, sandbox_error = sandbox.run(budget.token if budget is not None else None)
+
+	if sandbox_error is not None and budget is not None and budget.token is not None and budget.token.cancelled:
+		budget.exceeded = CANCELLED
+
+	if sandbox_error is not None:
+		remove_shared_tree(shared_memory_name) # In case it was killed after writing the tree
+		return None, {"message": sandbox_error, "file": path, "line": None}
+
+	if not is_module_job_result(result):
+		return None, {"message": f"The sandbox returned an unexpected result ({type(result).__name__})", "file": path, "line": None}
+
+	module_content, error, profile_records, module_dependencies, exceeded = result
+	module_content = read_module_content(module_content)
+
+	if profile_records is not None:
+		profiler.merge(profile_records)
+
+	if dependencies is not None:
+		dependencies.extend(module_dependencies)
+
+	if error is not None:
+		return None, describe_module_error(error, limits)
+
+	if budget is not None:
+		budget.merge(exceeded)
+
+	return {module_name: module_content}, None
+
+def render_full_value_job(path: str, member_path: tuple, token: CancellationToken=None) -> str:
+	"""Run in a sandbox, load the module at path and returns the full value of member_path (module name, member name, nested member name...)
+	"""
+	module, error = get_module_from_path(path)
+
+	if error is not None:
+		raise RuntimeError(f"Couldn't load the module: {error['message']} (line {error['line']})")
+
+	member = module
+	for member_name in member_path[1:]:
+		member = getattr(member, member_name)
+
+	return ValueRenderer().render_full(member)
@@ -0,0 +1,230 @@
+"""Inspect all the modules of a package (or a directory) in parallel, each one in its own sandbox (see module_sandbox.py).
+Each module is loaded and inspected in a child process and the results are merged into a single package tree.
+"""
+import os
+from collections import deque
+
+from inspect_object import InspectEngines
+from member_filter import MemberFilter, load_member_filter
+from value_renderer import ValueRenderer
+from inspection_profiler import InspectionProfiler
+from inspection_budget import InspectionBudget, CANCELLED
+from module_sandbox import Sandbox, SandboxLimits, inspect_module_job, is_module_job_result, read_module_content, wait_sandboxes, describe_module_error, get_deadline, create_sandbox
+from shared_tree import SHARED_MEMORY_AVAILABLE, get_shared_memory_name, remove_shared_tree
+from worker_pool import WorkerPool, get_available_cores
+
+IGNORED_DIRECTORIES = ("__pycache__", "venv", ".venv", "node_modules")
+
+def inspect_package(directory: str, engine: InspectEngines=InspectEngines.RUNTIME, member_filter: MemberFilter=None, max_workers: int=None, value_renderer: ValueRenderer=None, profiler: InspectionProfiler=None, static_attributes: bool=False, budget: InspectionBudget=None, limits: SandboxLimits=None, pool: WorkerPool=None, dependencies: list=None):
+	"""Given the path of a package (or a directory with Python modules), inspect all its modules in parallel.
+	Returns the package tree and the errors of the modules that couldn't be inspected.
+	Example:
+		tree, errors = inspect_package("mypackage", limits=SandboxLimits(timeout=30))
+		print(tree)
+		>>> {"mypackage": {"type": "package", "docstring": ..., "content": {"module": {"type": "module", ...}}}}
+		print(errors)
+		>>> {"mypackage.broken": {"message": "No module named 'numpy'", "file": "mypackage/broken.py", "line": 1}, "mypackage.loop": {"message": "Exceeded the time limit (30 seconds)", ...}}
+	Notes:
+		max_workers (the sandboxes running at the same time) defaults to the number of cores available.
+		Each module runs in its own Sandbox with limits, a module that exceeds them or crashes its process (e.g.: os._exit) is reported with the reason.
+		If pool is given the modules run in its workers instead (see worker_pool.py), at most pool.size at the same time.
+		If profiler is given each sandbox profiles its module and the records are merged into it (see inspection_profiler.py).
+		If dependencies is given the files each module imported are added to it (see inspection_cache.py).
+		static_attributes is passed to inspect_object (see inspect_object.py).
+		If budget is given its time limit is a deadline for all the modules and its memory limit applies to each module (and to the results collected),
+		each module is inspected with an InspectionBudget with the time left (see inspection_budget.py).
+		Once it's exceeded (or cancelled) the modules not started are skipped and reported as errors, the ones being inspected return
+		the members inspected so far (if cancelled they are killed if they don't return in time) and the package gets the property truncated.
+	"""
+	if member_filter is None:
+		member_filter = load_member_filter()
+
+	if max_workers is None:
+		max_workers = get_available_cores()
+
+	if pool is not None:
+		max_workers = min(max_workers, pool.size)
+
+	if value_renderer is None:
+		value_renderer = ValueRenderer()
+
+	if limits is None:
+		limits = SandboxLimits()
+
+	directory = os.path.abspath(directory)
+	package_name = os.path.basename(directory)
+	modules = discover_modules(directory)
+
+	# If it's a package the parent directory is needed to import it, else the directory itself
+	if os.path.isfile(os.path.join(directory, "__init__.py")):
+		sys_path_entry = os.path.dirname(directory)
+	else:
+		sys_path_entry = directory
+
+	results = {}
+	errors = {}
+	profile = profiler is not None
+	trace_memory = profile and profiler.trace_memory
+
+	if budget is not None:
+		budget.start()
+
+	memory_limit = budget.memory_limit if budget is not None else None
+	job_arguments = (engine, member_filter, value_renderer, profile, trace_memory, static_attributes, None, get_deadline(budget), memory_limit)
+
+	def collect(module_name: str, path: str, shared_memory_name: str, sandbox: Sandbox):
+		if sandbox.error is not None:
+			remove_shared_tree(shared_memory_name)
+			errors[module_name] = {"message": sandbox.error, "file": path, "line": None}
+			return
+
+		if not is_module_job_result(sandbox.result):
+			errors[module_name] = {"message": f"The sandbox returned an unexpected result ({type(sandbox.result).__name__})", "file": path, "line": None}
+			return
+
+		module_content, error, profile_records, module_dependencies, exceeded = sandbox.result
+		module_content = read_module_content(module_content)
+
+		if profile_records is not None:
+			profiler.merge(profile_records)
+
+		if dependencies is not None:
+			dependencies.extend(module_dependencies)
+
+		if error is not None:
+			errors[module_name] = describe_module_error(error, limits)
+		else:
+			results[module_name] = module_content
+
+		# E.g.: the memory limit of the module was exceeded, the package is incomplete (and the modules not started are skipped)
+		if budget is not None:
+			budget.merge(exceeded)
+
+	# Each module sends its tree through its own shared memory block, see shared_tree.py
+	jobs = {}
+	for module_name, path in modules:
+		shared_memory_name = get_shared_memory_name() if SHARED_MEMORY_AVAILABLE else None
+		sandbox = create_sandbox(inspect_module_job, (module_name, path, *job_arguments, shared_memory_name), limits, pool, (sys_path_entry,), (directory,))
+		jobs[sandbox] = module_name, path, shared_memory_name
+
+	waiting = deque(jobs)
+	running = []
+
+	try:
+		while len(waiting) > 0 or len(running) > 0:
+			if budget is not None and budget.check() is not None:
+				for sandbox in waiting:
+					module_name, path, shared_memory_name = jobs[sandbox]
+					errors[module_name] = {"message": f"Not inspected, the inspection was stopped ({budget.exceeded})", "file": path, "line": None}
+
+				waiting.clear()
+
+				if budget.exceeded == CANCELLED:
+					for sandbox in running:
+						sandbox.cancel() # They return the members inspected so far
+
+			while len(waiting) > 0 and len(running) < max_workers:
+				sandbox = waiting.popleft()
+				sandbox.start()
+				running.append(sandbox)
+
+			if len(running) == 0:
+				continue
+
+			for sandbox in wait_sandboxes(running):
+				running.remove(sandbox)
+				collect(*jobs[sandbox], sandbox)
+	finally:
+		for sandbox in running: # Only if there was an exception
+			sandbox.kill("Not inspected, the inspection failed")
+			remove_shared_tree(jobs[sandbox][2])
+
+		if budget is not None:
+			budget.stop()
+
+	tree = merge_package_tree(package_name, modules, results)
+
+	if budget is not None and budget.exceeded is not None:
+		tree[package_name]["truncated"] = budget.exceeded
+
+	return tree, errors
+
+def discover_modules(directory: str) -> list:
+	"""Returns (module_name, path) of all the modules of a package or a directory, including subpackages.
+	The module of a package is its __init__.py, e.g.: ("package.subpackage", "package/subpackage/__init__.py").
+	"""
+	directory = os.path.abspath(directory)
+	is_package = os.path.isfile(os.path.join(directory, "__init__.py"))
+	root_parts = [os.path.basename(directory)] if is_package else []
+
+	result = []
+
+	for dirpath, dirnames, filenames in os.walk(directory):
+		# Only walk subpackages (directories with __init__.py)
+		dirnames[:] = sorted(
+			dirname for dirname in dirnames
+			if not dirname.startswith(".") and dirname not in IGNORED_DIRECTORIES
+			and os.path.isfile(os.path.join(dirpath, dirname, "__init__.py"))
+		)
+
+		relative_parts = os.path.relpath(dirpath, directory).split(os.sep)
+		package_parts = root_parts + [part for part in relative_parts if part != "."]
+
+		for filename in sorted(filenames):
+			if not filename.endswith(".py"):
+				continue
+
+			module_name = os.path.splitext(filename)[0]
+			if module_name == "__init__":
+				module_parts = package_parts
+			else:
+				module_parts = package_parts + [module_name]
+
+			if not module_parts: # __init__.py of a directory that is not a package
+				continue
+
+			result.append((".".join(module_parts), os.path.join(dirpath, filename)))
+
+	return result
+
+def merge_package_tree(package_name: str, modules: list, results: dict) -> dict:
+	"""Given the modules of a package and the result of each one returns a single tree,
+	where each module is in the content of its package.
+	"""
+	root = {"type": "package", "docstring": None, "content": {}}
+
+	def get_package_node(module_parts: list) -> dict:
+		node = root
+		for part in module_parts:
+			content = node.setdefault("content", {})
+			if part not in content:
+				content[part] = {"type": "package", "docstring": None, "content": {}}
+
+			node = content[part]
+
+		return node
+
+	for module_name, path in modules:
+		if module_name not in results:
+			continue
+
+		module_parts = module_name.split(".")
+		if module_parts[0] == package_name:
+			module_parts = module_parts[1:]
+
+		module_content = results[module_name]
+
+		if os.path.basename(path) == "__init__.py":
+			# The package node takes the members of __init__, keeping the submodules already added
+			package_node = get_package_node(module_parts)
+			submodules = package_node.get("content", {})
+
+			package_node.update(module_content)
+			package_node["type"] = "package"
+			package_node["content"] = {**module_content.get("content", {}), **submodules}
+			continue
+
+		parent_node = get_package_node(module_parts[:-1])
+		parent_node.setdefault("content", {})[module_parts[-1]] = module_content
+
+	return {package_name: root}
@@ -0,0 +1,335 @@
+"""Send the tree of a module from a sandbox or worker (see module_sandbox.py and worker_pool.py) to PyAPIReference through shared memory.
+Instead of pickling the tree (and unpickling every dictionary in the GUI process), the sandbox stores it in a TreeStore (see tree_nodes.py)
+and writes its columns into a shared memory block, PyAPIReference maps the block and reads it through a SharedTreeStore,
+the same views as a TreeStore, where each string is only decoded when it's accessed.
+Example:
+	name = get_shared_memory_name() # In PyAPIReference, passed to the sandbox
+	shared_tree = write_shared_tree(tree, name) # In the sandbox, shared_tree is sent instead of tree
+	tree = read_shared_tree(shared_tree) # In PyAPIReference, {root_name: NodeView}
+Notes:
+	Trees smaller than SHARED_TREE_MIN_NODES are faster to pickle, see should_share_tree.
+	Layout of the block: the header, the columns of the members and of the parameters (int32 ids of objects),
+	the kind of each object (uint8), the offset of each object (int64) and the encoded objects.
+	The objects are the strings (each one stored once), lists (the ids of their items) and anything else pickled,
+	the ids NONE and MISSING are None and a property the node doesn't have.
+	Not used on Windows, where the block is destroyed when the sandbox exits even if it wasn't read yet.
+"""
+import os
+import pickle
+import struct
+import secrets
+from array import array
+from collections.abc import Mapping, Sequence
+
+try:
+	from multiprocessing import shared_memory, resource_tracker
+except ImportError: # Python built without _posixshmem
+	shared_memory = None
+
+from tree_nodes import TreeStore, NodeView, MISSING
+
+SHARED_MEMORY_AVAILABLE = shared_memory is not None and os.name != "nt"
+
+# Smaller trees (members and parameters) are pickled, it's faster than writing them into shared memory
+SHARED_TREE_MIN_NODES = 2000
+
+FORMAT_MAGIC = b"PYAT"
+FORMAT_VERSION = 1
+
+# magic, version, members, parameters, objects, first root, roots
+HEADER = struct.Struct("=4sIqqqqq")
+
+MEMBER_COLUMNS = (
+	"names", "types", "docstrings", "inherits", "return_annotations", "values", "references", "truncated",
+	"content_first", "content_count", "parameters_first", "parameters_count"
+)
+PARAMETER_COLUMNS = ("parameter_names", "parameter_annotations", "parameter_defaults", "parameter_kinds")
+
+# Columns that store ids of objects (the rest store ids of strings or numbers)
+OBJECT_COLUMNS = {
+	"names", "docstrings", "inherits", "return_annotations", "values", "references", "truncated",
+	"parameter_names", "parameter_annotations", "parameter_defaults"
+}
+
+# Ids of the objects that are not stored
+NONE = -1
+MISSING_ID = -2
+
+# Kind of each object
+STRING = 0
+LIST = 1
+PICKLED = 2
+
+
+class SharedTree:
+	"""Sent by the sandbox instead of the tree, the name of the shared memory block where it's written, see read_shared_tree.
+	"""
+	def __init__(self, name: str):
+		self.name = name
+
+	def __repr__(self):
+		return f"SharedTree({self.name!r})"
+
+
+class ObjectTable(Sequence):
+	"""The objects of a block, decoded the first time each one is accessed.
+	"""
+	def __init__(self, kinds: memoryview, offsets: memoryview, data: memoryview):
+		self.kinds = kinds
+		self.offsets = offsets
+		self.data = data
+		self.decoded = {}
+
+	def __len__(self):
+		return len(self.kinds)
+
+	def __getitem__(self, object_id: int):
+		if object_id == NONE:
+			return None
+		elif object_id == MISSING_ID:
+			return MISSING
+
+		try:
+			return self.decoded[object_id]
+		except KeyError:
+			pass
+
+		data = self.data[self.offsets[object_id]:self.offsets[object_id + 1]]
+		kind = self.kinds[object_id]
+
+		if kind == STRING:
+			result = str(data, "utf-8", "surrogatepass")
+		elif kind == LIST:
+			result = [self[item_id] for item_id in data.cast("i")]
+		else:
+			result = pickle.loads(data)
+
+		self.decoded[object_id] = result
+		return result
+
+
+class ObjectColumn(Sequence):
+	"""A column of object ids, indexed like the list it replaces in TreeStore.
+	"""
+	def __init__(self, ids: memoryview, objects: ObjectTable):
+		self.ids = ids
+		self.objects = objects
+
+	def __len__(self):
+		return len(self.ids)
+
+	def __getitem__(self, index: int):
+		return self.objects[self.ids[index]]
+
+
+class SharedTreeStore(TreeStore):
+	"""Read-only TreeStore whose columns are in a shared memory block, the views of tree_nodes.py work the same on it.
+	Unlike TreeStore no nodes can be added, the block is kept mapped as long as the store (or any view of it) exists.
+	Looking up a member by name decodes the names of its siblings once, to build the index of get_child_ids.
+	"""
+	read_only = True
+
+	def __init__(self, block):
+		self.block = block
+		self.memoryviews = [] # Released before unmapping the block
+		buffer = block.buf
+
+		magic, version, member_count, parameter_count, object_count, self.root_first, self.root_count = HEADER.unpack_from(buffer)
+
+		if magic != FORMAT_MAGIC or version != FORMAT_VERSION:
+			raise ValueError(f"{block.name} is not a tree written by write_shared_tree")
+
+		offset = HEADER.size
+
+		def take(format: str, count: int) -> memoryview:
+			nonlocal offset
+			view = buffer[offset:offset + count * struct.calcsize(format)].cast(format)
+			offset = align(offset + view.nbytes)
+			self.memoryviews.append(view)
+			return view
+
+		columns = {column: take("i", member_count) for column in MEMBER_COLUMNS}
+		columns.update((column, take("i", parameter_count)) for column in PARAMETER_COLUMNS)
+		kinds = take("B", object_count)
+		offsets = take("q", object_count + 1)
+		data = buffer[offset:offset + offsets[-1]]
+		self.memoryviews.append(data)
+
+		self.strings = ObjectTable(kinds, offsets, data)
+
+		for column, ids in columns.items():
+			setattr(self, column, ObjectColumn(ids, self.strings) if column in OBJECT_COLUMNS else ids)
+
+		self.lazy = {}
+		self.child_ids = {}
+
+	def __repr__(self):
+		return f"SharedTreeStore(name={self.block.name!r}, members={len(self.names)}, parameters={len(self.parameter_names)})"
+
+	def get_roots(self) -> dict:
+		return {self.names[node_id]: NodeView(self, node_id) for node_id in range(self.root_first, self.root_first + self.root_count)}
+
+	def close(self) -> None:
+		"""Unmap the block, the views of the store can't be used after it.
+		"""
+		for view in self.memoryviews:
+			view.release()
+
+		self.memoryviews = []
+		self.block.close()
+
+	def __del__(self):
+		self.close()
+
+
+def get_shared_memory_name() -> str:
+	"""Returns a new name for the block of a sandbox, chosen by PyAPIReference so it can remove it if the sandbox fails (see remove_shared_tree).
+	Short enough for macOS (31 characters).
+	"""
+	return f"pyar_{os.getpid()}_{secrets.token_hex(6)}"
+
+def should_share_tree(tree: Mapping) -> bool:
+	"""Returns True if tree has at least SHARED_TREE_MIN_NODES members and parameters, only counts until then.
+	"""
+	count = 0
+	stack = [tree]
+
+	while len(stack) > 0:
+		members = stack.pop()
+		count += len(members)
+
+		if count >= SHARED_TREE_MIN_NODES:
+			return True
+
+		for properties in members.values():
+			count += len(properties.get("parameters") or ())
+
+			if isinstance(properties.get("content"), Mapping):
+				stack.append(properties["content"])
+
+	return False
+
+def write_shared_tree(tree: Mapping, name: str) -> SharedTree:
+	"""Write tree ({root_name: properties}) into a new shared memory block called name, returns the SharedTree to send instead of tree.
+	"""
+	store = TreeStore()
+	roots = store.add_members(tree)
+	parts = encode_store(store, roots.first, roots.count)
+
+	block = shared_memory.SharedMemory(name, create=True, size=max(sum(len(part) for part in parts), 1))
+
+	try:
+		offset = 0
+		for part in parts:
+			block.buf[offset:offset + len(part)] = part
+			offset += len(part)
+	except BaseException:
+		block.close()
+		block.unlink()
+		raise
+
+	# PyAPIReference unlinks it once read, this process must not remove it when it exits
+	unregister_block(block)
+	block.close()
+
+	return SharedTree(name)
+
+def read_shared_tree(shared_tree: SharedTree) -> dict:
+	"""Map the block written by write_shared_tree and returns the tree, {root_name: NodeView} of a SharedTreeStore.
+	The name of the block is removed right away, it's freed once the store isn't used anymore.
+	"""
+	block = shared_memory.SharedMemory(shared_tree.name)
+	block.unlink()
+
+	return SharedTreeStore(block).get_roots()
+
+def remove_shared_tree(name: str) -> None:
+	"""Remove the block called name if it exists, e.g.: the sandbox was killed after writing it.
+	"""
+	if name is None:
+		return
+
+	try:
+		block = shared_memory.SharedMemory(name)
+	except (FileNotFoundError, ValueError):
+		return
+
+	block.close()
+	block.unlink()
+
+def start_resource_tracker() -> None:
+	"""Start the process that removes the blocks this process leaves behind (see multiprocessing.resource_tracker) now,
+	instead of in the first job, where it would inherit the resource limits of the job (see inspection_worker.py).
+	"""
+	if SHARED_MEMORY_AVAILABLE:
+		resource_tracker.ensure_running()
+
+def unregister_block(block) -> None:
+	try:
+		resource_tracker.unregister(block._name, "shared_memory")
+	except Exception: # The tracker of this process isn't running
+		pass
+
+def encode_store(store: TreeStore, root_first: int, root_count: int) -> list:
+	"""Returns the parts of the block (bytes and arrays) with the columns of store.
+	"""
+	encoder = ObjectEncoder(store.strings)
+
+	columns = []
+	for column in MEMBER_COLUMNS + PARAMETER_COLUMNS:
+		values = getattr(store, column)
+		columns.append(array("i", map(encoder.get_id, values)) if column in OBJECT_COLUMNS else values)
+
+	kinds = bytes(encoder.kinds)
+	offsets = array("q", encoder.offsets)
+
+	header = HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, len(store.names), len(store.parameter_names), len(kinds), root_first, root_count)
+	parts = [header]
+
+	for part in (*columns, kinds, offsets):
+		part = part.tobytes() if isinstance(part, array) else part
+		parts.append(part)
+		parts.append(bytes(align(len(part)) - len(part)))
+
+	parts.extend(encoder.data)
+	return parts
+
+def align(offset: int) -> int:
+	return (offset + 7) & ~7
+
+
+class ObjectEncoder:
+	"""Assigns an id to each object of the columns, the strings of the TreeStore (types and kinds) keep their ids.
+	"""
+	def __init__(self, strings: list):
+		self.string_ids = {}
+		self.kinds = array("B")
+		self.offsets = [0]
+		self.data = []
+
+		for string in strings:
+			self.add(STRING, string.encode("utf-8", "surrogatepass"))
+			self.string_ids[string] = len(self.kinds) - 1
+
+	def add(self, kind: int, data: bytes) -> int:
+		self.kinds.append(kind)
+		self.data.append(data)
+		self.offsets.append(self.offsets[-1] + len(data))
+		return len(self.kinds) - 1
+
+	def get_id(self, value) -> int:
+		if value is None:
+			return NONE
+		elif value is MISSING:
+			return MISSING_ID
+		elif type(value) is str:
+			string_id = self.string_ids.get(value)
+
+			if string_id is None:
+				string_id = self.string_ids[value] = self.add(STRING, value.encode("utf-8", "surrogatepass"))
+
+			return string_id
+		elif type(value) is list:
+			return self.add(LIST, array("i", map(self.get_id, value)).tobytes())
+
+		return self.add(PICKLED, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,209 @@
+"""Get the parameters of callables once per signature, used by InspectionSession (see inspect_object.py).
+inspect.signature is the slowest part of inspecting a function and the same signature is found many times:
+the functions a decorator wraps with functools.wraps (every wrapper shares its code), the functions a factory creates,
+the methods bound to instances, etc. Here the parameters of plain functions are read directly from their code object
+(the same way inspect.signature does it) and stored under their code object and the identity of their defaults and annotations,
+any other callable is inspected with inspect.signature once.
+Example:
+	signatures = SignatureCache()
+	print(signatures.get_parameters(Person.__init__), signatures.get_parameters(Person("Ann").__init__))
+	>>> {"self": {...}, "name": {...}} {"name": {...}}
+"""
+import inspect
+from types import FunctionType, MethodType, BuiltinFunctionType, ModuleType
+from annotation_formatter import AnnotationFormatter
+from value_renderer import ValueRenderer
+
+# Attributes that change what inspect.signature returns for a function, if a function has any of them inspect.signature is used
+SIGNATURE_ATTRIBUTES = ("__signature__", "__wrapped__", "__text_signature__", "_partialmethod", "__partialmethod__")
+
+CO_VARARGS = inspect.CO_VARARGS
+CO_VARKEYWORDS = inspect.CO_VARKEYWORDS
+
+POSITIONAL_ONLY = inspect.Parameter.POSITIONAL_ONLY
+POSITIONAL_OR_KEYWORD = inspect.Parameter.POSITIONAL_OR_KEYWORD
+VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+KEYWORD_ONLY = inspect.Parameter.KEYWORD_ONLY
+VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
+EMPTY = inspect.Parameter.empty
+
+# Defaults shown by their __name__ (e.g.: key=str), with static_attributes it's read only from these types, it doesn't run any code of theirs
+NAMED_TYPES = (type, FunctionType, BuiltinFunctionType, MethodType, ModuleType)
+
+
+class SignatureCache:
+	"""Formats the parameters of each signature once.
+	Attributes:
+		annotation_formatter: formats the annotations of the parameters (see annotation_formatter.py).
+		value_renderer: renders the defaults of the parameters (see value_renderer.py).
+		static_attributes: if True the __str__ of the defaults is never called (see inspect_object).
+		cache: {key: (callable, parameters)} where parameters is a tuple of (name, annotation, default, kind) already formatted
+		and key (see get_key) is made of the ids of the code object, of the defaults and annotations of plain functions,
+		or the id of any other callable (the callable is kept so the ids are not reused by other objects).
+		inspected: number of signatures extracted (misses of the cache).
+	"""
+	def __init__(self, annotation_formatter: AnnotationFormatter=None, value_renderer: ValueRenderer=None, static_attributes: bool=False):
+		if annotation_formatter is None:
+			annotation_formatter = AnnotationFormatter()
+
+		if value_renderer is None:
+			value_renderer = ValueRenderer()
+
+		self.annotation_formatter = annotation_formatter
+		self.value_renderer = value_renderer
+		self.static_attributes = static_attributes
+		self.cache = {}
+		self.inspected = 0
+
+	def get_parameters(self, callable_: callable) -> dict:
+		"""Returns {name: {"annotation", "default", "kind"}} of the parameters of callable_, a new dict every time.
+		Raises the same exceptions as inspect.signature (e.g.: ValueError for some builtins).
+		"""
+		parameters = self.get_parameters_tuple(callable_)
+
+		return {
+			name: {"annotation": list(annotation) if isinstance(annotation, list) else annotation, "default": default, "kind": kind}
+			for name, annotation, default, kind in parameters
+		}
+
+	def get_parameters_tuple(self, callable_: callable) -> tuple:
+		if type(callable_) is MethodType:
+			parameters = self.get_parameters_tuple(callable_.__func__)
+
+			# The parameter the method is bound to (self or cls) is dropped, see inspect._signature_bound_method
+			if len(parameters) > 0 and parameters[0][3] in (POSITIONAL_ONLY.description, POSITIONAL_OR_KEYWORD.description):
+				return parameters[1:]
+			elif len(parameters) > 0 and parameters[0][3] == VAR_POSITIONAL.description:
+				return parameters
+
+			return self.format_parameters(inspect.signature(callable_).parameters.values()) # Raises the same error as inspect.signature
+
+		function = unwrap(callable_)
+		key = get_key(function)
+
+		if key not in self.cache:
+			self.inspected += 1
+
+			if is_plain_function(function):
+				parameters = self.format_parameters(get_code_parameters(function))
+			else:
+				parameters = self.format_parameters(inspect.signature(callable_).parameters.values())
+
+			self.cache[key] = function, parameters
+
+		return self.cache[key][1]
+
+	def format_parameters(self, parameters) -> tuple:
+		"""Given inspect.Parameter objects (or objects with the same attributes) returns a tuple of (name, annotation, default, kind).
+		"""
+		return tuple(
+			(parameter.name, self.annotation_formatter.format(parameter.annotation), self.format_default(parameter.default), parameter.kind.description)
+			for parameter in parameters
+		)
+
+	def format_default(self, default) -> str:
+		"""Returns None if there's no default, the __name__ of classes and functions or the default rendered with value_renderer.
+		"""
+		if default is EMPTY: # Not ==, the __eq__ of the default could run any code
+			return None
+
+		if not self.static_attributes:
+			try:
+				return default.__name__
+			except Exception:
+				pass
+		elif issubclass(type(default), NAMED_TYPES):
+			return default.__name__
+
+		return self.value_renderer.render(default, call_str=not self.static_attributes)
+
+
+class CodeParameter:
+	"""A parameter read from a code object, with the attributes of inspect.Parameter used by SignatureCache.format_parameters.
+	"""
+	__slots__ = ("name", "annotation", "default", "kind")
+
+	def __init__(self, name: str, annotation, default, kind: inspect._ParameterKind):
+		self.name = name
+		self.annotation = annotation
+		self.default = default
+		self.kind = kind
+
+
+def get_code_parameters(function: FunctionType) -> list:
+	"""Returns the parameters of a plain function (see is_plain_function) in the same order and with the same kinds,
+	defaults and annotations as inspect.signature, without building a Signature.
+	"""
+	code = function.__code__
+	argument_names = code.co_varnames
+	positional_count = code.co_argcount
+	keyword_only_count = code.co_kwonlyargcount
+	positional_only_left = code.co_posonlyargcount
+	annotations = function.__annotations__
+	defaults = function.__defaults__ or ()
+	keyword_defaults = function.__kwdefaults__ or {}
+
+	parameters = []
+	without_default_count = positional_count - len(defaults)
+
+	for index, name in enumerate(argument_names[:positional_count]):
+		kind = POSITIONAL_ONLY if positional_only_left > 0 else POSITIONAL_OR_KEYWORD
+		default = defaults[index - without_default_count] if index >= without_default_count else EMPTY
+
+		if name.startswith("."): # Implicit parameter of comprehensions (.0), inspect.Parameter renames it
+			name, kind = f"implicit{name[1:]}", POSITIONAL_ONLY
+
+		parameters.append(CodeParameter(name, annotations.get(name, EMPTY), default, kind))
+		positional_only_left -= 1
+
+	variable_index = positional_count + keyword_only_count
+
+	if code.co_flags & CO_VARARGS:
+		name = argument_names[variable_index]
+		parameters.append(CodeParameter(name, annotations.get(name, EMPTY), EMPTY, VAR_POSITIONAL))
+		variable_index += 1
+
+	for name in argument_names[positional_count:positional_count + keyword_only_count]:
+		parameters.append(CodeParameter(name, annotations.get(name, EMPTY), keyword_defaults.get(name, EMPTY), KEYWORD_ONLY))
+
+	if code.co_flags & CO_VARKEYWORDS:
+		name = argument_names[variable_index]
+		parameters.append(CodeParameter(name, annotations.get(name, EMPTY), EMPTY, VAR_KEYWORD))
+
+	return parameters
+
+def is_plain_function(function: object) -> bool:
+	"""Returns True if function is a Python function whose signature comes only from its code, defaults and annotations.
+	"""
+	if type(function) is not FunctionType:
+		return False
+
+	return not any(attribute in function.__dict__ for attribute in SIGNATURE_ATTRIBUTES)
+
+def unwrap(callable_: callable):
+	"""Returns the function at the end of the __wrapped__ chain of callable_ (functools.wraps), the one inspect.signature inspects.
+	"""
+	if type(callable_) is FunctionType and "__wrapped__" not in callable_.__dict__:
+		return callable_
+
+	try:
+		return inspect.unwrap(callable_, stop=lambda function: hasattr(function, "__signature__"))
+	except ValueError: # Cycle in the __wrapped__ chain, inspect.signature will raise it
+		return callable_
+
+def get_key(function: object) -> tuple:
+	"""Returns the key of the signature of function, functions with the same code, defaults and annotations share it.
+	"""
+	if not is_plain_function(function):
+		return id(function),
+
+	keyword_defaults = function.__kwdefaults__ or {}
+
+	# The id of the code object, code objects of functions with the same body hash the same (e.g.: methods repeated in many classes)
+	return (
+		id(function.__code__),
+		tuple(map(id, function.__defaults__ or ())),
+		tuple(map(id, keyword_defaults.values())),
+		tuple((name, id(annotation)) for name, annotation in function.__annotations__.items()),
+	)
@@ -0,0 +1,331 @@
+"""Static inspection engine, instead of executing the module (like get_module_from_path does)
+it parses the source code with ast, so the imports of the module are never executed.
+The result has the same format that inspect_object returns.
+"""
+import ast
+import os
+import inspect
+from member_filter import MemberFilter, load_member_filter
+from value_renderer import ValueRenderer
+
+PARAMETER_KINDS = {
+	"posonlyargs": inspect.Parameter.POSITIONAL_ONLY.description,
+	"args": inspect.Parameter.POSITIONAL_OR_KEYWORD.description,
+	"vararg": inspect.Parameter.VAR_POSITIONAL.description,
+	"kwonlyargs": inspect.Parameter.KEYWORD_ONLY.description,
+	"kwarg": inspect.Parameter.VAR_KEYWORD.description,
+}
+
+# Decorators that change the type of the decorated function
+DECORATOR_TYPES = ("property", "classmethod", "staticmethod")
+
+def static_inspect_path(path: str, member_filter: MemberFilter=None, value_renderer: ValueRenderer=None):
+	"""Given a path of a Python module, parse it and return the same tree inspect_object would return, without executing it.
+	If the source can't be parsed returns None, error (same as get_module_from_path).
+	If no member_filter, it's loaded from dunder_methods.prefs and member_filter.prefs (see member_filter.py).
+	The values of the members are rendered with value_renderer, ValueRenderer() if None.
+	Example:
+		tree, error = static_inspect_path("example.py")
+		print(tree)
+		>>> {"example": {"type": "module", "docstring": ..., "content": {...}}}
+	Notes:
+		As the module is not executed, imported members are not included and the values of
+		non-literal expressions are their source code (with ast.unparse, so it requires Python 3.9 or later).
+	"""
+	filename = os.path.basename(path)
+	filename_without_extension = os.path.splitext(filename)[0]
+
+	try:
+		with open(path, "rb") as file:
+			module_node = ast.parse(file.read(), filename=path)
+	except (SyntaxError, ValueError) as error:
+		exception_info = {}
+		exception_info["message"] = error.args[0]
+		exception_info["file"] = path
+		exception_info["line"] = getattr(error, "lineno", None)
+
+		return None, exception_info
+	except OSError as error: # E.g.: the file was removed or can't be read
+		exception_info = {}
+		exception_info["message"] = error.strerror or str(error)
+		exception_info["file"] = path
+		exception_info["line"] = None
+
+		return None, exception_info
+
+	if member_filter is None:
+		member_filter = load_member_filter()
+
+	if value_renderer is None:
+		value_renderer = ValueRenderer()
+
+	inspector = StaticInspector(member_filter, value_renderer)
+	result = {filename_without_extension: inspector.get_module_properties(module_node, filename_without_extension)}
+
+	return result, None
+
+
+class StaticInspector:
+	"""Converts ast nodes into the properties dictionaries that get_object_properties returns.
+	"""
+	def __init__(self, member_filter: MemberFilter, value_renderer: ValueRenderer):
+		self.member_filter = member_filter
+		self.value_renderer = value_renderer
+		self.classes = {} # class name -> list of the classes it inherits, to resolve the inherits of subclasses
+
+	def get_module_properties(self, module_node: ast.Module, module_name: str) -> dict:
+		content = self.get_body_content(module_node.body, "module", module_name)
+
+		module_all = self.member_filter.get_module_all(get_literal_assignments(module_node.body, ("__all__",)))
+		if module_all is not None:
+			content = {member_name: member_properties for member_name, member_properties in content.items() if member_name in module_all}
+
+		return {
+			"type": "module",
+			"docstring": ast.get_docstring(module_node, clean=False),
+			"content": content
+		}
+
+	def get_body_content(self, body: list, owner_type: str, qualname: str) -> dict:
+		"""Given the body of a module or a class returns the properties of each member defined in it.
+		owner_type is the name of the type of the owner (module or type) to look the dunder methods to include.
+		"""
+		result = {}
+
+		for member_name, member_node in self.iter_body_members(body):
+			if member_node is None: # Means del
+				result.pop(member_name, None)
+				continue
+
+			member_qualname = f"{qualname}.{member_name}"
+			if not self.member_filter.filter_name(member_name, owner_type, member_qualname):
+				continue
+
+			result[member_name] = self.get_node_properties(member_node, member_qualname)
+
+		return result
+
+	def get_node_properties(self, node: ast.AST, qualname: str) -> dict:
+		if isinstance(node, ast.ClassDef):
+			return self.get_class_properties(node, qualname)
+
+		elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+			return self.get_function_properties(node)
+
+		return self.get_value_properties(node)
+
+	def iter_body_members(self, body: list):
+		for node in body:
+			if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+				yield node.name, node
+
+			elif isinstance(node, ast.Assign):
+				for target in node.targets:
+					yield from self.iter_assign_members(target, node.value)
+
+			elif isinstance(node, ast.AnnAssign) and node.value is not None:
+				yield from self.iter_assign_members(node.target, node.value)
+
+			elif isinstance(node, ast.Delete):
+				for target in node.targets:
+					if isinstance(target, ast.Name):
+						yield target.id, None
+
+			elif isinstance(node, ast.If):
+				if is_main_guard(node):
+					continue # The module is not executed as __main__ so this block would never run
+
+				yield from self.iter_body_members(node.body)
+				yield from self.iter_body_members(node.orelse)
+
+			elif isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+				yield from self.iter_body_members(node.body)
+				for handler in node.handlers:
+					yield from self.iter_body_members(handler.body)
+				yield from self.iter_body_members(node.orelse)
+				yield from self.iter_body_members(node.finalbody)
+
+			elif isinstance(node, ast.With):
+				yield from self.iter_body_members(node.body)
+
+	def iter_assign_members(self, target: ast.expr, value: ast.expr):
+		if isinstance(target, ast.Name):
+			yield target.id, value
+
+		elif isinstance(target, (ast.Tuple, ast.List)) and isinstance(value, (ast.Tuple, ast.List)):
+			if len(target.elts) != len(value.elts):
+				return
+
+			for nested_target, nested_value in zip(target.elts, value.elts):
+				yield from self.iter_assign_members(nested_target, nested_value)
+
+	def get_class_properties(self, class_node: ast.ClassDef, qualname: str) -> dict:
+		inherits = []
+		for base in class_node.bases:
+			base_name = get_node_name(base)
+			if base_name == "object":
+				continue
+
+			# Also add what the base inherits (if it was defined before in the module) to behave as inspect.getmro
+			for class_name in [base_name] + self.classes.get(base_name, []):
+				if class_name not in inherits:
+					inherits.append(class_name)
+
+		self.classes[class_node.name] = inherits
+
+		return {
+			"type": "class",
+			"docstring": ast.get_docstring(class_node, clean=False),
+			"inherits": inherits,
+			"content": self.get_body_content(class_node.body, "type", qualname)
+		}
+
+	def get_function_properties(self, function_node: ast.FunctionDef) -> dict:
+		function_type = "function"
+		for decorator in function_node.decorator_list:
+			if get_node_name(decorator) in DECORATOR_TYPES:
+				function_type = get_node_name(decorator)
+
+		result = {"type": function_type, "docstring": ast.get_docstring(function_node, clean=False)}
+
+		if function_type == "property": # Properties are not callable members
+			return result
+
+		result["parameters"] = get_arguments_parameters(function_node.args)
+
+		if function_node.returns is not None:
+			result["return_annotation"] = get_annotation(function_node.returns)
+
+		return result
+
+	def get_value_properties(self, value_node: ast.expr) -> dict:
+		if isinstance(value_node, ast.Lambda):
+			return {"type": "function", "docstring": None, "parameters": get_arguments_parameters(value_node.args)}
+
+		try:
+			value = ast.literal_eval(value_node)
+		except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+			return {"type": get_expression_type(value_node), "docstring": None, "value": self.value_renderer.truncate(ast.unparse(value_node))}
+
+		return {"type": type(value).__name__, "docstring": type(value).__doc__, "value": self.value_renderer.render(value)}
+
+
+def get_literal_assignments(body: list, names: tuple) -> dict:
+	"""Returns the literal values assigned to names in body, e.g.: get_literal_assignments(body, ("__all__",)) -> {"__all__": [...]}.
+	"""
+	result = {}
+
+	for node in body:
+		if isinstance(node, ast.Assign) and len(node.targets) == 1:
+			target = node.targets[0]
+		elif isinstance(node, ast.AnnAssign) and node.value is not None:
+			target = node.target
+		else:
+			continue
+
+		if not isinstance(target, ast.Name) or target.id not in names:
+			continue
+
+		try:
+			result[target.id] = ast.literal_eval(node.value)
+		except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+			continue
+
+	return result
+
+def get_arguments_parameters(arguments: ast.arguments) -> dict:
+	"""Given the arguments of a function node returns the same dictionary get_callable_parameters returns.
+	"""
+	result = {}
+
+	positional_arguments = arguments.posonlyargs + arguments.args
+	# Defaults belong to the last positional arguments
+	positional_defaults = [None] * (len(positional_arguments) - len(arguments.defaults)) + arguments.defaults
+
+	for argument, default in zip(arguments.posonlyargs, positional_defaults):
+		result[argument.arg] = get_argument_properties(argument, default, PARAMETER_KINDS["posonlyargs"])
+
+	for argument, default in zip(arguments.args, positional_defaults[len(arguments.posonlyargs):]):
+		result[argument.arg] = get_argument_properties(argument, default, PARAMETER_KINDS["args"])
+
+	if arguments.vararg is not None:
+		result[arguments.vararg.arg] = get_argument_properties(arguments.vararg, None, PARAMETER_KINDS["vararg"])
+
+	for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+		result[argument.arg] = get_argument_properties(argument, default, PARAMETER_KINDS["kwonlyargs"])
+
+	if arguments.kwarg is not None:
+		result[arguments.kwarg.arg] = get_argument_properties(arguments.kwarg, None, PARAMETER_KINDS["kwarg"])
+
+	return result
+
+def get_argument_properties(argument: ast.arg, default: ast.expr, kind: str) -> dict:
+	if default is None:
+		default_parameter = None
+	else:
+		try:
+			default_parameter = str(ast.literal_eval(default))
+		except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+			default_parameter = ast.unparse(default)
+
+	return {
+		"annotation": get_annotation(argument.annotation) if argument.annotation is not None else None,
+		"default": default_parameter,
+		"kind": kind
+	}
+
+def get_annotation(annotation: ast.expr):
+	if isinstance(annotation, ast.Constant):
+		if annotation.value is None:
+			return None
+		if isinstance(annotation.value, str): # Forward reference
+			return annotation.value
+
+	if isinstance(annotation, (ast.Tuple, ast.List)): # Same as get_callable_parameters with tuple annotations
+		return [get_annotation(element) for element in annotation.elts]
+
+	return ast.unparse(annotation)
+
+def get_node_name(node: ast.expr) -> str:
+	"""Returns the name of a node as __name__ would do, e.g.: module.Class -> Class, decorator(arg) -> decorator.
+	"""
+	if isinstance(node, ast.Call):
+		return get_node_name(node.func)
+	elif isinstance(node, ast.Attribute):
+		return node.attr
+	elif isinstance(node, ast.Name):
+		return node.id
+
+	return ast.unparse(node)
+
+def get_expression_type(node: ast.expr) -> str:
+	"""Guess the type of a non-literal expression without evaluating it.
+	"""
+	if isinstance(node, ast.Call):
+		return get_node_name(node.func)
+	elif isinstance(node, ast.JoinedStr):
+		return "str"
+	elif isinstance(node, (ast.List, ast.ListComp)):
+		return "list"
+	elif isinstance(node, (ast.Dict, ast.DictComp)):
+		return "dict"
+	elif isinstance(node, (ast.Set, ast.SetComp)):
+		return "set"
+	elif isinstance(node, ast.Tuple):
+		return "tuple"
+	elif isinstance(node, ast.GeneratorExp):
+		return "generator"
+
+	return "object"
+
+def is_main_guard(node: ast.If) -> bool:
+	"""Returns True if node is `if __name__ == "__main__":`
+	"""
+	test = node.test
+	if not isinstance(test, ast.Compare) or len(test.ops) != 1 or not isinstance(test.ops[0], ast.Eq):
+		return False
+
+	operands = [test.left, test.comparators[0]]
+
+	return (any(isinstance(operand, ast.Name) and operand.id == "__name__" for operand in operands)
+		and any(isinstance(operand, ast.Constant) and operand.value == "__main__" for operand in operands))
@@ -0,0 +1,9 @@
+"""The modules of PyAPIReference import each other by their names (e.g.: from tree_nodes import TreeStore), as main.py runs from its directory.
+"""
+import os
+import sys
+
+PYAPIREFERENCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PYAPIREFERENCE_DIRECTORY not in sys.path:
+	sys.path.insert(0, PYAPIREFERENCE_DIRECTORY)
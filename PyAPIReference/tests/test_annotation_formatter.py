@@ -0,0 +1,112 @@
+import sys
+import textwrap
+import types
+import typing
+from typing import Annotated, Callable, Dict, List, Literal, Optional, TypeVar, Union
+
+import pytest
+
+from annotation_formatter import AnnotationFormatter
+from inspect_object import inspect_object
+from member_filter import MemberFilter
+from static_inspect import static_inspect_path
+
+T = TypeVar("T")
+
+
+@pytest.mark.parametrize("annotation, expected", [
+	(int, "int"),
+	(None, None),
+	(type(None), "None"),
+	(Optional[int], "Optional[int]"),
+	(Union[int, None], "Optional[int]"),
+	(Union[int, str], "Union[int, str]"),
+	(Union[int, str, None], "Union[int, str, None]"),
+	(Literal["a", 1], "Literal['a', 1]"),
+	(Annotated[int, "positive"], "Annotated[int, 'positive']"),
+	(List[int], "List[int]"),
+	(Dict[str, List[int]], "Dict[str, List[int]]"),
+	(Callable[[int, str], bool], "Callable[[int, str], bool]"),
+	(Callable[..., bool], "Callable[..., bool]"),
+	(list[int], "list[int]"),
+	(dict[str, list[int]], "dict[str, list[int]]"),
+	(tuple[int, ...], "tuple[int, ...]"),
+	(tuple[()], "tuple[()]"),
+	(T, "T"),
+	(Optional[Dict[str, "Person"]], "Optional[Dict[str, Person]]"),
+])
+def test_format(annotation, expected):
+	assert AnnotationFormatter().format(annotation) == expected
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="X | Y unions are new in Python 3.10")
+def test_format_union_operator():
+	formatter = AnnotationFormatter()
+
+	assert formatter.format(int | None) == "int | None"
+	assert formatter.format(list[int] | dict[str, int] | None) == "list[int] | dict[str, int] | None"
+
+def test_format_string_annotations():
+	formatter = AnnotationFormatter()
+
+	assert formatter.format("Person") == "Person"
+	assert formatter.format("'Person'") == "Person"
+	assert formatter.format("None") is None
+	assert formatter.format("Optional[Person]") == "Optional[Person]"
+	assert formatter.format("(int, str)") == ["int", "str"]
+	assert formatter.format("not valid (") == "not valid ("
+	assert formatter.format(typing.ForwardRef("Person")) == "Person"
+
+def test_format_tuples_and_unhashable():
+	formatter = AnnotationFormatter()
+	annotation = Annotated[int, {"unit": "m"}] # The dict makes it unhashable
+
+	assert formatter.format((int, "str")) == ["int", "str"]
+	assert formatter.format(annotation) == "Annotated[int, {'unit': 'm'}]"
+	assert formatter.format(annotation) == "Annotated[int, {'unit': 'm'}]"
+	assert id(annotation) in formatter.identity_cache
+
+	# The cached list is not shared with the callers
+	formatter.format((int, str)).append("changed")
+	assert formatter.format((int, str)) == ["int", "str"]
+
+SOURCE = '''
+	from typing import Callable, Dict, List, Literal, Optional, Union
+
+	class Person:
+		pass
+
+	def function(
+		a: int, b: Optional[int], c: Union[int, str], d: List[Person], e: Dict[str, List[int]],
+		f: Callable[[int, str], bool], g: Literal["a", 1], h: list[int], i: dict[str, list[int]],
+		j: "Person", k: (int, str), l: None, m=None, *args: int, n: tuple[int, ...]=(), **kwargs: str
+	) -> Optional[Person]:
+		pass
+
+	def no_return_annotation(a: "Optional[Person]"):
+		pass
+'''
+
+def get_annotations(tree: dict) -> dict:
+	return {
+		name: ({parameter: properties["annotation"] for parameter, properties in member["parameters"].items()}, member.get("return_annotation"))
+		for name, member in tree["module"]["content"].items() if "parameters" in member
+	}
+
+@pytest.mark.parametrize("future_annotations", [False, True])
+def test_same_as_static_inspect(tmp_path, future_annotations):
+	source = textwrap.dedent(SOURCE)
+	if future_annotations:
+		source = f"from __future__ import annotations\n{source}"
+
+	path = tmp_path / "module.py"
+	path.write_text(source, encoding="utf-8")
+
+	module = types.ModuleType("module")
+	exec(compile(source, str(path), "exec"), vars(module))
+
+	static_tree, error = static_inspect_path(str(path), MemberFilter())
+	annotations = get_annotations(inspect_object(module, MemberFilter()))
+
+	assert error is None
+	assert list(annotations) == ["function", "no_return_annotation"]
+	assert annotations == get_annotations(static_tree)
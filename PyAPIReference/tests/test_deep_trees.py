@@ -0,0 +1,86 @@
+import pickle
+import types
+
+import pytest
+
+from inspect_object import inspect_object
+from inspection_cache import InspectionCache
+from inspection_events import iter_tree_events
+from member_filter import MemberFilter
+from module_sandbox import PICKLE_MAX_DEPTH, is_deeper_than
+from shared_tree import SHARED_MEMORY_AVAILABLE, get_shared_memory_name, write_shared_tree, read_shared_tree, remove_shared_tree
+from tree_nodes import MISSING, compact_tree
+
+DEPTH = 500
+
+
+def get_deep_module(depth: int) -> types.ModuleType:
+	"""A module with depth nested classes, built at runtime since source code can't be indented that deep.
+	"""
+	module = types.ModuleType("deep")
+	current = module
+
+	for index in range(depth):
+		qualname = f"{current.__qualname__}.C{index}" if index else "C0"
+		nested = type(f"C{index}", (), {"__qualname__": qualname, "__module__": "deep"})
+		setattr(current, f"C{index}", nested)
+		current = nested
+
+	return module
+
+def get_events(tree) -> list:
+	# Trees are compared through their events, == is recursive
+	return list(iter_tree_events(tree))
+
+@pytest.fixture(scope="module")
+def deep_tree():
+	return inspect_object(get_deep_module(DEPTH), MemberFilter())
+
+def get_depth(tree) -> int:
+	depth = 0
+	content = next(iter(tree.values()))["content"]
+
+	while content:
+		depth += 1
+		content = next(iter(content.values()))["content"]
+
+	return depth
+
+def test_inspect_deep_module(deep_tree):
+	assert get_depth(deep_tree) == DEPTH
+
+def test_compact_deep_tree(deep_tree):
+	assert get_events(compact_tree(deep_tree)) == get_events(deep_tree)
+
+@pytest.mark.skipif(not SHARED_MEMORY_AVAILABLE, reason="Shared memory trees are not used on this platform")
+def test_share_deep_tree(deep_tree):
+	name = get_shared_memory_name()
+
+	try:
+		assert get_events(read_shared_tree(write_shared_tree(deep_tree, name))) == get_events(deep_tree)
+	finally:
+		remove_shared_tree(name)
+
+def test_cache_deep_tree(tmp_path, deep_tree):
+	cache = InspectionCache(str(tmp_path / "cache"))
+
+	cache.set("key", deep_tree)
+	assert get_events(cache.get("key")) == get_events(deep_tree)
+
+def test_pickle_deep_tree(deep_tree):
+	# The sandbox sends deep trees compacted, pickle is recursive
+	assert is_deeper_than(deep_tree, PICKLE_MAX_DEPTH)
+	assert not is_deeper_than(deep_tree, DEPTH + 1) # The module and its empty innermost content count too
+
+	tree = pickle.loads(pickle.dumps(compact_tree(deep_tree)))
+	assert get_events(tree) == get_events(deep_tree)
+	assert pickle.loads(pickle.dumps(MISSING)) is MISSING
+
+def test_max_depth():
+	tree = inspect_object(get_deep_module(5), MemberFilter(), max_depth=2)
+	c1 = tree["deep"]["content"]["C0"]["content"]["C1"]
+
+	assert get_depth(tree) == 2
+	assert c1["truncated"] == "max_depth"
+	assert c1["content"] == {}
+	assert "truncated" not in tree["deep"]["content"]["C0"]
@@ -0,0 +1,33 @@
+from display_model import DisplayStyle, build_display_tree, iter_prepared_children, prepare_children
+
+STYLE = DisplayStyle({}, font_color="#ffffff", code_block_stylesheet="")
+
+TREE = {
+	"module": {
+		"type": "module",
+		"docstring": None,
+		"content": {f"SIZE{index}": {"type": "int", "docstring": None, "value": str(index)} for index in range(10)}
+	}
+}
+
+
+def get_content_node(tree: dict):
+	display_tree = build_display_tree(tree, STYLE, max_rows=0)
+	return next(child for child in prepare_children(display_tree, STYLE) if child.name == "content")
+
+def test_children_are_prepared_one_at_a_time():
+	content_node = get_content_node(TREE)
+	children = iter_prepared_children(content_node, STYLE)
+
+	assert next(children).name == "SIZE0"
+	assert content_node.children is None # Only set once all of them were prepared
+
+	assert [child.name for child in children] == [f"SIZE{index}" for index in range(1, 10)]
+	assert [child.name for child in content_node.children] == [f"SIZE{index}" for index in range(10)]
+
+def test_prepared_children_are_reused():
+	content_node = get_content_node(TREE)
+	children = prepare_children(content_node, STYLE)
+
+	assert list(iter_prepared_children(content_node, STYLE)) == children
+	assert prepare_children(content_node, STYLE) is children
@@ -0,0 +1,134 @@
+import itertools
+import types
+
+import pytest
+
+from inspect_object import InspectionSession, inspect_object, iter_inspect_object, materialize_tree
+from inspection_events import ENTER, PROPERTY, LEAVE, build_tree, iter_tree_events
+from member_filter import MemberFilter
+from tree_nodes import TreeStore
+
+SOURCE = '''
+def helper(a=1):
+	pass
+
+alias = helper
+
+class Node:
+	pass
+
+Node.parent = Node # Cycle
+
+class Tree:
+	root = Node
+
+class A:
+	pass
+
+class B:
+	a = A
+
+A.b = B # Cycle through another class
+'''
+
+
+def get_module(source: str) -> types.ModuleType:
+	module = types.ModuleType("module")
+	exec(source, vars(module))
+
+	return module
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_shared_and_cyclic_objects_are_references(compact):
+	session = InspectionSession(MemberFilter(), compact=compact)
+	tree = inspect_object(get_module(SOURCE), session=session)
+	content = materialize_tree(tree)["module"]["content"]
+
+	assert content["alias"] == {"type": "function", "docstring": None, "reference": "module.helper"}
+	assert "parameters" in content["helper"]
+	assert content["Node"]["content"]["parent"] == {"type": "class", "docstring": None, "reference": "module.Node"}
+	assert content["Tree"]["content"]["root"] == {"type": "class", "docstring": None, "reference": "module.Node"}
+
+	# A is inspected once, inside it B is and its member a is a reference to A
+	assert content["A"]["content"]["b"]["content"]["a"] == {"type": "class", "docstring": None, "reference": "module.A"}
+	assert content["B"] == {"type": "class", "docstring": None, "reference": "module.A.b"}
+
+	# The shared function's signature is extracted once
+	assert session.signatures.inspected == 1
+
+def test_values_are_not_references():
+	content = inspect_object(get_module("FIRST = 1\nSECOND = 1\nNAMES = ()\nOTHER_NAMES = ()\n"), MemberFilter())["module"]["content"]
+
+	assert all("reference" not in member and member["value"] in ("1", "()") for member in content.values())
+
+def test_references_across_lazy_contents():
+	session = InspectionSession(MemberFilter(), lazy=True)
+	content = inspect_object(get_module(SOURCE), session=session)["module"]["content"]
+
+	# Loaded later, the objects inspected before are still references
+	assert content["Tree"]["content"]["root"]["reference"] == "module.Node"
+	assert content["Node"]["content"]["parent"]["reference"] == "module.Node"
+
+EVENTS_SOURCE = SOURCE + '''
+SIZE = 10
+
+class Person:
+	"""A person."""
+	species = "human"
+
+	class Address:
+		street: str = "Main"
+
+	def greet(self, name: str="world", *args, times: int=1, **kwargs) -> str:
+		pass
+
+	@property
+	def age(self) -> int:
+		return 1
+
+	@staticmethod
+	def create(name: str):
+		pass
+
+class Empty:
+	pass
+'''
+
+def check_events(events: list) -> None:
+	"""Checks that each LEAVE closes the last ENTER with the same name.
+	"""
+	entered = []
+
+	for event, name, value in events:
+		if event is ENTER:
+			entered.append(name)
+		elif event is LEAVE:
+			assert entered.pop() == name
+
+	assert entered == []
+
+@pytest.mark.parametrize("static_attributes", [False, True])
+def test_events_build_the_same_tree(static_attributes):
+	module = get_module(EVENTS_SOURCE)
+	member_filter = MemberFilter({"type": ("__init__",)})
+	events = list(iter_inspect_object(module, member_filter, static_attributes=static_attributes))
+	tree = inspect_object(module, member_filter, static_attributes=static_attributes)
+
+	check_events(events)
+	assert events[0] == (ENTER, "module", None) and events[-1] == (LEAVE, "module", None)
+	assert build_tree(events) == tree
+	assert materialize_tree(build_tree(events, TreeStore())) == tree
+
+	# The same events as walking the built tree
+	assert events == list(iter_tree_events(tree))
+
+def test_events_are_streamed():
+	session = InspectionSession(MemberFilter())
+	events = iter_inspect_object(get_module(EVENTS_SOURCE), session=session)
+
+	# The first events come before the members are inspected
+	assert list(itertools.islice(events, 3)) == [(ENTER, "module", None), (PROPERTY, "type", "module"), (PROPERTY, "docstring", None)]
+	assert session.signatures.inspected == 0
+
+	list(events)
+	assert session.signatures.inspected > 0
@@ -0,0 +1,62 @@
+import time
+
+from inspect_object import inspect_object, InspectEngines
+from member_filter import MemberFilter
+from module_sandbox import inspect_module_job
+from value_renderer import ValueRenderer
+from inspection_budget import InspectionBudget, CancellationToken, CANCELLED, TIME_LIMIT, MEMORY_LIMIT
+
+
+def test_cancelled_budget_stays_exceeded():
+	token = CancellationToken()
+	budget = InspectionBudget(token=token)
+
+	assert budget.check() is None
+
+	token.cancel()
+	assert budget.check() == CANCELLED
+
+	budget.merge(TIME_LIMIT) # The first reason is kept
+	assert budget.check() == CANCELLED
+
+def test_time_outside_track_doesnt_count():
+	budget = InspectionBudget(time_limit=0.05)
+
+	time.sleep(0.1)
+	with budget.track():
+		assert budget.check() is None
+
+		time.sleep(0.1)
+		assert budget.check() == TIME_LIMIT
+
+def test_merge():
+	budget = InspectionBudget()
+
+	budget.merge(None)
+	assert budget.exceeded is None
+
+	budget.merge(MEMORY_LIMIT)
+	assert budget.check() == MEMORY_LIMIT
+
+def test_exceeded_budget_truncates_the_tree():
+	token = CancellationToken()
+	token.cancel()
+
+	tree = inspect_object(time, MemberFilter(), budget=InspectionBudget(token=token))
+
+	assert tree["time"]["truncated"] == CANCELLED
+	assert len(tree["time"]["content"]) == 0
+
+def test_module_job_reports_its_budget(tmp_path):
+	path = tmp_path / "module.py"
+	path.write_text("SIZE = 10\n\nclass Person:\n\tpass\n", encoding="utf-8")
+
+	result = inspect_module_job("module", str(path), InspectEngines.RUNTIME, MemberFilter(), ValueRenderer())
+	module_content, error, profile_records, dependencies, exceeded = result
+	assert error is None and exceeded is None
+	assert "truncated" not in module_content
+
+	result = inspect_module_job("module", str(path), InspectEngines.RUNTIME, MemberFilter(), ValueRenderer(), time_limit=0)
+	module_content, error, profile_records, dependencies, exceeded = result
+	assert exceeded == TIME_LIMIT
+	assert module_content["truncated"] == TIME_LIMIT
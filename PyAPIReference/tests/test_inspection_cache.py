@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from inspection_cache import InspectionCache, load_json
+from inspection_events import iter_tree_events
+
+
+def write_file(path, text: str) -> str:
+	path.write_text(text, encoding="utf-8")
+
+	return str(path)
+
+def test_result_round_trip(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	module_path = write_file(tmp_path / "module.py", "SIZE = 10\n")
+	result = {"module": {"type": "module", "docstring": None, "content": {}}}
+
+	key = cache.get_key(module_path, "runtime")
+	assert cache.get(key) is None
+
+	cache.set(key, result)
+	assert cache.get(key) == result
+
+def test_key_changes_with_source_and_settings(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	module_path = write_file(tmp_path / "module.py", "SIZE = 10\n")
+
+	key = cache.get_key(module_path, "runtime")
+	assert cache.get_key(module_path, "static") != key
+
+	write_file(tmp_path / "module.py", "SIZE = 11\n")
+	assert cache.get_key(module_path, "runtime") != key
+
+def get_deep_tree(depth: int) -> dict:
+	"""The tree of depth nested classes, deeper than the recursion limit of json.dump and json.load.
+	"""
+	tree = {"module": {"type": "module", "docstring": None, "content": {}}}
+	content = tree["module"]["content"]
+
+	for index in range(depth):
+		content[f"C{index}"] = {"type": "class", "docstring": None, "inherits": ["object"], "content": {}}
+		content = content[f"C{index}"]["content"]
+
+	return tree
+
+def test_deep_result_round_trip(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	tree = get_deep_tree(1000)
+
+	cache.set("key", tree)
+
+	# Compared through their events, == is recursive too
+	assert list(iter_tree_events(cache.get("key"))) == list(iter_tree_events(tree))
+
+def test_load_json():
+	text = '{"a": [1, 2.5, "x\\"y"], "b": {}, "c": [], "d": {"e": null, "f": true}}'
+
+	assert load_json(text) == {"a": [1, 2.5, 'x"y'], "b": {}, "c": [], "d": {"e": None, "f": True}}
+
+	for invalid_text in ("", "{", "[1,]", '{"a" 1}', '{"a": 1,}', "{}x"):
+		with pytest.raises(ValueError):
+			load_json(invalid_text)
+
+def test_changed_dependency_invalidates_result(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	module_path = write_file(tmp_path / "module.py", "from helper import VALUE\n")
+	dependency_path = write_file(tmp_path / "helper.py", "VALUE = 1\n")
+
+	key = cache.get_key(module_path, "runtime")
+	cache.set(key, {"module": {}}, [dependency_path])
+	assert cache.get(key) == {"module": {}}
+
+	write_file(tmp_path / "helper.py", "VALUE = 22\n")
+	assert cache.get(key) is None
+
+	cache.set(key, {"module": {}}, [dependency_path])
+	os.remove(dependency_path)
+	assert cache.get(key) is None
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"), max_size=1500)
+	value = "x" * 600
+
+	for index in range(3):
+		cache.set(f"key{index}", {"value": value})
+		# Modification times can be equal inside the resolution of the filesystem
+		os.utime(cache.get_path(f"key{index}"), ns=(index * 10**9, index * 10**9))
+
+	cache.set("key3", {"value": value})
+
+	assert cache.get("key0") is None
+	assert cache.get("key1") is None
+	assert cache.get("key3") == {"value": value}
+
+def test_clear(tmp_path):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	cache.set("key", {"module": {}})
+
+	cache.clear()
+
+	assert cache.get("key") is None
@@ -0,0 +1,143 @@
+import time
+import threading
+
+import pytest
+from PyQt5.QtCore import QCoreApplication, QObject, pyqtSignal, pyqtSlot
+
+import inspection_scheduler
+from inspection_budget import CancellationToken
+from inspection_scheduler import InspectionScheduler, InspectionJob, JobStates, VISIBLE_PRIORITY, BACKGROUND_PRIORITY
+
+
+class Worker(QObject):
+	"""Stands for InspectModule, records when it runs and waits for release (or its token to be cancelled) before finishing.
+	"""
+	finished = pyqtSignal()
+	expection_found = pyqtSignal()
+	events_ready = pyqtSignal(list)
+
+	engine = None
+	module_content = display_tree = display_style = module = profiler = budget = pending_cache_key = None
+	package_errors = {}
+	warnings = []
+
+	def __init__(self, name: str, started: list, token: CancellationToken, release: threading.Event=None):
+		super().__init__()
+
+		self.name = name
+		self.started = started
+		self.token = token
+		self.release = release
+
+	def is_incomplete(self) -> bool:
+		return False
+
+	@pyqtSlot()
+	def run(self):
+		self.started.append(self.name)
+
+		deadline = time.perf_counter() + 5
+		while self.release is not None and not self.release.is_set() and not self.token.cancelled and time.perf_counter() < deadline:
+			time.sleep(0.005)
+
+		self.finished.emit()
+
+
+@pytest.fixture(scope="module")
+def app():
+	return QCoreApplication.instance() or QCoreApplication([])
+
+def create_job(name: str, started: list, release: threading.Event=None) -> InspectionJob:
+	token = CancellationToken()
+	return InspectionJob(name, Worker(name, started, token, release), token)
+
+def wait_until(condition: callable, timeout: float=5) -> None:
+	deadline = time.perf_counter() + timeout
+
+	while not condition():
+		assert time.perf_counter() < deadline, "timed out"
+		QCoreApplication.processEvents()
+		time.sleep(0.001)
+
+def test_queued_jobs_start_by_priority(app):
+	scheduler = InspectionScheduler(max_threads=1)
+	started = []
+	release = threading.Event()
+
+	running = scheduler.submit(create_job("running", started, release))
+	wait_until(lambda: started == ["running"])
+
+	background = scheduler.submit(create_job("background", started), BACKGROUND_PRIORITY)
+	visible = scheduler.submit(create_job("visible", started), VISIBLE_PRIORITY)
+	later = scheduler.submit(create_job("later", started), BACKGROUND_PRIORITY)
+
+	# The visible file changed while they were queued
+	scheduler.set_priority(visible, BACKGROUND_PRIORITY)
+	scheduler.set_priority(later, VISIBLE_PRIORITY)
+
+	release.set()
+	wait_until(lambda: all(job.is_done for job in (running, background, visible, later)))
+
+	assert started == ["running", "later", "background", "visible"]
+	scheduler.close()
+
+def test_cancel(app):
+	scheduler = InspectionScheduler(max_threads=1)
+	started = []
+	finished = []
+	scheduler.job_finished.connect(finished.append)
+
+	running = scheduler.submit(create_job("running", started, threading.Event()))
+	queued = scheduler.submit(create_job("queued", started))
+	wait_until(lambda: started == ["running"])
+
+	# A queued job is cancelled right away, without starting
+	scheduler.cancel(queued)
+	assert queued.state == JobStates.CANCELLED
+	assert finished == [queued]
+
+	# A running one is told to stop (see inspection_budget.py) and finishes
+	scheduler.cancel(running)
+	assert running.token.cancelled
+	wait_until(lambda: running.is_done)
+
+	assert running.state == JobStates.FINISHED
+	assert started == ["running"]
+	scheduler.close()
+
+def test_submitting_the_same_file_discards_the_old_job(app):
+	scheduler = InspectionScheduler(max_threads=1)
+	started = []
+
+	scheduler.submit(create_job("running", started, threading.Event()))
+	old_job = scheduler.submit(create_job("file", started))
+	new_job = scheduler.submit(create_job("file", started))
+
+	assert old_job.discarded and old_job.state == JobStates.CANCELLED
+	assert scheduler.jobs[-1] is new_job
+	scheduler.close()
+
+def test_close_waits_a_bounded_time(app, monkeypatch):
+	monkeypatch.setattr(inspection_scheduler, "THREAD_CLOSE_TIMEOUT", 300)
+
+	scheduler = InspectionScheduler(max_threads=2)
+	started = []
+	release = threading.Event()
+	jobs = [create_job(f"stuck{index}", started, release) for index in range(2)]
+
+	for job in jobs:
+		job.token.cancel = lambda: None # Like executing a module, cancelling doesn't stop it
+		scheduler.submit(job)
+
+	wait_until(lambda: len(started) == 2)
+	threads = list(scheduler.threads)
+
+	start = time.perf_counter()
+	scheduler.close()
+
+	assert time.perf_counter() - start < 0.5 # Not THREAD_CLOSE_TIMEOUT per thread
+	assert all(thread in inspection_scheduler.unfinished_threads for thread in threads)
+
+	release.set()
+	for thread in threads:
+		assert thread.wait(5000)
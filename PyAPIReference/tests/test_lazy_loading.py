@@ -0,0 +1,136 @@
+import types
+
+import pytest
+
+from inspect_object import LazyDict, inspect_object, iter_lazy_contents, materialize_tree
+from inspection_budget import CancellationToken
+from inspection_cache import InspectionCache
+from member_filter import MemberFilter
+
+
+SOURCE = '''
+SIZE = 10
+
+class Person:
+	"""A person."""
+	species = "human"
+
+	class Address:
+		street = "Main"
+
+	def greet(self, name: str="world") -> str:
+		pass
+'''
+
+
+@pytest.fixture
+def module():
+	module = types.ModuleType("module")
+	exec(SOURCE, vars(module))
+
+	return module
+
+@pytest.fixture
+def LazyContentLoader():
+	# main.py imports the whole GUI (e.g.: QtMultimedia needs system libraries that may not be installed)
+	try:
+		from main import LazyContentLoader
+	except ImportError as error:
+		pytest.skip(f"main.py can't be imported: {error}")
+
+	return LazyContentLoader
+
+def test_lazy_dict_loads_once():
+	calls = []
+	content = LazyDict(lambda: calls.append("load") or {"a": 1, "b": 2})
+
+	assert not content.loaded
+	assert repr(content) == "LazyDict(<not loaded>)"
+	assert calls == []
+
+	assert "a" in content
+	assert content.loaded
+	assert (content["b"], len(content), list(content), content.get("c")) == (2, 2, ["a", "b"], None)
+	assert content == {"a": 1, "b": 2} and content.copy() == {"a": 1, "b": 2}
+	assert calls == ["load"]
+
+	with pytest.raises(TypeError):
+		hash(content)
+
+@pytest.mark.parametrize("access", [list, len, lambda content: content.copy(), lambda content: content.items(), lambda content: content == {}])
+def test_lazy_dict_loads_on_any_access(access):
+	content = LazyDict(lambda: {"a": 1})
+	access(content)
+
+	assert content.loaded and dict.__len__(content) == 1
+
+def test_lazy_dict_loader_error():
+	def loader():
+		raise ValueError("broken")
+
+	content = LazyDict(loader)
+
+	with pytest.raises(ValueError):
+		content.load()
+
+	# It's not loaded again, the content stays empty
+	assert content.loaded and len(content) == 0
+
+def test_lazy_inspection_is_the_same_tree(module):
+	member_filter = MemberFilter()
+	tree = inspect_object(module, member_filter, lazy=True)
+	content = tree["module"]["content"]
+
+	assert isinstance(content["Person"]["content"], LazyDict)
+	assert not content["Person"]["content"].loaded
+
+	lazy_contents = list(iter_lazy_contents(tree))
+	assert content["Person"]["content"] in lazy_contents
+
+	assert materialize_tree(tree) == inspect_object(module, member_filter)
+
+def test_content_loader_loads_one_content(module, LazyContentLoader):
+	tree = inspect_object(module, MemberFilter(), lazy=True)
+	person_content = tree["module"]["content"]["Person"]["content"]
+	finished = []
+
+	loader = LazyContentLoader("module.py", person_content)
+	loader.finished.connect(lambda: finished.append(True))
+	loader.run()
+
+	assert finished == [True]
+	assert person_content.loaded
+	assert not person_content["Address"]["content"].loaded # Only the content asked for
+	assert not loader.completed
+
+def test_content_loader_completes_and_caches(tmp_path, module, LazyContentLoader):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	tree = inspect_object(module, MemberFilter(), lazy=True)
+
+	loader = LazyContentLoader(str(tmp_path / "module.py"), tree, CancellationToken(), True, cache, "key")
+	loader.run()
+
+	assert loader.completed and loader.warnings == []
+	assert list(iter_lazy_contents(tree)) == []
+	assert cache.get("key") == inspect_object(module, MemberFilter())
+
+def test_cancelled_content_loader_doesnt_cache(tmp_path, module, LazyContentLoader):
+	cache = InspectionCache(str(tmp_path / "cache"))
+	tree = inspect_object(module, MemberFilter(), lazy=True)
+	token = CancellationToken()
+	token.cancel()
+
+	loader = LazyContentLoader(str(tmp_path / "module.py"), tree, token, True, cache, "key")
+	loader.run()
+
+	assert not loader.completed
+	assert cache.get("key") is None
+
+def test_content_loader_error_is_a_warning(LazyContentLoader):
+	def loader():
+		raise ValueError("broken")
+
+	content_loader = LazyContentLoader("module.py", LazyDict(loader))
+	content_loader.run()
+
+	assert content_loader.warnings == ["Couldn't inspect a content: broken"]
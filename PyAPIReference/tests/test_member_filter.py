@@ -0,0 +1,79 @@
+import os
+import types
+
+from inspect_object import inspect_object
+from member_filter import MemberFilter, load_member_filter
+
+
+def test_include_and_exclude_by_name():
+	member_filter = MemberFilter(include=("get_*", "Person"), exclude=("get_secret",))
+
+	assert member_filter.filter_name("get_name", "type")
+	assert member_filter.filter_name("Person", "module")
+	assert not member_filter.filter_name("get_secret", "type")
+	assert not member_filter.filter_name("set_name", "type")
+
+def test_include_and_exclude_by_qualname():
+	# Patterns with a dot match the qualified name, the others the name
+	member_filter = MemberFilter(include=("example.Person.*", "SIZE"), exclude=("example.Person.age",))
+
+	assert member_filter.filter_name("name", "type", "example.Person.name")
+	assert member_filter.filter_name("SIZE", "module", "example.SIZE")
+	assert not member_filter.filter_name("age", "type", "example.Person.age")
+	assert not member_filter.filter_name("name", "type", "example.Animal.name")
+
+def test_skip_private():
+	assert MemberFilter().filter_name("_cache", "type")
+	assert not MemberFilter(skip_private=True).filter_name("_cache", "type")
+	assert not MemberFilter(skip_private=True).filter_name("__cache", "type")
+
+def test_dunder_methods_per_type():
+	member_filter = MemberFilter({"type": "__init__", "module": ("__version__", "__all__")}, skip_private=True)
+
+	assert member_filter.filter_name("__init__", "type")
+	assert not member_filter.filter_name("__init__", "module")
+	assert not member_filter.filter_name("__repr__", "type")
+	assert member_filter.filter_name("__version__", "module")
+	assert not MemberFilter().filter_name("__init__", "type")
+
+	# Dunder methods are still excluded by the patterns
+	assert not MemberFilter({"type": ("__init__",)}, exclude=("__*",)).filter_name("__init__", "type")
+
+def test_all_only():
+	module = types.ModuleType("module")
+	module.__all__ = ["public"]
+	module.public = 1
+	module.other = 2
+
+	assert MemberFilter(all_only=True).get_module_all(vars(module)) == {"public"}
+	assert MemberFilter().get_module_all(vars(module)) is None
+	assert MemberFilter(all_only=True).get_module_all({"__all__": None}) is None
+
+	assert list(inspect_object(module, MemberFilter(all_only=True))["module"]["content"]) == ["public"]
+	assert list(inspect_object(module, MemberFilter())["module"]["content"]) == ["public", "other"]
+
+def write_prefs(path, text: str, mtime_ns: int) -> str:
+	path.write_text(f"#PREFS\n{text}\n", encoding="utf-8")
+	os.utime(path, ns=(mtime_ns, mtime_ns))
+
+	return str(path)
+
+def test_load_member_filter_reloads_modified_files(tmp_path):
+	dunder_methods_path = write_prefs(tmp_path / "dunder_methods.prefs", 'type=("__init__")', 1_000_000_000)
+	member_filter_path = write_prefs(tmp_path / "member_filter.prefs", 'exclude=("_*")\nskip_private=False', 1_000_000_000)
+
+	member_filter = load_member_filter(dunder_methods_path, member_filter_path)
+	assert member_filter.exclude == ("_*",)
+	assert member_filter.dunder_methods == {"type": {"__init__"}}
+
+	# Not read again while the files don't change
+	assert load_member_filter(dunder_methods_path, member_filter_path) is member_filter
+
+	write_prefs(tmp_path / "member_filter.prefs", 'exclude=()\nskip_private=True', 2_000_000_000)
+	reloaded = load_member_filter(dunder_methods_path, member_filter_path)
+
+	assert reloaded is not member_filter
+	assert reloaded.exclude == () and reloaded.skip_private
+
+	# Missing files are an empty policy
+	assert load_member_filter(str(tmp_path / "missing.prefs"), str(tmp_path / "missing_filter.prefs")).key == MemberFilter().key
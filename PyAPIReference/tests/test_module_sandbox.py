@@ -0,0 +1,73 @@
+import module_sandbox
+from inspect_object import inspect_object
+from member_filter import MemberFilter
+from module_loader import get_module_from_path
+from module_sandbox import Sandbox, SandboxLimits, inspect_path_sandboxed, render_full_value_job
+from inspection_budget import CancellationToken
+
+
+def write_module(tmp_path, source: str) -> str:
+	path = tmp_path / "module.py"
+	path.write_text(source, encoding="utf-8")
+
+	return str(path)
+
+def test_result_is_the_same_as_in_process(tmp_path):
+	path = write_module(tmp_path, "SIZE = 10\n\nclass Person:\n\tdef greet(self, name: str='world') -> str:\n\t\treturn name\n")
+
+	tree, error = inspect_path_sandboxed(path, member_filter=MemberFilter(), limits=SandboxLimits(timeout=30))
+
+	module, module_error = get_module_from_path(path)
+	assert error is None and module_error is None
+	assert tree == inspect_object(module, MemberFilter())
+
+def test_timeout_kills_the_sandbox(tmp_path):
+	path = write_module(tmp_path, "while True:\n\tpass\n")
+
+	tree, error = inspect_path_sandboxed(path, member_filter=MemberFilter(), limits=SandboxLimits(timeout=0.5))
+
+	assert tree is None
+	assert error["message"] == "Exceeded the time limit (0.5 seconds)"
+
+def test_exit_is_reported(tmp_path):
+	path = write_module(tmp_path, "import os\n\nos._exit(3)\n")
+
+	tree, error = inspect_path_sandboxed(path, member_filter=MemberFilter(), limits=SandboxLimits(timeout=30))
+
+	assert tree is None
+	assert "exited with code 3" in error["message"]
+
+def test_cancelled_sandbox_is_killed(tmp_path, monkeypatch):
+	monkeypatch.setattr(module_sandbox, "CANCEL_GRACE", 0.2)
+	path = write_module(tmp_path, "while True:\n\tpass\n")
+	token = CancellationToken()
+	token.cancel()
+
+	result, error = Sandbox(render_full_value_job, (path, ("module",)), SandboxLimits(timeout=30)).run(token)
+
+	assert result is None
+	assert error == "Cancelled"
+
+def test_result_sent_right_before_exiting_is_received(tmp_path):
+	path = write_module(tmp_path, "VALUE = [1, 2, 3]\n")
+	sandbox = Sandbox(render_full_value_job, (path, ("module", "VALUE")), SandboxLimits(timeout=30))
+	sandbox.start()
+	sandbox.process.join()
+
+	class LateConnection: # The result arrives between the first poll and the check of the process
+		def __init__(self, connection):
+			self.connection = connection
+			self.polls = 0
+
+		def poll(self):
+			self.polls += 1
+			return self.polls > 1 and self.connection.poll()
+
+		def __getattr__(self, name):
+			return getattr(self.connection, name)
+
+	sandbox.connection = LateConnection(sandbox.connection)
+
+	assert sandbox.poll()
+	assert sandbox.result == "[1, 2, 3]"
+	assert sandbox.error is None
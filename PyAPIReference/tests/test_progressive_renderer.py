@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from GUI.progressive_renderer import ProgressiveRenderer
+
+
+@pytest.fixture(scope="module")
+def app():
+	return QCoreApplication.instance() or QCoreApplication([])
+
+def slow_steps(count: int, step_time: float):
+	for index in range(count):
+		time.sleep(step_time)
+		yield index
+
+def run_until_finished(app, renderer: ProgressiveRenderer) -> None:
+	renderer.finished.connect(app.quit)
+	QTimer.singleShot(10_000, app.quit) # Don't hang if it never finishes
+	app.exec_()
+
+def test_slices_are_bounded_by_the_frame_budget(app):
+	renderer = ProgressiveRenderer(frame_budget=0.02)
+	slice_steps = []
+	done = [0]
+
+	def on_slice_end():
+		slice_steps.append(task.done - done[0])
+		done[0] = task.done
+
+	task = renderer.add_task(slow_steps(40, 0.005), total=40, on_slice_end=on_slice_end, run_now=False)
+
+	# Slow events between the slices don't make the next ones longer
+	blocker = QTimer()
+	blocker.timeout.connect(lambda: time.sleep(0.05))
+	blocker.start(0)
+
+	run_until_finished(app, renderer)
+	blocker.stop()
+
+	assert task.finished
+	assert sum(slice_steps) == 40
+	assert max(slice_steps) <= 5 # 0.02 seconds, plus the step that ends after the deadline
+
+def test_last_task_added_runs_first(app):
+	renderer = ProgressiveRenderer()
+	order = []
+
+	renderer.add_task((order.append("first") for _ in range(1)), run_now=False)
+	renderer.add_task((order.append("second") for _ in range(1)), run_now=False)
+
+	run_until_finished(app, renderer)
+
+	assert order == ["second", "first"]
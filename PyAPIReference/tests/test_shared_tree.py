@@ -0,0 +1,77 @@
+import pytest
+
+from inspect_object import materialize_tree
+from tree_nodes import ContentView
+from shared_tree import (
+	SHARED_MEMORY_AVAILABLE, get_shared_memory_name, write_shared_tree, read_shared_tree, remove_shared_tree
+)
+
+pytestmark = pytest.mark.skipif(not SHARED_MEMORY_AVAILABLE, reason="Shared memory trees are not used on this platform")
+
+TREE = {
+	"module": {
+		"type": "module",
+		"docstring": "Module docstring.",
+		"content": {
+			"SIZE": {"type": "int", "docstring": None, "value": "10"},
+			"Empty": {"type": "class", "docstring": None, "inherits": [], "content": {}},
+			"Person": {
+				"type": "class",
+				"docstring": "A person. é\ud800", # Surrogates are kept
+				"inherits": ["Base"],
+				"content": {
+					"greet": {
+						"type": "function",
+						"docstring": None,
+						"parameters": {
+							"self": {"annotation": None, "default": None, "kind": "positional or keyword"},
+							"name": {"annotation": "str", "default": "'world'", "kind": "keyword-only"}
+						},
+						"return_annotation": "str"
+					}
+				}
+			}
+		}
+	}
+}
+
+
+def share(tree: dict) -> dict:
+	name = get_shared_memory_name()
+
+	try:
+		return read_shared_tree(write_shared_tree(tree, name))
+	finally:
+		remove_shared_tree(name)
+
+def test_round_trip():
+	assert materialize_tree(share(TREE)) == TREE
+
+def test_lookup_by_name():
+	content = share(TREE)["module"]["content"]
+
+	assert isinstance(content, ContentView)
+	assert list(content) == ["SIZE", "Empty", "Person"]
+	assert content["Person"]["inherits"] == ["Base"]
+	assert content["Person"]["content"]["greet"]["parameters"]["name"]["kind"] == "keyword-only"
+	assert "greet" not in content["Empty"]["content"]
+	assert "missing" not in content
+
+	with pytest.raises(KeyError):
+		content["missing"]
+
+def test_lookup_uses_an_index():
+	members = {f"member{index}": {"type": "int", "docstring": None, "value": str(index)} for index in range(3000)}
+	content = share({"module": {"type": "module", "docstring": None, "content": members}})["module"]["content"]
+	store = content.store
+
+	assert content["member2999"]["value"] == "2999"
+	assert len(store.child_ids) == 1
+
+	# The names are decoded once, to build the index, later lookups don't decode or scan them again
+	decoded = len(store.strings.decoded)
+	for index in range(3000):
+		assert f"member{index}" in content
+
+	assert len(store.strings.decoded) == decoded
+	assert len(store.child_ids) == 1
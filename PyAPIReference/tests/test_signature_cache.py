@@ -0,0 +1,117 @@
+import inspect
+
+import pytest
+
+from signature_cache import SignatureCache, get_code_parameters, get_key
+from value_renderer import ValueRenderer
+
+
+class Loud:
+	"""A default whose methods must not be called while formatting it.
+	"""
+	calls = []
+
+	def __eq__(self, other):
+		self.calls.append("__eq__")
+		return True
+
+	def __str__(self):
+		self.calls.append("__str__")
+		return "loud"
+
+	__hash__ = object.__hash__
+
+
+def get_defaults(signatures: SignatureCache, function: callable) -> dict:
+	return {name: properties["default"] for name, properties in signatures.get_parameters(function).items()}
+
+def test_defaults_are_rendered():
+	Loud.calls.clear()
+
+	def function(a, b=None, c="text", d=list(range(100)), e=str, f=Loud()):
+		pass
+
+	defaults = get_defaults(SignatureCache(value_renderer=ValueRenderer(max_items=3)), function)
+
+	assert defaults == {"a": None, "b": "None", "c": "text", "d": "[0, 1, 2, ...] (100 items)", "e": "str", "f": "loud"}
+	assert Loud.calls == ["__str__"]
+
+def test_static_defaults_are_not_called():
+	Loud.calls.clear()
+
+	def function(a=Loud(), b=str, c=1):
+		pass
+
+	defaults = get_defaults(SignatureCache(static_attributes=True), function)
+
+	assert defaults == {"a": "<Loud object>", "b": "str", "c": "1"}
+	assert Loud.calls == []
+
+def positional_only(a, b=1, /, c=2):
+	pass
+
+def keyword_only(a, *, b, c=3):
+	pass
+
+def variable(a, *args, b=1, **kwargs):
+	pass
+
+def annotated(a: int, /, b: "str"=None, *args: int, c: float, **kwargs: dict) -> bool:
+	pass
+
+@pytest.mark.parametrize("function", [positional_only, keyword_only, variable, annotated, lambda *args: None, lambda: None])
+def test_code_parameters_match_signature(function):
+	expected = [
+		(parameter.name, parameter.annotation, parameter.default, parameter.kind)
+		for parameter in inspect.signature(function).parameters.values()
+	]
+
+	assert [(parameter.name, parameter.annotation, parameter.default, parameter.kind) for parameter in get_code_parameters(function)] == expected
+
+def test_comprehension_parameter_matches_signature():
+	code = next(constant for constant in (lambda: [x for x in ()]).__code__.co_consts if inspect.iscode(constant))
+	function = type(test_comprehension_parameter_matches_signature)(code, {})
+
+	if code.co_argcount == 0: # Comprehensions are inlined since Python 3.12
+		pytest.skip("Comprehensions don't have a code object with parameters")
+
+	assert [parameter.name for parameter in get_code_parameters(function)] == list(inspect.signature(function).parameters)
+
+def test_key_changes_with_defaults_and_annotations():
+	signatures = SignatureCache()
+
+	def function(a: int=1):
+		pass
+
+	key = get_key(function)
+	assert signatures.get_parameters(function)["a"]["default"] == "1"
+
+	function.__defaults__ = (2,)
+	assert get_key(function) != key
+	assert signatures.get_parameters(function)["a"]["default"] == "2"
+
+	key = get_key(function)
+	function.__annotations__ = {"a": str}
+	assert get_key(function) != key
+	assert signatures.get_parameters(function)["a"]["annotation"] == "str"
+
+	assert signatures.inspected == 3
+
+def test_functions_with_the_same_code_share_the_key():
+	signatures = SignatureCache()
+
+	def create(value):
+		def function(a, b=value):
+			pass
+
+		return function
+
+	first, second = create(None), create(None)
+	assert first is not second and get_key(first) == get_key(second)
+
+	signatures.get_parameters(first)
+	signatures.get_parameters(second)
+	assert signatures.inspected == 1
+
+	signatures.get_parameters(create(1))
+	assert signatures.inspected == 2
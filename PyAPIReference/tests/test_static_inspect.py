@@ -0,0 +1,104 @@
+import textwrap
+
+from member_filter import MemberFilter
+from static_inspect import static_inspect_path
+
+
+def write_module(tmp_path, source: str, name: str="module.py") -> str:
+	path = tmp_path / name
+	path.write_text(textwrap.dedent(source), encoding="utf-8")
+
+	return str(path)
+
+def test_members_are_inspected_without_executing(tmp_path):
+	path = write_module(tmp_path, '''
+		"""Module docstring."""
+		import not_installed_module
+
+		SIZE = 10
+
+		class Base:
+			pass
+
+		class Child(Base):
+			"""Child docstring."""
+			def method(self, value: int=1, *args, key: str="a", **kwargs) -> bool:
+				pass
+
+			@property
+			def name(self):
+				pass
+
+		raise SystemExit("never executed")
+	''')
+
+	tree, error = static_inspect_path(path, MemberFilter())
+
+	assert error is None
+
+	module = tree["module"]
+	assert module["type"] == "module"
+	assert module["docstring"] == "Module docstring."
+	assert module["content"]["SIZE"]["value"] == "10"
+
+	child = module["content"]["Child"]
+	assert child["inherits"] == ["Base"]
+	assert child["content"]["name"]["type"] == "property"
+
+	parameters = child["content"]["method"]["parameters"]
+	assert list(parameters) == ["self", "value", "args", "key", "kwargs"]
+	assert parameters["value"] == {"annotation": "int", "default": "1", "kind": "positional or keyword"}
+	assert parameters["key"]["kind"] == "keyword-only"
+	assert child["content"]["method"]["return_annotation"] == "bool"
+
+def test_main_guard_and_all_only(tmp_path):
+	path = write_module(tmp_path, '''
+		__all__ = ["public"]
+
+		def public():
+			pass
+
+		def other():
+			pass
+
+		if __name__ == "__main__":
+			def script_only():
+				pass
+	''')
+
+	tree, error = static_inspect_path(path, MemberFilter())
+	assert list(tree["module"]["content"]) == ["public", "other"]
+
+	tree, error = static_inspect_path(path, MemberFilter(all_only=True))
+	assert list(tree["module"]["content"]) == ["public"]
+
+def test_non_literal_values_are_their_source(tmp_path):
+	path = write_module(tmp_path, '''
+		PATH = os.path.join("a", "b")
+		NAMES = [name.upper() for name in "ab"]
+	''')
+
+	tree, error = static_inspect_path(path, MemberFilter())
+	content = tree["module"]["content"]
+
+	assert content["PATH"] == {"type": "join", "docstring": None, "value": "os.path.join('a', 'b')"}
+	assert content["NAMES"]["type"] == "list"
+
+def test_syntax_error_is_reported(tmp_path):
+	path = write_module(tmp_path, "def broken(:\n\tpass\n")
+
+	tree, error = static_inspect_path(path, MemberFilter())
+
+	assert tree is None
+	assert error["file"] == path
+	assert error["line"] == 1
+
+def test_missing_file_is_reported(tmp_path):
+	path = str(tmp_path / "missing.py")
+
+	tree, error = static_inspect_path(path, MemberFilter())
+
+	assert tree is None
+	assert error["file"] == path
+	assert error["line"] is None
+	assert "No such file" in error["message"]
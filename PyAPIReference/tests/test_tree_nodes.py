@@ -0,0 +1,112 @@
+import pytest
+
+from inspect_object import LazyDict, materialize_tree
+from tree_nodes import TreeStore, ContentView, compact_tree
+
+TREE = {
+	"module": {
+		"type": "module",
+		"docstring": "Module docstring.",
+		"content": {
+			"SIZE": {"type": "int", "docstring": None, "value": "10"},
+			"Empty": {"type": "class", "docstring": None, "inherits": [], "content": {}},
+			"Person": {
+				"type": "class",
+				"docstring": "A person.",
+				"inherits": ["Base"],
+				"content": {
+					"greet": {
+						"type": "function",
+						"docstring": None,
+						"parameters": {
+							"self": {"annotation": None, "default": None, "kind": "positional or keyword"},
+							"name": {"annotation": "str", "default": "'world'", "kind": "keyword-only"}
+						},
+						"return_annotation": "str"
+					}
+				}
+			}
+		}
+	}
+}
+
+
+def test_round_trip():
+	tree = compact_tree(TREE)
+
+	assert materialize_tree(tree) == TREE
+
+def test_lookup_by_name():
+	content = compact_tree(TREE)["module"]["content"]
+
+	assert isinstance(content, ContentView)
+	assert list(content) == ["SIZE", "Empty", "Person"]
+	assert content["SIZE"]["value"] == "10"
+	assert content["Person"]["inherits"] == ["Base"]
+
+	parameters = content["Person"]["content"]["greet"]["parameters"]
+	assert parameters["name"]["kind"] == "keyword-only"
+	assert "self" in parameters
+	assert "other" not in parameters
+
+	with pytest.raises(KeyError):
+		content["missing"]
+
+	assert content.get("missing") is None
+	assert "missing" not in content
+	assert [] not in content # Not hashable
+
+def test_lookup_only_finds_children_of_the_view():
+	tree = compact_tree(TREE)
+	content = tree["module"]["content"]
+
+	# The empty content of Empty starts where the content of Person does
+	assert len(content["Empty"]["content"]) == 0
+	assert "greet" not in content["Empty"]["content"]
+	assert "greet" in content["Person"]["content"]
+	assert "Person" not in content["Person"]["content"]
+
+def test_node_properties():
+	greet = compact_tree(TREE)["module"]["content"]["Person"]["content"]["greet"]
+
+	assert greet.keys() == ["type", "docstring", "parameters", "return_annotation"]
+	assert "content" not in greet
+	assert greet.get("value") is None
+
+	with pytest.raises(KeyError):
+		greet["content"]
+
+def test_lazy_children_are_referenced():
+	store = TreeStore()
+	calls = []
+
+	def loader():
+		calls.append(True)
+		return {"method": {"type": "function", "docstring": None, "parameters": {}}}
+
+	content = LazyDict(loader)
+	tree = store.add_tree({"Class": {"type": "class", "docstring": None, "content": content}})
+
+	assert tree["Class"]["content"] is content
+	assert calls == []
+
+	assert list(tree["Class"]["content"]) == ["method"]
+	assert calls == [True]
+
+def test_views_of_the_store_are_not_copied():
+	store = TreeStore()
+	content = store.add_members({"SIZE": {"type": "int", "docstring": None, "value": "1"}})
+	members = len(store)
+
+	tree = store.add_tree({"module": {"type": "module", "docstring": None, "content": content}})
+
+	assert len(store) == members + 1
+	assert tree["module"]["content"]["SIZE"]["value"] == "1"
+
+def test_iter_nodes():
+	store = TreeStore()
+	store.add_tree(TREE)
+
+	nodes = {member_name: type_name for node_id, member_name, type_name in store.iter_nodes()}
+
+	assert nodes == {"module": "module", "SIZE": "int", "Empty": "class", "Person": "class", "greet": "function"}
@@ -0,0 +1,30 @@
+import threading
+
+from value_renderer import ValueRenderer, RenderExecutor
+
+
+class Blocked:
+	release = threading.Event()
+
+	def __str__(self):
+		self.release.wait(5)
+		return "blocked"
+
+
+def test_builtins_are_bounded():
+	renderer = ValueRenderer(max_length=20, max_items=3)
+
+	assert renderer.render(list(range(100))) == "[0, 1, 2, ...] (100 items)"
+	assert renderer.render("x" * 30) == f"{'x' * 20}..."
+
+def test_slow_str_doesnt_start_more_threads(monkeypatch):
+	executor = RenderExecutor(max_threads=1)
+	monkeypatch.setattr("value_renderer.render_executor", executor)
+	renderer = ValueRenderer(time_budget=0.05)
+
+	try:
+		assert "took more than" in renderer.render(Blocked())
+		assert "not called" in renderer.render(Blocked())
+		assert executor.threads == 1
+	finally:
+		Blocked.release.set()
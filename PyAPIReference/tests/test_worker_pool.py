@@ -0,0 +1,69 @@
+from member_filter import MemberFilter
+from module_sandbox import SandboxLimits, inspect_path_sandboxed
+from worker_pool import WorkerPool
+
+
+def inspect_module(tmp_path, pool: WorkerPool, source: str, name: str="module"):
+	path = tmp_path / f"{name}.py"
+	path.write_text(source, encoding="utf-8")
+
+	return inspect_path_sandboxed(str(path), member_filter=MemberFilter(), limits=SandboxLimits(timeout=30), pool=pool)
+
+def test_worker_is_reused(tmp_path):
+	pool = WorkerPool(size=1)
+
+	try:
+		tree, error = inspect_module(tmp_path, pool, "SIZE = 10\n")
+		worker = pool.workers[0]
+
+		tree, error = inspect_module(tmp_path, pool, "SIZE = 11\n")
+
+		assert error is None and tree["module"]["content"]["SIZE"]["value"] == "11"
+		assert pool.workers == [worker] and worker.jobs == 2
+	finally:
+		pool.close()
+
+def test_worker_is_replaced_after_changing_the_process(tmp_path):
+	pool = WorkerPool(size=1)
+
+	try:
+		for source in ("import os\nos.chdir('/')\n", "import threading\nthreading.Thread(target=threading.Event().wait, daemon=True).start()\n"):
+			tree, error = inspect_module(tmp_path, pool, source)
+
+			assert error is None
+			assert pool.workers == [] # Discarded, a new one runs the next job
+
+		tree, error = inspect_module(tmp_path, pool, "SIZE = 10\n")
+		assert error is None and len(pool.workers) == 1
+	finally:
+		pool.close()
+
+def test_preload_errors_are_reported_once(tmp_path):
+	warnings = []
+	pool = WorkerPool(preload=["missing_module_to_preload"], size=1, on_warning=warnings.append)
+
+	try:
+		inspect_module(tmp_path, pool, "SIZE = 10\n")
+		inspect_module(tmp_path, pool, "import os\nos.chdir('/')\n") # The next worker can't preload it either
+		inspect_module(tmp_path, pool, "SIZE = 10\n")
+
+		assert len(warnings) == 1
+		assert "missing_module_to_preload" in warnings[0]
+	finally:
+		pool.close()
+
+def test_result_that_cant_be_sent_is_an_error(tmp_path):
+	pool = WorkerPool(size=1)
+
+	try:
+		# vars(token) has the threading.Event of the token, it can't be pickled
+		result, error = pool.create_job(vars, (), SandboxLimits(timeout=30)).run()
+
+		assert result is None
+		assert "Couldn't send the result" in error
+
+		# The next job runs in a new worker
+		tree, error = inspect_module(tmp_path, pool, "SIZE = 10\n")
+		assert error is None and tree["module"]["content"]["SIZE"]["value"] == "10"
+	finally:
+		pool.close()
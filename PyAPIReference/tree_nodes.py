@@ -0,0 +1,414 @@
+"""Compact representation of the tree returned by inspect_object.
+Instead of a dictionary per member and per parameter (each one repeating the same keys) the members and parameters
+are stored in a TreeStore, in parallel arrays indexed by node id, and the strings repeated across the tree
+(types, kinds) are stored once in a table and referenced by their index.
+The siblings of a content (or the parameters of a function) are stored contiguously, so a content is just (first, count).
+To use it as the tree of dictionaries it replaces, the store is accessed through read-only views:
+NodeView (a member), ContentView ({member_name: NodeView}), ParametersView ({parameter_name: ParameterView}) and ParameterView.
+Example:
+	store = TreeStore()
+	tree = store.add_tree({"example": {"type": "module", "docstring": None, "content": {}}})
+	print(tree["example"]["type"])
+	>>> module
+	print(materialize_tree(tree)) # See inspect_object.py
+	>>> {'example': {'type': 'module', 'docstring': None, 'content': {}}}
+"""
+import sys
+from array import array
+from collections.abc import Mapping
+
+PARAMETER_KEYS = ("annotation", "default", "kind")
+
+
+class Missing:
+	"""Type of MISSING, it's pickled as a reference to MISSING so a pickled store keeps it (see module_sandbox.py).
+	"""
+	__slots__ = ()
+
+	def __repr__(self):
+		return "MISSING"
+
+	def __reduce__(self):
+		return "MISSING"
+
+
+# Stored in the object columns for the properties a node doesn't have (e.g.: value in a class)
+MISSING = Missing()
+
+# Stored in the count columns
+NO_CHILDREN = -1 # The node doesn't have the property, e.g.: content in a function
+LAZY_CHILDREN = -2 # The property is a LazyDict (see inspect_object.py) or a view of a read-only store, stored in TreeStore.lazy
+
+
+class TreeStore:
+	"""Stores the members and parameters of one or more trees.
+	Nodes are only added, never modified or removed, so the views are valid as long as the store exists.
+	"""
+	read_only = False # Views of read-only stores (see shared_tree.py) are referenced instead of copied when they are added
+
+	def __init__(self):
+		self.strings = []
+		self.string_ids = {}
+
+		# Members
+		self.names = []
+		self.types = array("I")
+		self.docstrings = []
+		self.inherits = []
+		self.return_annotations = []
+		self.values = []
+		self.references = []
+		self.truncated = []
+		self.content_first = array("i")
+		self.content_count = array("i")
+		self.parameters_first = array("i")
+		self.parameters_count = array("i")
+
+		# Parameters
+		self.parameter_names = []
+		self.parameter_annotations = []
+		self.parameter_defaults = []
+		self.parameter_kinds = array("I")
+
+		self.lazy = {} # (node_id, "content" | "parameters") -> LazyDict
+		self.child_ids = {} # (names column, first, count) -> {name: child id}, see get_child_ids
+
+	def __len__(self):
+		return len(self.names)
+
+	def __repr__(self):
+		return f"TreeStore(members={len(self.names)}, parameters={len(self.parameter_names)})"
+
+	def get_string_id(self, string: str) -> int:
+		if string not in self.string_ids:
+			self.string_ids[string] = len(self.strings)
+			self.strings.append(sys.intern(string))
+
+		return self.string_ids[string]
+
+	def add_tree(self, tree: Mapping) -> dict:
+		"""Given a tree of dictionaries (e.g.: loaded from a JSON file) stores it and returns {root_name: NodeView}.
+		"""
+		return dict(self.add_members(tree))
+
+	def add_members(self, members: Mapping) -> "ContentView":
+		"""Stores members ({member_name: properties}) contiguously and returns them as a ContentView.
+		The content and parameters of each member can be views of this store (already stored), views of a read-only store or LazyDict (referenced)
+		or mappings (stored first).
+		The contents are stored with a stack instead of recursion, so it works with trees of any depth.
+		"""
+		# [members, properties not visited yet, (content, parameters) of the visited ones, properties whose content is being stored]
+		stack = [[members, iter(members.values()), [], None]]
+		content = None # ContentView of the members stored last
+
+		while len(stack) > 0:
+			frame = stack[-1]
+			children = frame[2]
+
+			if frame[3] is not None: # Resumed after storing the content of a member
+				children.append((content, self.get_children(frame[3], "parameters")))
+				frame[3] = None
+
+			for properties in frame[1]:
+				member_content = properties.get("content", MISSING)
+
+				if not self.is_referenced(member_content, ContentView): # Children first, so the members themselves end up next to each other
+					frame[3] = properties
+					stack.append([member_content, iter(member_content.values()), [], None])
+					break
+
+				children.append((member_content, self.get_children(properties, "parameters")))
+			else:
+				stack.pop()
+				content = self.store_members(frame[0], children)
+
+		return content
+
+	def store_members(self, members: Mapping, children: list) -> "ContentView":
+		"""Stores members, whose (content, parameters) are already stored or referenced (see add_members), and returns them as a ContentView.
+		"""
+		first = len(self.names)
+
+		for (member_name, properties), (content, parameters) in zip(members.items(), children):
+			node_id = len(self.names)
+
+			self.names.append(sys.intern(member_name) if type(member_name) is str else member_name)
+			self.types.append(self.get_string_id(properties["type"]))
+			self.docstrings.append(properties.get("docstring"))
+			self.inherits.append(properties.get("inherits", MISSING))
+			self.return_annotations.append(properties.get("return_annotation", MISSING))
+			self.values.append(properties.get("value", MISSING))
+			self.references.append(properties.get("reference", MISSING))
+			self.truncated.append(properties.get("truncated", MISSING))
+
+			self.add_children(node_id, "content", content, self.content_first, self.content_count)
+			self.add_children(node_id, "parameters", parameters, self.parameters_first, self.parameters_count)
+
+		return ContentView(self, first, len(self.names) - first)
+
+	def add_parameters(self, parameters: Mapping) -> "ParametersView":
+		"""Stores the parameters returned by get_callable_parameters and returns them as a ParametersView.
+		"""
+		first = len(self.parameter_names)
+
+		for parameter_name, parameter in parameters.items():
+			self.parameter_names.append(sys.intern(parameter_name))
+			self.parameter_annotations.append(parameter["annotation"])
+			self.parameter_defaults.append(parameter["default"])
+			self.parameter_kinds.append(self.get_string_id(parameter["kind"]))
+
+		return ParametersView(self, first, len(self.parameter_names) - first)
+
+	def get_children(self, properties: Mapping, key: str):
+		children = properties.get(key, MISSING)
+
+		if self.is_referenced(children, ContentView if key == "content" else ParametersView):
+			return children
+
+		return self.add_members(children) if key == "content" else self.add_parameters(children)
+
+	def is_referenced(self, children, view_type: type) -> bool:
+		"""Returns True if children (a content or parameters) isn't stored again: missing, a LazyDict not loaded,
+		a view of this store or a view of a read-only store.
+		"""
+		if children is MISSING or getattr(children, "loader", None) is not None: # Not loaded LazyDict
+			return True
+
+		return isinstance(children, view_type) and (children.store is self or children.store.read_only)
+
+	def add_children(self, node_id: int, key: str, children, first_column: array, count_column: array):
+		if children is MISSING:
+			first_column.append(0)
+			count_column.append(NO_CHILDREN)
+		elif isinstance(children, (ContentView, ParametersView)) and children.store is self:
+			first_column.append(children.first)
+			count_column.append(children.count)
+		else:
+			first_column.append(0)
+			count_column.append(LAZY_CHILDREN)
+			self.lazy[node_id, key] = children
+
+	def get_child_ids(self, names_column: str, first: int, count: int) -> dict:
+		"""Returns {name: child id} of the count children starting at first (e.g.: a ContentView), built the first time it's looked up,
+		so looking up the children of a node by name doesn't scan them.
+		"""
+		key = (names_column, first, count)
+
+		if key not in self.child_ids:
+			names = getattr(self, names_column)
+			# Reversed so a repeated name is the first child, as list.index
+			self.child_ids[key] = {names[child_id]: child_id for child_id in reversed(range(first, first + count))}
+
+		return self.child_ids[key]
+
+	def iter_nodes(self):
+		"""Yields (node_id, member_name, type) of all the members stored, without creating any view.
+		"""
+		strings = self.strings
+		for node_id, (member_name, type_id) in enumerate(zip(self.names, self.types)):
+			yield node_id, member_name, strings[type_id]
+
+
+class NodeView(Mapping):
+	"""Read-only {property_name: property_value} view of a member, same keys as get_object_properties.
+	"""
+	__slots__ = ("store", "id")
+
+	def __init__(self, store: TreeStore, node_id: int):
+		self.store = store
+		self.id = node_id
+
+	def get_children(self, key: str, first_column: array, count_column: array):
+		count = count_column[self.id]
+
+		if count == NO_CHILDREN:
+			return MISSING
+		elif count == LAZY_CHILDREN:
+			return self.store.lazy[self.id, key]
+
+		view_type = ContentView if key == "content" else ParametersView
+		return view_type(self.store, first_column[self.id], count)
+
+	def get_property(self, key: str):
+		store = self.store
+
+		if key == "type":
+			return store.strings[store.types[self.id]]
+		elif key == "docstring":
+			return store.docstrings[self.id]
+		elif key == "inherits":
+			return store.inherits[self.id]
+		elif key == "content":
+			return self.get_children(key, store.content_first, store.content_count)
+		elif key == "parameters":
+			return self.get_children(key, store.parameters_first, store.parameters_count)
+		elif key == "return_annotation":
+			return store.return_annotations[self.id]
+		elif key == "value":
+			return store.values[self.id]
+		elif key == "reference":
+			return store.references[self.id]
+		elif key == "truncated":
+			return store.truncated[self.id]
+
+		return MISSING
+
+	def get_properties(self) -> list:
+		"""Returns [(property_name, property_value)] of the properties the node has, in a single pass over the columns.
+		"""
+		store = self.store
+		node_id = self.id
+
+		result = [("type", store.strings[store.types[node_id]]), ("docstring", store.docstrings[node_id])]
+
+		if store.inherits[node_id] is not MISSING:
+			result.append(("inherits", store.inherits[node_id]))
+
+		if store.content_count[node_id] != NO_CHILDREN:
+			result.append(("content", self.get_children("content", store.content_first, store.content_count)))
+
+		if store.parameters_count[node_id] != NO_CHILDREN:
+			result.append(("parameters", self.get_children("parameters", store.parameters_first, store.parameters_count)))
+
+		for key, column in (("return_annotation", store.return_annotations), ("value", store.values), ("reference", store.references), ("truncated", store.truncated)):
+			if column[node_id] is not MISSING:
+				result.append((key, column[node_id]))
+
+		return result
+
+	def __getitem__(self, key):
+		value = self.get_property(key)
+		if value is MISSING:
+			raise KeyError(key)
+
+		return value
+
+	def __iter__(self):
+		return (key for key, value in self.get_properties())
+
+	def __len__(self):
+		return len(self.get_properties())
+
+	def __contains__(self, key):
+		return self.get_property(key) is not MISSING
+
+	def keys(self):
+		return [key for key, value in self.get_properties()]
+
+	def items(self):
+		return self.get_properties()
+
+	def values(self):
+		return [value for key, value in self.get_properties()]
+
+	def __repr__(self):
+		return f"NodeView({dict(self.items())})"
+
+
+class ParameterView(Mapping):
+	"""Read-only {"annotation": ..., "default": ..., "kind": ...} view of a parameter.
+	"""
+	__slots__ = ("store", "id")
+
+	def __init__(self, store: TreeStore, parameter_id: int):
+		self.store = store
+		self.id = parameter_id
+
+	def __getitem__(self, key):
+		if key == "annotation":
+			return self.store.parameter_annotations[self.id]
+		elif key == "default":
+			return self.store.parameter_defaults[self.id]
+		elif key == "kind":
+			return self.store.strings[self.store.parameter_kinds[self.id]]
+
+		raise KeyError(key)
+
+	def __iter__(self):
+		return iter(PARAMETER_KEYS)
+
+	def __len__(self):
+		return len(PARAMETER_KEYS)
+
+	def items(self):
+		store = self.store
+		return [
+			("annotation", store.parameter_annotations[self.id]),
+			("default", store.parameter_defaults[self.id]),
+			("kind", store.strings[store.parameter_kinds[self.id]])
+		]
+
+	def values(self):
+		return [value for key, value in self.items()]
+
+	def __repr__(self):
+		return f"ParameterView({dict(self.items())})"
+
+
+class ChildrenView(Mapping):
+	"""Read-only view of count contiguous nodes starting at first.
+	"""
+	__slots__ = ("store", "first", "count")
+	item_type = None
+	names_column = None # Column of the store with the names of the children
+
+	def __init__(self, store: TreeStore, first: int, count: int):
+		self.store = store
+		self.first = first
+		self.count = count
+
+	def get_names(self):
+		return getattr(self.store, self.names_column)
+
+	def __getitem__(self, key):
+		try:
+			child_id = self.store.get_child_ids(self.names_column, self.first, self.count)[key]
+		except (KeyError, TypeError): # TypeError if key is not hashable, same as a dictionary
+			raise KeyError(key) from None
+
+		return self.item_type(self.store, child_id)
+
+	def __contains__(self, key):
+		try:
+			return key in self.store.get_child_ids(self.names_column, self.first, self.count)
+		except TypeError:
+			return False
+
+	def __iter__(self):
+		names = self.get_names()
+		return (names[child_id] for child_id in range(self.first, self.first + self.count))
+
+	def __len__(self):
+		return self.count
+
+	def items(self):
+		names = self.get_names()
+		return [(names[child_id], self.item_type(self.store, child_id)) for child_id in range(self.first, self.first + self.count)]
+
+	def values(self):
+		return [self.item_type(self.store, child_id) for child_id in range(self.first, self.first + self.count)]
+
+	def __repr__(self):
+		return f"{type(self).__name__}({dict(self.items())})"
+
+
+class ContentView(ChildrenView):
+	"""Read-only {member_name: NodeView} view of the content of a class or module.
+	"""
+	__slots__ = ()
+	item_type = NodeView
+	names_column = "names"
+
+
+class ParametersView(ChildrenView):
+	"""Read-only {parameter_name: ParameterView} view of the parameters of a function.
+	"""
+	__slots__ = ()
+	item_type = ParameterView
+	names_column = "parameter_names"
+
+
+def compact_tree(tree: Mapping) -> dict:
+	"""Returns tree (a tree of dictionaries, e.g.: loaded from a JSON file) stored in a new TreeStore.
+	"""
+	return TreeStore().add_tree(tree)
@@ -0,0 +1,271 @@
+"""Render the value of a member (the value property of the tree) as a string without taking too much time or memory.
+Builtin containers are shortened like reprlib does, numpy-like arrays are summarized by their shape and dtype
+and the __str__ of other objects is called in one of a few shared threads, giving up when it takes more than the time budget.
+Example:
+	renderer = ValueRenderer(max_length=40)
+	print(renderer.render(list(range(1_000_000))))
+	>>> [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, ... (1000000 items)
+"""
+import os
+import time
+import queue
+import reprlib
+import threading
+from itertools import islice
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+VALUE_MAX_LENGTH = 500 # Characters
+VALUE_MAX_ITEMS = 50 # Items shown of lists, tuples, dicts, etc
+VALUE_TIME_BUDGET = 0.5 # Seconds
+RENDER_THREADS = 2 # Threads calling __str__ with a deadline, shared by all the renderers (see RenderExecutor)
+RENDER_THREAD_NAME = "value renderer"
+
+# Containers rendered with BoundedRepr (only these exact types, subclasses may change their repr)
+SIZED_TYPES = (list, tuple, set, frozenset, dict)
+
+
+class ValueRenderer:
+	"""Renders values as str(value) would do, but bounded.
+	Arguments:
+		max_length: the result is cut at max_length characters (followed by ...).
+		max_items: items shown of containers.
+		time_budget: seconds to wait for the __str__ (or __repr__ inside containers) of objects that are not builtins.
+	Notes:
+		A __str__ that exceeds the time budget keeps running in its thread, as threads can't be stopped (see RenderExecutor).
+	"""
+	def __init__(self, max_length: int=VALUE_MAX_LENGTH, max_items: int=VALUE_MAX_ITEMS, time_budget: float=VALUE_TIME_BUDGET):
+		self.max_length = max_length
+		self.max_items = max_items
+		self.time_budget = time_budget
+
+	@property
+	def key(self) -> tuple:
+		"""Hashable representation of the settings, two renderers with the same key render the same values.
+		"""
+		return (self.max_length, self.max_items, self.time_budget)
+
+	def __repr__(self):
+		return f"ValueRenderer(max_length={self.max_length}, max_items={self.max_items}, time_budget={self.time_budget})"
+
+	def render(self, value, call_str: bool=True) -> str:
+		"""If not call_str the __str__ (and __repr__) of objects that are not builtins is never called, they are rendered as <type object>.
+		"""
+		deadline = time.perf_counter() + self.time_budget
+
+		if type(value) is str:
+			result = value
+		elif type(value) is int:
+			result = render_int(value, self.max_length)
+		elif type(value) in SIZED_TYPES:
+			result = BoundedRepr(self, deadline, call_str).repr(value)
+
+			if len(value) > self.max_items:
+				return f"{self.truncate(result)} ({len(value)} items)"
+		elif type(value) in (bytes, bytearray) and len(value) > self.max_length:
+			return f"{self.truncate(str(value[:self.max_length]))} ({len(value)} bytes)"
+		elif call_str and (summary := get_array_summary(value)) is not None:
+			result = summary
+		elif has_cheap_str(value):
+			result = str(value)
+		elif not call_str:
+			result = f"<{type(value).__name__} object>"
+		else:
+			result = call_with_deadline(str, value, deadline)
+
+		return self.truncate(result)
+
+	def render_full(self, value) -> str:
+		"""Returns str(value) without any limit, e.g.: when the user asks for the full value.
+		"""
+		try:
+			return str(value)
+		except Exception as error:
+			return f"<{type(value).__name__} object (str raised {type(error).__name__}: {error})>"
+
+	def truncate(self, string: str) -> str:
+		if len(string) > self.max_length:
+			return f"{string[:self.max_length]}..."
+
+		return string
+
+
+class BoundedRepr(reprlib.Repr):
+	"""reprlib.Repr keeping the order of dicts and sets (reprlib sorts them, which takes too much time with big ones)
+	and calling the __repr__ of objects that are not builtins with a deadline.
+	"""
+	def __init__(self, renderer: ValueRenderer, deadline: float, call_repr: bool=True):
+		super().__init__()
+		self.deadline = deadline
+		self.call_repr = call_repr
+
+		self.maxlevel = 3
+		self.maxtuple = self.maxlist = self.maxarray = self.maxset = self.maxfrozenset = self.maxdeque = self.maxdict = renderer.max_items
+		self.maxstring = self.maxlong = self.maxother = renderer.max_length
+
+	def repr_int(self, x, level):
+		return render_int(x, self.maxlong)
+
+	def repr_dict(self, x, level):
+		if not x:
+			return "{}"
+		if level <= 0:
+			return "{...}"
+
+		pieces = [f"{self.repr1(key, level - 1)}: {self.repr1(x[key], level - 1)}" for key in islice(x, self.maxdict)]
+		if len(x) > self.maxdict:
+			pieces.append("...")
+
+		return f"{{{', '.join(pieces)}}}"
+
+	def repr_set(self, x, level):
+		return self.repr_unordered(x, level, "{", "}", "set()")
+
+	def repr_frozenset(self, x, level):
+		return self.repr_unordered(x, level, "frozenset({", "})", "frozenset()")
+
+	def repr_unordered(self, x, level: int, left: str, right: str, empty: str):
+		if not x:
+			return empty
+		if level <= 0:
+			return f"{left}...{right}"
+
+		pieces = [self.repr1(item, level - 1) for item in islice(x, self.maxset)]
+		if len(x) > self.maxset:
+			pieces.append("...")
+
+		return f"{left}{', '.join(pieces)}{right}"
+
+	def repr_instance(self, x, level):
+		if has_cheap_str(x):
+			result = repr(x)
+		elif not self.call_repr:
+			result = f"<{type(x).__name__} object>"
+		else:
+			result = call_with_deadline(repr, x, self.deadline)
+
+		if len(result) > self.maxother:
+			return f"{result[:self.maxother]}..."
+
+		return result
+
+
+class RenderExecutor:
+	"""Calls the __str__ (or __repr__) of values on up to max_threads daemon threads, started when needed and kept for the next calls.
+	A call that exceeds its deadline keeps its thread busy until it returns, while all the threads are busy
+	submit returns None instead of starting more threads, so slow __str__ can't pile up threads.
+	"""
+	def __init__(self, max_threads: int=RENDER_THREADS):
+		self.max_threads = max_threads
+		self.calls = queue.SimpleQueue()
+		self.lock = threading.Lock()
+		self.threads = 0
+		self.idle_threads = 0
+
+	def __repr__(self):
+		return f"RenderExecutor(max_threads={self.max_threads}, threads={self.threads}, idle_threads={self.idle_threads})"
+
+	def submit(self, function: callable) -> Future:
+		"""Returns the Future of function(), None if all the threads are busy.
+		"""
+		with self.lock:
+			if self.idle_threads > 0:
+				self.idle_threads -= 1
+			elif self.threads < self.max_threads:
+				self.threads += 1
+				threading.Thread(target=self.work, name=RENDER_THREAD_NAME, daemon=True).start()
+			else:
+				return None
+
+		future = Future()
+		self.calls.put((future, function))
+
+		return future
+
+	def work(self) -> None:
+		while True:
+			future, function = self.calls.get()
+
+			try:
+				future.set_result(function())
+			except BaseException as error:
+				future.set_exception(error)
+
+			del future, function # Don't keep the value alive until the next call
+
+			with self.lock:
+				self.idle_threads += 1
+
+	def reset(self) -> None:
+		"""Forget the threads, e.g.: in a forked child where they don't exist.
+		"""
+		self.calls = queue.SimpleQueue()
+		self.lock = threading.Lock()
+		self.threads = 0
+		self.idle_threads = 0
+
+
+render_executor = RenderExecutor()
+
+if hasattr(os, "register_at_fork"): # Not on Windows
+	os.register_at_fork(after_in_child=render_executor.reset)
+
+
+def render_int(value: int, max_length: int) -> str:
+	# str of ints with more than sys.get_int_max_str_digits() digits raises ValueError (and it's slow)
+	if value.bit_length() > max_length * 4: # More than max_length digits
+		return f"<int with {value.bit_length()} bits>"
+
+	return str(value)
+
+def get_array_summary(value):
+	"""Returns <type shape=... dtype=...> for numpy arrays, pandas frames, torch tensors, etc. None for other values.
+	"""
+	value_type = type(value)
+	if value_type.__module__ == "builtins" or not hasattr(value_type, "shape"):
+		return None
+
+	try:
+		shape = tuple(value.shape)
+	except Exception:
+		return None
+
+	dtype = getattr(value, "dtype", None)
+
+	return f"<{value_type.__name__} shape={shape}{f' dtype={dtype}' if dtype is not None else ''}>"
+
+def has_cheap_str(value) -> bool:
+	"""Returns True if the str (and repr) of value is known to be cheap: builtin types or the default object repr.
+	"""
+	value_type = type(value)
+
+	if value_type.__module__ == "builtins" and value_type not in SIZED_TYPES:
+		return True
+
+	return value_type.__str__ is object.__str__ and value_type.__repr__ is object.__repr__
+
+def call_with_deadline(function: callable, value, deadline: float) -> str:
+	"""Returns function(value) (str or repr) if it finishes before deadline, else a placeholder.
+	"""
+	timeout = deadline - time.perf_counter()
+	if timeout <= 0:
+		return f"<{type(value).__name__} object>"
+
+	def call():
+		try:
+			return function(value)
+		except BaseException as error: # Even SystemExit, it would stop the thread
+			return f"<{type(value).__name__} object ({function.__name__} raised {type(error).__name__})>"
+
+	future = render_executor.submit(call)
+	if future is None:
+		return f"<{type(value).__name__} object ({function.__name__} not called, the previous ones are still running)>"
+
+	try:
+		result = future.result(timeout)
+	except FutureTimeoutError:
+		return f"<{type(value).__name__} object ({function.__name__} took more than {timeout:.2f}s)>"
+
+	if not isinstance(result, str):
+		return f"<{type(value).__name__} object ({function.__name__} returned {type(result).__name__})>"
+
+	return result
@@ -0,0 +1,373 @@
+"""Pool of long-lived worker processes (see inspection_worker.py) to execute and inspect modules out of the PyAPIReference process.
+Unlike a Sandbox (see module_sandbox.py), that starts a new process for each module, the workers are reused:
+the modules they preload (e.g.: numpy, pandas) and the packages the inspected modules import stay imported,
+so loading modules of the same project again skips their import time. The workers can run another interpreter (e.g.: a virtualenv).
+Example:
+	pool = WorkerPool(interpreter="venv/bin/python", preload=["numpy"])
+	tree, error = inspect_path_sandboxed("example.py", limits=SandboxLimits(timeout=60), pool=pool)
+	pool.close()
+Notes:
+	The jobs have the same interface as a Sandbox (start, poll, cancel, kill, run, result and error),
+	a worker that exceeds the limits of a job, crashes or is killed (e.g.: timeout) is replaced by a new one for the next job.
+	The code of the jobs shares the process with the next ones, a worker is replaced after a job that changed its process-wide state
+	(threads left running, working directory, signal handlers, see inspection_worker.py) and after WORKER_MAX_JOBS jobs.
+"""
+import os
+import sys
+import time
+import secrets
+import threading
+import subprocess
+import multiprocessing.connection
+from multiprocessing.connection import Listener
+
+from module_sandbox import SandboxLimits, RESULT, ERROR, POLL_INTERVAL, CANCEL_GRACE, describe_exit_code
+from inspection_budget import CancellationToken
+from inspection_worker import READY, FAILED, JOB, CANCEL, RECYCLE
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inspection_worker.py")
+
+WORKER_CONNECT_TIMEOUT = 30 # Seconds a worker has to start the interpreter and connect
+WORKER_CLOSE_TIMEOUT = 2 # Seconds the workers have to exit when the pool is closed before they are killed
+WORKER_MAX_JOBS = 50 # Jobs a worker runs before it's replaced, so what the modules leave behind doesn't pile up
+
+
+class WorkerError(Exception):
+	"""A worker couldn't be started, e.g.: the interpreter doesn't exist.
+	"""
+
+
+class Worker:
+	"""A worker process and its connection, started by WorkerPool.
+	Attributes:
+		info: {"python": version, "preload_errors": {module: message}} once it's ready (it sent READY), else None.
+		jobs: number of jobs it finished.
+		recycle: it's exiting after the job it's running, it can't be reused (see inspection_worker.py).
+	"""
+	def __init__(self, interpreter: str, preload: tuple):
+		self.interpreter = interpreter
+		self.preload = preload
+		self.process = None
+		self.connection = None
+		self.info = None
+		self.jobs = 0
+		self.recycle = False
+
+	def start(self) -> None:
+		"""Start the process and wait until it's connected (not until it imported the modules to preload).
+		Raises WorkerError if it can't be started.
+		"""
+		authkey = secrets.token_bytes(32)
+		listener = Listener(authkey=authkey) # A Unix socket or a named pipe on Windows, only for this worker
+		accepted = []
+
+		# Listener.accept has no timeout, accept in a thread and close the listener if the worker exits before connecting
+		accept_thread = threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True)
+		accept_thread.start()
+
+		try:
+			self.process = subprocess.Popen([self.interpreter, WORKER_SCRIPT, listener.address, *self.preload], stdin=subprocess.PIPE)
+			self.process.stdin.write(authkey.hex().encode() + b"\n")
+			self.process.stdin.close()
+		except OSError as error:
+			listener.close()
+			raise WorkerError(f"Couldn't start a worker with {self.interpreter}: {error}") from None
+
+		started_at = time.monotonic()
+
+		while accept_thread.is_alive() and self.process.poll() is None and time.monotonic() - started_at < WORKER_CONNECT_TIMEOUT:
+			accept_thread.join(POLL_INTERVAL)
+
+		listener.close()
+		accept_thread.join()
+
+		if len(accepted) == 0:
+			self.kill()
+			raise WorkerError(f"Couldn't start a worker with {self.interpreter}, it exited with code {self.process.returncode}")
+
+		self.connection = accepted[0]
+
+	def is_alive(self) -> bool:
+		return self.process is not None and self.process.poll() is None
+
+	def kill(self) -> None:
+		if self.connection is not None:
+			self.connection.close()
+
+		if self.is_alive():
+			self.process.kill()
+
+		if self.process is not None:
+			self.process.wait()
+
+	def get_exit_reason(self, limits: SandboxLimits) -> str:
+		self.process.wait()
+		return describe_exit_code(self.process.returncode, limits)
+
+
+class WorkerPool:
+	"""Starts the workers when they are needed (up to size) and keeps them until close.
+	Arguments:
+		interpreter: Python executable of the workers, by default the one running PyAPIReference.
+		preload: names of the modules the workers import when they start.
+		size: max number of workers, by default the number of cores available.
+		on_warning: called with a message (from any thread) when something goes wrong that doesn't stop the jobs,
+		e.g.: a module to preload couldn't be imported.
+	Notes:
+		It can be used from several threads, each job uses a worker until it's finished.
+	"""
+	def __init__(self, interpreter: str=None, preload: tuple=(), size: int=None, on_warning: callable=None):
+		self.interpreter = interpreter or sys.executable
+		self.preload = tuple(preload)
+		self.size = size or get_available_cores()
+		self.on_warning = on_warning
+		self.preload_errors = {} # {module: message} of the modules the workers couldn't preload, each one is reported once
+
+		self.workers = [] # All the workers, idle or running a job
+		self.idle = []
+		self.lock = threading.Condition() # Notified when a worker is released or discarded
+		self.job_count = 0
+
+	def __repr__(self):
+		return f"WorkerPool(interpreter={self.interpreter!r}, preload={self.preload}, size={self.size}, workers={len(self.workers)})"
+
+	def acquire(self, timeout: float=None) -> Worker:
+		"""Returns an idle worker, or a new one if there are less than size. If all of them are running a job (e.g.: the warm up)
+		waits until one finishes, raises WorkerError after timeout seconds (None to wait for ever) or if a new one can't be started.
+		"""
+		with self.lock:
+			while True:
+				while len(self.idle) > 0:
+					worker = self.idle.pop()
+					if worker.is_alive():
+						return worker
+
+					self.workers.remove(worker)
+
+				if len(self.workers) < self.size:
+					break
+
+				if not self.lock.wait(timeout):
+					raise WorkerError(f"All the {self.size} workers are running a job")
+
+			worker = Worker(self.interpreter, self.preload)
+			self.workers.append(worker) # Counted while it starts
+
+		try:
+			worker.start()
+		except WorkerError:
+			self.discard(worker)
+			raise
+
+		return worker
+
+	def set_ready(self, worker: Worker, info: dict) -> None:
+		"""worker imported the modules to preload, the ones that failed are reported to on_warning (the first time).
+		"""
+		worker.info = info
+
+		with self.lock:
+			new_errors = {module_name: message for module_name, message in info["preload_errors"].items() if module_name not in self.preload_errors}
+			self.preload_errors.update(new_errors)
+
+		if self.on_warning is not None:
+			for module_name, message in new_errors.items():
+				self.on_warning(f"Couldn't preload {module_name} in the workers: {message}")
+
+	def release(self, worker: Worker) -> None:
+		"""The job of worker finished, it can run another one (unless it's exiting or it ran WORKER_MAX_JOBS jobs, then it's discarded).
+		"""
+		if worker.recycle or worker.jobs >= WORKER_MAX_JOBS:
+			self.discard(worker)
+			return
+
+		with self.lock:
+			if worker in self.workers:
+				self.idle.append(worker)
+				self.lock.notify()
+
+	def discard(self, worker: Worker) -> None:
+		"""Kill worker (e.g.: it exceeded the timeout of a job), a new one is started when it's needed.
+		"""
+		worker.kill()
+
+		with self.lock:
+			if worker in self.workers:
+				self.workers.remove(worker)
+
+			if worker in self.idle:
+				self.idle.remove(worker)
+
+			self.lock.notify()
+
+	def warm_up(self, count: int=1) -> None:
+		"""Start count workers now (they import the modules to preload in the background), so the next jobs don't wait for them.
+		"""
+		workers = []
+
+		try:
+			for i in range(min(count, self.size)):
+				workers.append(self.acquire())
+		finally:
+			for worker in workers:
+				self.release(worker)
+
+	def create_job(self, function: callable, args: tuple=(), limits: SandboxLimits=None, sys_path_entries: tuple=(), project_directories: tuple=()) -> "WorkerJob":
+		"""Returns a WorkerJob that runs function(*args, token) in a worker, see Sandbox in module_sandbox.py.
+		The modules imported from project_directories are removed when it finishes, so they are executed again by the next jobs.
+		"""
+		with self.lock:
+			self.job_count += 1
+			job_id = self.job_count
+
+		return WorkerJob(self, job_id, function, args, limits, sys_path_entries, project_directories)
+
+	def close(self) -> None:
+		"""Stop all the workers, they exit when their connection is closed (killed after WORKER_CLOSE_TIMEOUT if they are running a job).
+		"""
+		with self.lock:
+			workers = self.workers
+			self.workers = []
+			self.idle = []
+			self.lock.notify_all()
+
+		for worker in workers:
+			if worker.connection is not None: # Else it's still starting, killed below
+				worker.connection.close()
+
+		for worker in workers:
+			try:
+				if worker.process is not None:
+					worker.process.wait(WORKER_CLOSE_TIMEOUT)
+			except subprocess.TimeoutExpired:
+				worker.kill()
+
+
+class WorkerJob:
+	"""A job run by a worker of a WorkerPool, with the same interface as Sandbox (see module_sandbox.py).
+	The timeout starts when the worker is ready (it imported the modules to preload).
+	"""
+	def __init__(self, pool: WorkerPool, job_id: int, function: callable, args: tuple, limits: SandboxLimits=None, sys_path_entries: tuple=(), project_directories: tuple=()):
+		self.pool = pool
+		self.id = job_id
+		self.function = function
+		self.args = args
+		self.limits = SandboxLimits() if limits is None else limits
+		self.sys_path_entries = tuple(sys_path_entries)
+		self.project_directories = tuple(project_directories)
+
+		self.worker = None
+		self.started_at = None
+		self.cancelled_at = None
+		self.finished = False
+
+		self.result = None
+		self.error = None
+
+	def start(self) -> None:
+		try:
+			self.worker = self.pool.acquire()
+		except WorkerError as error:
+			self.finished = True
+			self.error = str(error)
+			return
+
+		self.started_at = time.monotonic()
+		self.send((JOB, self.id, self.function, self.args, self.limits, self.sys_path_entries, self.project_directories))
+
+	def send(self, message: tuple) -> None:
+		try:
+			self.worker.connection.send(message)
+		except (OSError, ValueError): # The worker exited, poll reports why
+			pass
+
+	def get_wait_objects(self) -> list:
+		if self.finished:
+			return []
+
+		return [self.worker.connection]
+
+	def cancel(self) -> None:
+		if self.finished or self.cancelled_at is not None:
+			return
+
+		self.send((CANCEL, self.id))
+		self.cancelled_at = time.monotonic()
+
+	def poll(self) -> bool:
+		if self.finished:
+			return True
+
+		connection = self.worker.connection
+
+		while True:
+			try:
+				if not connection.poll():
+					break
+
+				kind, job_id, value = connection.recv()
+			except (EOFError, OSError): # The worker exited without sending a result (or the pool was closed)
+				self.fail(self.worker.get_exit_reason(self.limits))
+				return True
+
+			if kind == READY:
+				self.pool.set_ready(self.worker, value)
+				self.started_at = time.monotonic()
+			elif kind == FAILED:
+				self.fail(value)
+				return True
+			elif kind == RECYCLE: # Sent before the result
+				self.worker.recycle = True
+			elif kind == RESULT:
+				self.finish(value, None)
+				self.worker.jobs += 1
+				self.pool.release(self.worker)
+				return True
+			elif kind == ERROR: # The worker exits after an error
+				self.fail(value)
+				return True
+
+		now = time.monotonic()
+
+		if self.limits.timeout is not None and self.worker.info is not None and now - self.started_at > self.limits.timeout:
+			self.kill(f"Exceeded the time limit ({self.limits.timeout} seconds)")
+		elif self.cancelled_at is not None and now - self.cancelled_at > CANCEL_GRACE:
+			self.kill("Cancelled")
+
+		return self.finished
+
+	def run(self, token: CancellationToken=None) -> tuple:
+		if self.worker is None and not self.finished:
+			self.start()
+
+		while not self.poll():
+			multiprocessing.connection.wait(self.get_wait_objects(), timeout=POLL_INTERVAL)
+
+			if token is not None and token.cancelled:
+				self.cancel()
+
+		return self.result, self.error
+
+	def kill(self, reason: str) -> None:
+		if self.finished:
+			return
+
+		self.fail(reason)
+
+	def fail(self, error: str) -> None:
+		"""Finish with error and replace the worker, it exited or it can't be reused.
+		"""
+		self.pool.discard(self.worker)
+		self.finish(None, error)
+
+	def finish(self, result, error: str) -> None:
+		self.result = result
+		self.error = error
+		self.finished = True
+
+
+def get_available_cores() -> int:
+	if hasattr(os, "sched_getaffinity"):
+		return len(os.sched_getaffinity(0))
+
+	return os.cpu_count() or 1